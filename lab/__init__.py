@@ -9,27 +9,187 @@ Base module for the lab package
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import argparse
+import importlib
+import os
+import sys
 import traceback
-from typing import List, Any
-
-from git.exc import GitCommandError
-
-from lab import (
-    mergerequestcreator,
-    mergerequestcheckout,
-    mergerequestlist,
-    feature,
-    login,
-    search,
-    pipelines,
-    fork,
-    issues,
-    issue,
-    snippet,
-    workflow,
-    rewrite_remote,
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union, cast
+
+from lab import daemon, httpcache, output, trace
+from lab.utils import Utils, LogType, DeferredDefault
+
+
+class Command(NamedTuple):
+    """
+    Entry of the command registry.
+    name, aliases and help are duplicated from the parser of the command module,
+    so that the global help can be shown without importing the module.
+    """
+
+    name: str
+    module: str
+    help: str
+    aliases: Tuple[str, ...] = ()
+    # whether the command can be run by git lab daemon
+    daemon: bool = False
+    # options that keep the command running, it is never run by the daemon with them,
+    # as the daemon can't answer other commands meanwhile
+    long_running: Tuple[str, ...] = ()
+
+    def keeps_running(self, argv: Sequence[str]) -> bool:
+        """
+        Whether argv contains one of the long_running options, also as --option=value
+        or abbreviated, like argparse accepts them. An abbreviation of multiple options counts,
+        at worst the command is run without the daemon.
+        """
+        for argument in argv:
+            if argument == "--":
+                break
+            name: str = argument.partition("=")[0]
+            if len(name) > 2 and any(option.startswith(name) for option in self.long_running):
+                return True
+
+        return False
+
+
+COMMANDS: Tuple[Command, ...] = (
+    Command(
+        "mr", "mergerequestcreator", "Create a new merge request for the current branch", ("diff",)
+    ),
+    Command("checkout", "mergerequestcheckout", "check out a remote merge request", ("patch",)),
+    Command("mrs", "mergerequestlist", "List open merge requests", ("list",), daemon=True),
+    Command("feature", "feature", "Create branches and list branches"),
+    Command("login", "login", "Save a token for a GitLab instance"),
+    Command("search", "search", "Search for a repository", daemon=True),
+    Command(
+        "pipelines",
+        "pipelines",
+        "Fetch pipeline status from GitLab.",
+        daemon=True,
+        long_running=("--watch", "--log", "--artifacts"),
+    ),
+    Command("fork", "fork", "Create a fork of the project"),
+    Command("issue", "issue", "Gitlab issue commands."),
+    Command("issues", "issues", "Gitlab issues", daemon=True),
+    Command("snippet", "snippet", "Create a snippet from stdin or file", ("paste",)),
+    Command("workflow", "workflow", "Set the workflow to use for a project"),
+    Command("rewrite-remote", "rewrite_remote", "Rewrite the remote url to ssh"),
+    Command("daemon", "daemon", "Keep GitLab connections open in the background"),
+    Command("sync", "sync", "Update the local index of merge requests and issues"),
 )
-from lab.utils import Utils, LogType
+
+
+def add_global_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options that are shared by all commands
+    """
+    parser.add_argument(
+        "--trace",
+        help="Print the time, requests and git processes of each phase of the command"
+        + " (also enabled by GIT_LAB_TRACE=1)",
+        action="store_const",
+        const="text",
+    )
+    parser.add_argument(
+        "--trace-json",
+        help="Like --trace, but print JSON (also enabled by GIT_LAB_TRACE=json)",
+        dest="trace",
+        action="store_const",
+        const="json",
+    )
+    parser.add_argument(
+        "--no-cache",
+        help="Neither use nor update the cache of responses from GitLab",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--format",
+        help="Print lists as a table (default), or stream them as records for scripts",
+        choices=output.FORMATS,
+        default="table",
+    )
+
+
+def peek(argv: Optional[List[str]]) -> argparse.Namespace:
+    """
+    Parses only the global options and the name of the command,
+    without loading the module of the command
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_global_arguments(parser)
+    parser.add_argument("command", nargs="?")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER)
+    return parser.parse_known_args(argv)[0]
+
+
+def find_command(argv: List[str]) -> Optional[Command]:
+    """
+    Returns the command selected by the arguments, without parsing them
+    """
+    name: Optional[str] = peek(argv).command
+    for command in COMMANDS:
+        if name == command.name or name in command.aliases:
+            return command
+
+    return None
+
+
+class LazySubParsersAction(argparse._SubParsersAction):  # pylint: disable=protected-access
+    """
+    Subparsers action that only imports the module of a command once it was selected.
+    Until then, each command is represented by an empty placeholder parser.
+    """
+
+    __commands: Dict[str, Command]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.__commands = {}
+
+    def add_command(self, command: Command) -> None:
+        """
+        Register a placeholder parser for a command
+        """
+        self.add_parser(
+            command.name, help=command.help, aliases=list(command.aliases), add_help=False
+        )
+        for name in (command.name,) + command.aliases:
+            self.__commands[name] = command
+
+    def load(self, name: str) -> None:
+        """
+        Import the module of a command and replace its placeholder by the real parser
+        """
+        command: Optional[Command] = self.__commands.get(name)
+        if not command:
+            return
+
+        # The module registers its parser under the same names again
+        for command_name in (command.name,) + command.aliases:
+            del self._name_parser_map[command_name]
+            del self.__commands[command_name]
+        self._choices_actions = [
+            action for action in self._choices_actions if action.dest != command.name
+        ]
+
+        with trace.phase("import"):
+            module: Any = importlib.import_module("lab." + command.module)
+            parser: argparse.ArgumentParser = module.parser(self)
+        # if no default runner set fallback to default runner, run from command module
+        if not parser.get_default(dest="runner"):
+            parser.set_defaults(runner=module.run)
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Union[str, Sequence[Any], None],
+        option_string: Optional[str] = None,
+    ) -> None:
+        if values:
+            self.load(values[0])
+
+        super().__call__(parser, namespace, values, option_string)
 
 
 class Parser:  # pylint: disable=R0903
@@ -39,56 +199,112 @@ class Parser:  # pylint: disable=R0903
 
     def __init__(self) -> None:
         self.parser = argparse.ArgumentParser(description="The arcanist of GitLab.")
-        self.subparsers = self.parser.add_subparsers(dest="subcommand")
-
-        # init all subcommand
-        command_list: List[Any] = [
-            mergerequestcreator,
-            mergerequestcheckout,
-            mergerequestlist,
-            feature,
-            login,
-            search,
-            pipelines,
-            fork,
-            issue,
-            issues,
-            snippet,
-            workflow,
-            rewrite_remote,
-        ]
-        for command in command_list:
-            parser = command.parser(self.subparsers)
-            # if no default runner set fallback to default runner, run from command module
-            if not parser.get_default(dest="runner"):
-                parser.set_defaults(runner=command.run)
+        add_global_arguments(self.parser)
+        self.subparsers: LazySubParsersAction = cast(
+            LazySubParsersAction,
+            self.parser.add_subparsers(dest="subcommand", action=LazySubParsersAction),
+        )
 
-    def parse(self) -> None:
+        # register all subcommands, their modules are only imported when selected
+        for command in COMMANDS:
+            self.subparsers.add_command(command)
+
+    def parse_args(self, argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """
+        parse args without running the command
+        """
+        return self.parser.parse_args(argv)
+
+    @staticmethod
+    def resolve_defaults(args: argparse.Namespace) -> None:
+        """
+        Replace deferred defaults of the selected command by their values
+        """
+        for name, value in vars(args).items():
+            if isinstance(value, DeferredDefault):
+                setattr(args, name, value.resolve())
+
+    def parse(self, argv: Optional[List[str]] = None) -> None:
         """
         parse args and run command
         """
-        args: argparse.Namespace = self.parser.parse_args()
-        if hasattr(args, "runner"):
-            args.runner(args)
-        else:
-            self.parser.print_help()
+        global_args: argparse.Namespace = peek(argv)
 
+        # Start tracing before the command module gets imported
+        trace_format: Optional[str] = global_args.trace or trace.format_from_environment()
+        if trace_format:
+            trace.enable(trace_format)
 
-def main() -> None:
+        # Set for every command, a daemon runs commands with and without --no-cache
+        httpcache.set_enabled(not global_args.no_cache)
+        output.set_format(global_args.format)
+
+        try:
+            args: argparse.Namespace = self.parse_args(argv)
+            if hasattr(args, "runner"):
+                self.resolve_defaults(args)
+                with trace.phase("run"):
+                    args.runner(args)
+            else:
+                self.parser.print_help()
+        finally:
+            trace.report()
+
+
+def _error_message(error: Optional[BaseException]) -> Optional[str]:
     """
-    Entry point
+    Returns the message to show for errors that are not bugs in git-lab
+    """
+    # The modules are only imported by commands that need them,
+    # if they were not loaded, the error can't come from them.
+    git_exc: Any = sys.modules.get("git.exc")
+    if git_exc is not None and isinstance(error, git_exc.GitCommandError):
+        return str(error)
+
+    connection: Any = sys.modules.get("lab.connection")
+    if connection is not None and isinstance(error, connection.LoginError):
+        return str(error.error_message)
+
+    exceptions: Any = sys.modules.get("gitlab.exceptions")
+    if (
+        exceptions is not None
+        and connection is not None
+        and isinstance(error, exceptions.GitlabError)
+        and error.response_code == 404
+    ):
+        # The project is not requested up front anymore, so a moved repository
+        # only shows up once a request for something inside of it fails.
+        if connection.project_not_found(error):
+            return (
+                "The repository could not be found on the GitLab instance. "
+                + "If the repository was recently moved, please update the origin remote using git."
+            )
+        return f"Not found on the GitLab instance: {error.error_message}"
+
+    return None
+
+
+def execute(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a command
+    :return: exit status
     """
     parser: Parser = Parser()
 
     try:
-        parser.parse()
-    except GitCommandError as git_error:
-        Utils.log(LogType.ERROR, str(git_error))
-    except SystemExit:
-        pass
+        parser.parse(argv)
+    except SystemExit as exit_request:
+        if exit_request.code is None or isinstance(exit_request.code, int):
+            return exit_request.code or 0
+        return 1
     except KeyboardInterrupt:
-        pass
+        return 1
     except:  # noqa: E722
+        message: Optional[str] = _error_message(sys.exc_info()[1])
+        if message:
+            Utils.log(LogType.ERROR, message)
+            return 1
+
         print()
         Utils.log(LogType.ERROR, "git-lab crashed. This should not happen.")
         print(
@@ -99,6 +315,30 @@ def main() -> None:
             traceback.format_exc(),
             "```",
         )
+        return 1
+
+    return 0
+
+
+def main() -> None:
+    """
+    Entry point
+    """
+    argv: List[str] = sys.argv[1:]
+
+    # Let a running daemon answer, it already has a connection to GitLab
+    command: Optional[Command] = find_command(argv)
+    if (
+        command
+        and command.daemon
+        and not command.keeps_running(argv)
+        and not os.environ.get("GIT_LAB_NO_DAEMON")
+    ):
+        status: Optional[int] = daemon.forward(argv)
+        if status is not None:
+            sys.exit(status)
+
+    sys.exit(execute(argv))
 
 
 if __name__ == "__main__":
@@ -6,43 +6,100 @@ Base class for creating connections to all known instances
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-import sys
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
-from typing import List, Optional
+from gitlab.exceptions import GitlabError
+from requests.exceptions import RequestException
 
-from gitlab import Gitlab
-from gitlab.exceptions import GitlabAuthenticationError
-
-from lab.config import Config
+from lab import trace
+from lab.config import Config, SessionSettings
+from lab.session import session
+from lab.connection import Connection, LoginError
 from lab.utils import Utils, LogType
 
+T = TypeVar("T")
+
 
-class AllInstancesConnection:  # pylint: disable=too-few-public-methods
+class AllInstancesConnection:
     """
     Base class that connects to all known instances
     """
 
     # protected
-    _connections: List[Gitlab] = []
+    _connections: List[Connection]
 
     # private
     __config: Config
 
-    def __login(self, hostname: str, token: str) -> None:
-        try:
-            connection: Gitlab = Gitlab(hostname, private_token=token)
-            connection.auth()
-            self._connections.append(connection)
-        except GitlabAuthenticationError:
-            Utils.log(LogType.ERROR, "Could not log into GitLab")
-            sys.exit(1)
+    # Shared between all instances, so that a long-running process like git lab daemon
+    # keeps its connections open.
+    __logged_in: Dict[Tuple[str, str], Connection] = {}
+
+    def __login(self, hostname: str, token: str, settings: SessionSettings) -> None:
+        # The token is only checked by the first request,
+        # a rejected token raises LoginError from there.
+        if (hostname, token) not in AllInstancesConnection.__logged_in:
+            connection = Connection(
+                hostname,
+                private_token=token,
+                session=session(hostname, settings),
+                timeout=settings.timeout,
+            )
+            AllInstancesConnection.__logged_in[(hostname, token)] = connection
+
+        self._connections.append(AllInstancesConnection.__logged_in[(hostname, token)])
 
     def __init__(self) -> None:
-        self.__config = Config()
+        self._connections = []
+        with trace.phase("config"):
+            self.__config = Config()
         instances = self.__config.instances()
+        if not instances:
+            return
 
-        for hostname in instances:
-            token: Optional[str] = self.__config.token(hostname)
+        # Auth commands can take a while, so they run for all instances at the same time
+        with trace.phase("token"), ThreadPoolExecutor(max_workers=len(instances)) as executor:
+            tokens: List[Optional[str]] = list(executor.map(self.__token, instances))
 
+        for hostname, token in zip(instances, tokens):
             if isinstance(token, str):
-                self.__login("https://" + hostname, token)
+                with trace.phase("auth"):
+                    self.__login(
+                        "https://" + hostname, token, self.__config.session_settings(hostname)
+                    )
+
+    def __token(self, hostname: str) -> Optional[str]:
+        try:
+            return self.__config.token(hostname)
+        except (OSError, subprocess.CalledProcessError) as error:
+            Utils.log(LogType.WARNING, f"Could not get a token for {hostname}:", str(error))
+            return None
+
+    def _map(self, function: Callable[[Connection], T]) -> Iterator[Tuple[Connection, T]]:
+        """
+        Calls function for all instances at the same time.
+        The results are yielded in the order in which the instances answer,
+        instances that fail or time out are reported as a warning and skipped.
+        """
+        if not self._connections:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(self._connections)) as executor:
+            futures: Dict["Future[T]", Connection] = {
+                executor.submit(function, connection): connection
+                for connection in self._connections
+            }
+            for future in as_completed(futures):
+                connection: Connection = futures[future]
+                try:
+                    result: T = future.result()
+                except LoginError as error:
+                    Utils.log(LogType.WARNING, str(error.error_message))
+                    continue
+                except (GitlabError, RequestException) as error:
+                    Utils.log(LogType.WARNING, f"{connection.url}:", str(error))
+                    continue
+
+                yield connection, result
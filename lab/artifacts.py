@@ -0,0 +1,234 @@
+"""
+Module containing helpers to download job artifacts and logs in chunks
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import io
+import os
+import zipfile
+from typing import Any, List, Optional, Sequence, cast
+
+from gitlab.exceptions import GitlabHttpError
+from requests import Response
+from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from lab.connection import Connection
+
+# Bytes held in memory while downloading
+CHUNK_SIZE = 1024 * 1024
+
+# Attempts to continue a download after the connection broke
+MAX_ATTEMPTS = 5
+
+# Bytes that RemoteFile requests at least, and at most while it is read from start to end
+MIN_READ_AHEAD = 64 * 1024
+MAX_READ_AHEAD = 8 * 1024 * 1024
+
+
+def request_range(
+    connection: Connection, path: str, start: int, end: Optional[int] = None
+) -> Optional[Response]:
+    """
+    Request the bytes of path from start on, up to and including end if given.
+    The body of the response is streamed. A server that ignores Range answers
+    with status 200 instead of 206 and sends everything.
+    :return: the response, or None if there are no bytes at start
+    """
+    try:
+        # raw responses are returned as they are, not as decoded json
+        return cast(
+            Response,
+            connection.http_get(
+                path,
+                streamed=True,
+                raw=True,
+                extra_headers={
+                    "Range": f"bytes={start}-{'' if end is None else end}",
+                    # Offsets count the bytes of the file, not those of a compressed response
+                    "Accept-Encoding": "identity",
+                },
+            ),
+        )
+    except GitlabHttpError as error:
+        if error.response_code == 416:
+            # Range Not Satisfiable: start is at or after the end
+            return None
+        raise
+
+
+def download(
+    connection: Connection, path: str, destination: str, size: Optional[int] = None
+) -> int:
+    """
+    Download path to destination chunk by chunk.
+    The bytes are written to destination.part until they are complete, so that
+    an interrupted download continues where it stopped, in this run or the next one.
+    :param size: expected size of the file, the size announced by the server if None
+    :return: size of the file
+    :raises OSError: if the downloaded file doesn't have the expected size
+    """
+    partial: str = destination + ".part"
+    for attempt in range(MAX_ATTEMPTS):
+        offset: int = os.path.getsize(partial) if os.path.exists(partial) else 0
+        try:
+            response: Optional[Response] = request_range(connection, path, offset)
+            if response is not None:
+                if size is None:
+                    size = _total_size(response)
+                # Without 206 Partial Content, the response starts at the beginning
+                with open(partial, "ab" if response.status_code == 206 else "wb") as file:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        file.write(chunk)
+            break
+        except (ChunkedEncodingError, RequestsConnectionError):
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+
+    downloaded: int = os.path.getsize(partial) if os.path.exists(partial) else 0
+    if size is not None and downloaded != size:
+        if downloaded > size:
+            # Can't be continued
+            os.remove(partial)
+        raise OSError(f"Downloaded {downloaded} bytes of {destination} instead of {size}")
+
+    os.replace(partial, destination)
+    return downloaded
+
+
+class RangeError(Exception):
+    """
+    The server didn't send the requested part of a file
+    """
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Read only file whose bytes are requested when they are read, so that zipfile can read
+    the members of an archive without downloading all of it.
+    Only the bytes of the last request are kept. Reading on where the last request ended
+    doubles the size of the next request, up to MAX_READ_AHEAD.
+    """
+
+    # private
+    __connection: Connection
+    __path: str
+    __size: int
+    __position: int
+    __buffer: bytes
+    __buffer_start: int
+    __read_ahead: int
+
+    def __init__(self, connection: Connection, path: str, size: int) -> None:
+        super().__init__()
+        self.__connection = connection
+        self.__path = path
+        self.__size = size
+        self.__position = 0
+        self.__buffer = b""
+        self.__buffer_start = 0
+        self.__read_ahead = MIN_READ_AHEAD
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.__size
+        if offset < 0:
+            raise OSError(f"Invalid position {offset} in {self.__path}")
+
+        self.__position = offset
+        return offset
+
+    def readinto(self, buffer: Any) -> int:
+        end: int = min(self.__position + len(buffer), self.__size)
+        if end <= self.__position:
+            return 0
+
+        buffer_end: int = self.__buffer_start + len(self.__buffer)
+        if self.__position < self.__buffer_start or end > buffer_end:
+            self.__fill(end - self.__position)
+
+        start: int = self.__position - self.__buffer_start
+        length: int = end - self.__position
+        stop: int = start + length
+        buffer[:length] = self.__buffer[start:stop]
+        self.__position = end
+        return length
+
+    def __fill(self, length: int) -> None:
+        """
+        Request at least length bytes from the current position on
+        """
+        if self.__buffer and self.__position == self.__buffer_start + len(self.__buffer):
+            self.__read_ahead = min(self.__read_ahead * 2, MAX_READ_AHEAD)
+        else:
+            self.__read_ahead = MIN_READ_AHEAD
+
+        end: int = min(self.__position + max(length, self.__read_ahead), self.__size)
+        # Near the end, like the directory of a zip archive, start earlier instead
+        start: int = max(0, min(self.__position, end - self.__read_ahead))
+
+        response: Optional[Response] = request_range(self.__connection, self.__path, start, end - 1)
+        if response is None or response.status_code != 206:
+            if response is not None:
+                # Don't download the whole file
+                response.close()
+            # Not an OSError, which zipfile reports as an invalid archive
+            raise RangeError(f"The server doesn't send parts of {self.__path}")
+
+        self.__buffer = response.content
+        self.__buffer_start = start
+        if len(self.__buffer) != end - start:
+            raise RangeError(
+                f"Received {len(self.__buffer)} bytes of {self.__path} instead of {end - start}"
+            )
+
+
+def _total_size(response: Response) -> Optional[int]:
+    if response.status_code == 206:
+        # Content-Range: bytes 100-199/200, where the size may be * if it is unknown
+        total: str = response.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+    length: Optional[str] = response.headers.get("Content-Length")
+    return int(length) if length is not None else None
+
+
+def extract(archive: str, paths: Sequence[str], directory: str) -> List[str]:
+    """
+    Extract the members of a zip archive below paths, or all members if paths is empty,
+    into directory. Each member is copied chunk by chunk.
+    :return: names of the extracted members
+    """
+    with zipfile.ZipFile(archive) as zip_file:
+        names: List[str] = selected_members(zip_file, paths)
+        for name in names:
+            zip_file.extract(name, directory)
+
+    return names
+
+
+def selected_members(zip_file: zipfile.ZipFile, paths: Sequence[str]) -> List[str]:
+    """
+    Returns the names of the members of zip_file that are one of paths or inside of them,
+    or of all members if paths is empty
+    """
+    prefixes: List[str] = [path.strip("/") + "/" for path in paths]
+    return [
+        name
+        for name in zip_file.namelist()
+        if not paths or any(name == prefix[:-1] or name.startswith(prefix) for prefix in prefixes)
+    ]
@@ -13,12 +13,23 @@ import subprocess
 from enum import Enum, auto
 from pathlib import Path
 
-from typing import TextIO, Dict, Optional, Any, Tuple
+from typing import TextIO, Dict, NamedTuple, Optional, Any, Tuple
 
 from appdirs import user_config_dir
+from lab.credentials import CredentialCache
 from lab.utils import Utils, LogType
 
 
+class SessionSettings(NamedTuple):
+    """
+    How the HTTP connections to a GitLab instance are set up
+    """
+
+    pool_size: int = 10  # connections kept open for requests running at the same time
+    timeout: float = 30.0  # seconds to wait for the server
+    compression: bool = True  # ask for compressed responses
+
+
 class Config:
     """
     Class that can load and store settings
@@ -30,12 +41,17 @@ class Config:
             "gitlab.com": {
                 "auth_type": "token",
                 "token": "dkasjdlaksjdlkj",
-                "command": None
+                "command": None,
+                "user": {"id": 1234, "username": "jdoe"}
             },
             "invent.kde.org": {
                 "auth_type": "command",
                 "command": "gpg --decrypt",
-                "token": None
+                "cache_ttl": 300,
+                "token": None,
+                "pool_size": 10,
+                "timeout": 30,
+                "compression": true
             }
         }
     }
@@ -102,13 +118,16 @@ class Config:
                 "auth_type" in self.__config["instances"][hostname]
                 and self.__config["instances"][hostname]["auth_type"] == "command"
             ):
-                return (
-                    subprocess.check_output(
-                        self.__config["instances"][hostname]["command"], shell=True
-                    )
-                    .decode()
-                    .strip()
-                )
+                command: str = self.__config["instances"][hostname]["command"]
+                cache = CredentialCache(self.__config["instances"][hostname].get("cache_ttl", 0))
+
+                cached_token: Optional[str] = cache.get(hostname, command)
+                if cached_token:
+                    return cached_token
+
+                command_token: str = subprocess.check_output(command, shell=True).decode().strip()
+                cache.store(hostname, command, command_token)
+                return command_token
 
             # Token case
             token = self.__config["instances"][hostname]["token"]
@@ -126,6 +145,8 @@ class Config:
 
         self.__config["instances"][hostname]["token"] = token
         self.__config["instances"][hostname]["auth_type"] = "token"
+        # The new token may belong to someone else
+        self.__config["instances"][hostname].pop("user", None)
 
     def set_auth_command(self, hostname: str, command: str) -> None:
         """
@@ -136,6 +157,50 @@ class Config:
 
         self.__config["instances"][hostname]["command"] = command
         self.__config["instances"][hostname]["auth_type"] = "command"
+        # The new token may belong to someone else
+        self.__config["instances"][hostname].pop("user", None)
+
+    def user(self, hostname: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns id and username of the user the token of an instance belongs to,
+        if they are known
+        """
+        try:
+            user: Dict[str, Any] = self.__config["instances"][hostname]["user"]
+            return user
+        except KeyError:
+            return None
+
+    def set_user(self, hostname: str, user: Dict[str, Any]) -> None:
+        """
+        Remember id and username of the user the token of an instance belongs to
+        """
+        if hostname not in self.__config["instances"]:
+            self.__config["instances"][hostname] = {}
+
+        self.__config["instances"][hostname]["user"] = user
+
+    def set_cache_ttl(self, hostname: str, ttl: int) -> None:
+        """
+        Sets for how many seconds the token returned by the auth command is reused
+        """
+        if hostname not in self.__config["instances"]:
+            self.__config["instances"][hostname] = {}
+
+        self.__config["instances"][hostname]["cache_ttl"] = ttl
+
+    def session_settings(self, hostname: str) -> SessionSettings:
+        """
+        Returns how the connections to a GitLab instance are set up.
+        Unset values fall back to the defaults of SessionSettings.
+        """
+        instance: Dict[str, Any] = self.__config["instances"].get(hostname, {})
+        defaults = SessionSettings()
+        return SessionSettings(
+            pool_size=int(instance.get("pool_size", defaults.pool_size)),
+            timeout=float(instance.get("timeout", defaults.timeout)),
+            compression=bool(instance.get("compression", defaults.compression)),
+        )
 
     def instances(self) -> Tuple[str, ...]:
         """
@@ -207,6 +272,23 @@ class RepositoryConfig:
 
         self.__config["workflow"] = workflow.value
 
+    def project_id(self, path: str) -> Optional[int]:
+        """
+        get the numeric id of the remote project, if it is known.
+        It is only returned while the path of the remote project stays the same.
+        """
+        project: Dict[str, Any] = self.__config.get("project", {})
+        if project.get("path") != path or not isinstance(project.get("id"), int):
+            return None
+
+        return int(project["id"])
+
+    def set_project_id(self, path: str, project_id: int) -> None:
+        """
+        Remember the numeric id of the remote project at path
+        """
+        self.__config["project"] = {"path": path, "id": project_id}
+
     def save(self) -> None:
         """
         Save the config to disk. This function has to be manually called,
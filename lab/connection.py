@@ -0,0 +1,109 @@
+"""
+Module containing the connection to a GitLab instance
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import sys
+
+from typing import Any, Union
+
+import requests
+from gitlab import Gitlab
+from gitlab.exceptions import (
+    GitlabAuthenticationError,
+    GitlabError,
+    GitlabGetError,
+    GitlabHttpError,
+)
+from gitlab.v4.objects import Project, ProjectManager
+
+from lab import trace
+from lab.utils import Utils, LogType
+
+
+class LoginError(GitlabAuthenticationError):
+    """
+    Raised when a GitLab instance doesn't accept the token
+    """
+
+
+def project_not_found(error: GitlabError) -> bool:
+    """
+    Whether a request failed because there is no project at its path, for example
+    because it was moved, rather than because something in it, like a merge request, is missing.
+    GitLab answers requests for anything in a missing project with "404 Project Not Found".
+    """
+    return error.response_code == 404 and "Project Not Found" in str(error.error_message)
+
+
+class Connection(Gitlab):
+    """
+    Connection to a GitLab instance.
+    It doesn't authenticate by itself, the token is checked by the first real request.
+    """
+
+    def http_request(self, verb: str, path: str, *args: Any, **kwargs: Any) -> requests.Response:
+        try:
+            return super().http_request(verb, path, *args, **kwargs)
+        except LoginError:
+            raise
+        except GitlabAuthenticationError as error:
+            raise LoginError(
+                f"Could not log into GitLab: {self.url}", error.response_code, error.response_body
+            ) from error
+
+
+class LazyProject:
+    """
+    Project that is only requested from the server once one of its attributes is read.
+    Its managers (mergerequests, pipelines, issues, ...) are those of the lazy project
+    that python-gitlab returns without a request. They only need the id,
+    which can also be the path of the project, so using them doesn't request the project.
+    """
+
+    # private
+    __project: Project
+    __loaded: bool
+
+    def __init__(self, manager: ProjectManager, project_id: Union[int, str]) -> None:
+        self.__project = manager.get(project_id, lazy=True)
+        self.__loaded = False
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that aren't found on the LazyProject itself
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        try:
+            return getattr(self.__project, name)
+        except AttributeError:
+            if self.__loaded:
+                raise
+
+        self.load()
+        return getattr(self.__project, name)
+
+    def load(self) -> None:
+        """
+        Request the attributes of the project, unless that already happened
+        """
+        if self.__loaded:
+            return
+
+        try:
+            with trace.phase("project"):
+                self.__project.refresh()
+        except (GitlabHttpError, GitlabGetError):
+            Utils.log(
+                LogType.ERROR,
+                "The repository could not be found on the GitLab instance.",
+            )
+            print(
+                "If the repository was recently moved, please update the origin remote using git."
+            )
+            sys.exit(1)
+
+        self.__loaded = True
@@ -0,0 +1,99 @@
+"""
+Module containing a cache for tokens returned by auth commands
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import hashlib
+import shutil
+import subprocess
+import time
+from typing import Dict, Optional, Tuple
+
+# Seconds for which a token found in the keyring is kept in memory, its remaining lifetime
+# in the keyring is unknown, so it is looked up again soon
+KEYRING_RECHECK: int = 10
+
+
+class CredentialCache:
+    """
+    Keeps tokens returned by auth commands (e.g. gpg --decrypt) for a limited time,
+    so that the command doesn't need to run for every invocation of git-lab.
+
+    Tokens are kept in memory, and if keyctl is installed, in the kernel keyring of the user,
+    which removes them by itself after the time to live.
+    """
+
+    ttl: int
+
+    # Shared by all instances, so that a long-running process reuses the tokens
+    __memory: Dict[str, Tuple[float, str]] = {}
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+
+    @staticmethod
+    def __key(hostname: str, command: str) -> str:
+        # The command is part of the key, so that changing it invalidates the cached token
+        digest: str = hashlib.sha256(command.encode()).hexdigest()[:16]
+        return f"git-lab:{hostname}:{digest}"
+
+    @staticmethod
+    def __keyctl(*args: str, stdin: Optional[str] = None) -> Optional[str]:
+        if not shutil.which("keyctl"):
+            return None
+
+        try:
+            return subprocess.run(
+                ("keyctl",) + args,
+                input=stdin,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def get(self, hostname: str, command: str) -> Optional[str]:
+        """
+        Returns the cached token for a host, or None if there is none or it expired
+        """
+        if self.ttl <= 0:
+            return None
+
+        key: str = self.__key(hostname, command)
+        if key in CredentialCache.__memory:
+            expiry, token = CredentialCache.__memory[key]
+            if time.monotonic() < expiry:
+                return token
+            del CredentialCache.__memory[key]
+
+        key_id: Optional[str] = self.__keyctl("search", "@u", "user", key)
+        if key_id:
+            keyring_token: Optional[str] = self.__keyctl("pipe", key_id)
+            if keyring_token:
+                CredentialCache.__memory[key] = (
+                    time.monotonic() + min(self.ttl, KEYRING_RECHECK),
+                    keyring_token,
+                )
+                return keyring_token
+
+        return None
+
+    def store(self, hostname: str, command: str, token: str) -> None:
+        """
+        Cache a token for the time to live
+        """
+        if self.ttl <= 0:
+            return
+
+        key: str = self.__key(hostname, command)
+        CredentialCache.__memory[key] = (time.monotonic() + self.ttl, token)
+
+        key_id: Optional[str] = self.__keyctl("padd", "user", key, "@u", stdin=token)
+        # timeout prints nothing when it succeeds
+        if key_id and self.__keyctl("timeout", key_id, str(self.ttl)) is None:
+            # Without a timeout, the token would stay in the keyring until logout
+            self.__keyctl("unlink", key_id, "@u")
@@ -0,0 +1,288 @@
+"""
+Module containing the daemon command, which keeps GitLab connections open in the background
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import argparse
+import base64
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, List, Optional
+
+from lab.utils import Utils, LogType
+
+# Environment variables of the client that influence how a command runs
+FORWARDED_ENVIRONMENT = ("GIT_LAB_TRACE",)
+
+
+def parser(
+    subparsers: argparse._SubParsersAction,  # pylint: disable=protected-access
+) -> argparse.ArgumentParser:
+    """
+    Subparser for daemon command
+    :param subparsers: subparsers object from global parser
+    :return: daemon subparser
+    """
+    daemon_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "daemon", help="Keep GitLab connections open in the background"
+    )
+    daemon_parser.add_argument("--stop", help="Stop the running daemon", action="store_true")
+    return daemon_parser
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    run daemon command
+    :param args: parsed arguments
+    """
+    if args.stop:
+        if forward(None) is None:
+            Utils.log(LogType.ERROR, "No daemon is running")
+        return
+
+    # The daemon runs the same commands as the command line interface
+    import lab  # pylint: disable=import-outside-toplevel, cyclic-import
+
+    daemon = Daemon(socket_path(), lab.execute)
+    Utils.log(LogType.INFO, "Listening on", daemon.path)
+    daemon.serve()
+
+
+def socket_path() -> str:
+    """
+    Path of the socket the daemon listens on
+    """
+    runtime_dir: str = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"git-lab-{os.getuid()}.sock")
+
+
+def forward(argv: Optional[List[str]]) -> Optional[int]:
+    """
+    Runs a command in the daemon and prints its output.
+    If argv is None, the daemon is asked to stop instead.
+    :return: the exit status of the command, or None if no daemon is running
+    """
+    path: str = socket_path()
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # Don't send anything to a socket created by someone else
+        if os.stat(path).st_uid != os.getuid():
+            return None
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+
+    request: Dict[str, Any] = (
+        {"stop": True}
+        if argv is None
+        else {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "tty": sys.stdout.isatty(),
+            "env": {name: os.environ.get(name) for name in FORWARDED_ENVIRONMENT},
+        }
+    )
+
+    with connection:
+        connection.sendall((json.dumps(request) + "\n").encode())
+
+        answered: bool = False
+        for line in connection.makefile("r", encoding="utf-8"):
+            answered = True
+            frame: Dict[str, Any] = json.loads(line)
+            if "exit" in frame:
+                return int(frame["exit"])
+
+            stream = sys.stderr if "stderr" in frame else sys.stdout
+            text: str = frame.get("stderr", frame.get("stdout", ""))
+            if frame.get("binary"):
+                # Written by the command to sys.stdout.buffer
+                stream.flush()
+                stream.buffer.write(base64.b64decode(text))
+                stream.buffer.flush()
+            else:
+                stream.write(text)
+                stream.flush()
+
+    # The daemon went away before doing anything, run the command locally
+    return 1 if answered else None
+
+
+class _FrameWriter(io.TextIOBase):
+    """
+    Text stream sending everything written to it to a client of the daemon.
+    Bytes written to its buffer are sent as well, like those written to sys.stdout.buffer.
+    """
+
+    def __init__(self, connection: socket.socket, name: str, tty: bool) -> None:
+        super().__init__()
+        self.__connection = connection
+        self.__name = name
+        self.__tty = tty
+        self.__broken = False
+        self.__buffer = _BinaryFrameWriter(self)
+
+    @property
+    def buffer(self) -> "_BinaryFrameWriter":
+        """
+        Binary stream of the same client stream
+        """
+        return self.__buffer
+
+    def isatty(self) -> bool:
+        return self.__tty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self.__send({self.__name: text})
+        return len(text)
+
+    def write_bytes(self, data: bytes) -> None:
+        """
+        Send bytes to the client, which writes them to the buffer of its stream
+        """
+        if data:
+            self.__send({self.__name: base64.b64encode(data).decode(), "binary": True})
+
+    def __send(self, frame: Dict[str, Any]) -> None:
+        if self.__broken:
+            return
+
+        try:
+            self.__connection.sendall((json.dumps(frame) + "\n").encode())
+        except OSError:
+            # The client went away, finish the command without output
+            self.__broken = True
+
+
+class _BinaryFrameWriter(io.RawIOBase):
+    """
+    Binary stream sending everything written to it to a client of the daemon
+    """
+
+    def __init__(self, text: _FrameWriter) -> None:
+        super().__init__()
+        self.__text = text
+
+    def isatty(self) -> bool:
+        return self.__text.isatty()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.__text.write_bytes(bytes(data))
+        return len(data)
+
+
+class Daemon:
+    """
+    Runs git-lab commands in a long-running process, one at a time.
+    Connections, authentication and projects are cached by the connection classes,
+    so they stay warm between the commands.
+    """
+
+    path: str
+
+    # private
+    __execute: Callable[[List[str]], int]
+
+    def __init__(self, path: str, execute: Callable[[List[str]], int]) -> None:
+        self.path = path
+        self.__execute = execute
+
+    def serve(self) -> None:
+        """
+        Accept commands until a client asks the daemon to stop
+        """
+        if forward([]) is not None:
+            Utils.log(LogType.ERROR, "A daemon is already running")
+            sys.exit(1)
+
+        if os.path.exists(self.path):
+            # Left behind by a daemon that didn't exit cleanly
+            os.remove(self.path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask: int = os.umask(0o077)
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(old_umask)
+        server.listen()
+
+        try:
+            running: bool = True
+            while running:
+                connection, _ = server.accept()
+                with connection:
+                    running = self.handle(connection)
+        finally:
+            server.close()
+            os.remove(self.path)
+
+    def handle(self, connection: socket.socket) -> bool:
+        """
+        Run the command a client sent
+        :return: whether the daemon should keep running
+        """
+        try:
+            line: str = connection.makefile("r", encoding="utf-8").readline()
+            request: Dict[str, Any] = json.loads(line)
+        except (OSError, ValueError):
+            return True
+
+        if request.get("stop"):
+            self.__send_exit(connection, 0)
+            return False
+
+        tty: bool = bool(request.get("tty"))
+        stdout = _FrameWriter(connection, "stdout", tty)
+        stderr = _FrameWriter(connection, "stderr", tty)
+
+        status: int = 1
+        cwd: str = os.getcwd()
+        environment: Dict[str, Optional[str]] = {
+            name: os.environ.get(name) for name in FORWARDED_ENVIRONMENT
+        }
+        try:
+            os.chdir(request["cwd"])
+            self.__set_environment(request.get("env", {}))
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                status = self.__execute(request["argv"]) if request["argv"] else 0
+        except (OSError, KeyError):
+            pass
+        finally:
+            os.chdir(cwd)
+            self.__set_environment(environment)
+
+        self.__send_exit(connection, status)
+        return True
+
+    @staticmethod
+    def __set_environment(environment: Dict[str, Optional[str]]) -> None:
+        for name in FORWARDED_ENVIRONMENT:
+            value: Optional[str] = environment.get(name)
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    @staticmethod
+    def __send_exit(connection: socket.socket, status: int) -> None:
+        try:
+            connection.sendall((json.dumps({"exit": status}) + "\n").encode())
+        except OSError:
+            pass
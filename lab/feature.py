@@ -13,7 +13,7 @@ from typing import Any
 from git import Repo
 from git.exc import GitCommandError
 
-from lab.utils import Utils, LogType
+from lab.utils import Utils, LogType, DeferredDefault
 
 
 def parser(
@@ -32,7 +32,7 @@ def parser(
         "start",
         nargs="?",
         help="starting point for the new branch",
-        default="origin/" + Utils.get_default_branch(Utils.get_cwd_repo()),
+        default=DeferredDefault(lambda: "origin/" + Utils.default_branch()),
     )
     return feature_parser
 
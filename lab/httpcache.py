@@ -0,0 +1,133 @@
+"""
+Module containing the on-disk cache for responses of GitLab instances
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Whether the running command may use the cache (git lab --no-cache)
+_enabled: bool = True  # pylint: disable=invalid-name
+
+# Bytes kept on disk before the least recently used responses are removed
+MAX_SIZE: int = 50 * 1024 * 1024
+
+
+def set_enabled(enabled: bool) -> None:
+    """
+    Enable or disable the cache for the running command
+    """
+    global _enabled  # pylint: disable=global-statement
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """
+    Whether the running command may use the cache
+    """
+    return _enabled
+
+
+class CachedResponse(NamedTuple):
+    """
+    Response body with the headers it was sent with
+    """
+
+    headers: Dict[str, str]
+    body: bytes
+
+
+class ResponseCache:
+    """
+    Stores responses with an ETag, so that they can be revalidated using If-None-Match.
+    The server only answers "304 Not Modified" then, and the body is read from disk.
+
+    Each response is a file containing a line of json with the url and headers,
+    followed by the body. Reading a response updates its modification time,
+    which is used to remove the least recently used responses.
+    """
+
+    path: str
+    max_size: int
+
+    def __init__(self, path: Optional[str] = None, max_size: int = MAX_SIZE) -> None:
+        if path is None:
+            # appdirs is only needed once a command makes requests
+            from appdirs import user_cache_dir  # pylint: disable=import-outside-toplevel
+
+            path = os.path.join(user_cache_dir("git-lab"), "responses")
+
+        self.path = path
+        self.max_size = max_size
+
+    @staticmethod
+    def key(url: str, credentials: str) -> str:
+        """
+        Returns the key of a response.
+        Different tokens can see different things, so they don't share responses.
+        """
+        return hashlib.sha256(f"{credentials}\n{url}".encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached response for key, if there is one
+        """
+        path: str = os.path.join(self.path, key)
+        try:
+            with open(path, "rb") as file:
+                metadata: Dict[str, Dict[str, str]] = json.loads(file.readline())
+                body: bytes = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(metadata["headers"], body)
+
+    def store(self, key: str, url: str, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Cache a response
+        """
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            # Write to a temporary file first, so that a concurrent load never sees half of it
+            descriptor, temporary_path = tempfile.mkstemp(dir=self.path, prefix=".")
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(json.dumps({"url": url, "headers": headers}).encode() + b"\n")
+                file.write(body)
+            os.replace(temporary_path, os.path.join(self.path, key))
+        except OSError:
+            # Not being able to cache shouldn't break the command
+            return
+
+        self.__evict()
+
+    def __evict(self) -> None:
+        entries: List[Tuple[float, int, str]] = []
+        total: int = 0
+        with os.scandir(self.path) as directory:
+            for entry in directory:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        # Least recently used first
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
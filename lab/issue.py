@@ -8,6 +8,7 @@ from typing import Dict, Any, Callable
 from gitlab import GitlabGetError
 from gitlab.v4.objects import ProjectIssue
 
+from lab.connection import project_not_found
 from lab.repositoryconnection import RepositoryConnection
 from lab.utils import Utils, LogType, TextFormatting, is_valid_time_str
 
@@ -94,7 +95,9 @@ class IssueConnection(RepositoryConnection):
         RepositoryConnection.__init__(self)
         try:
             self.issue: ProjectIssue = self._remote_project.issues.get(issue_id, lazy=False)
-        except GitlabGetError:
+        except GitlabGetError as error:
+            if project_not_found(error):
+                raise
             Utils.log(LogType.WARNING, f"No issue with ID {issue_id}")
             sys.exit(1)
 
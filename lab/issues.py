@@ -7,17 +7,24 @@ Module containing issues command
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import argparse
+import itertools
 import os
 import sys
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List, Optional
 
 from gitlab.v4.objects import ProjectIssue
 from gitlab.exceptions import GitlabGetError
 
+from lab import output, pagination
+from lab.localindex import LocalIndex, argument_error
+from lab.connection import project_not_found
 from lab.repositoryconnection import RepositoryConnection
 from lab.utils import TextFormatting, Utils, LogType
 from lab.table import Table
 
+# Columns of --format csv and tsv
+FIELDS = output.ISSUABLE_FIELDS + ("labels", "created_at", "updated_at", "web_url")
+
 
 def parser(
     subparsers: argparse._SubParsersAction,  # pylint: disable=protected-access
@@ -55,6 +62,19 @@ def parser(
         "issue_id", help="Show issue by id if provided", metavar="issue_id", type=int, nargs="?"
     )
     issues_parser.add_argument("--web", help="open on web browser", action="store_true")
+    issues_parser.add_argument(
+        "--cached",
+        help="Answer from the local index of the project (see git lab sync), "
+        + "which is refreshed in the background",
+        action="store_true",
+    )
+    issues_parser.add_argument(
+        "--grep",
+        help="Search title, description and labels of the issues of the project "
+        + "in the local index, best matches first",
+        metavar="TEXT",
+    )
+    pagination.add_arguments(issues_parser)
     return issues_parser
 
 
@@ -70,7 +90,23 @@ def run(args: argparse.Namespace) -> None:
         else:
             print(issue)
     else:
-        lister: IssuesList = IssuesList(args.opened, args.closed, args.assigned, args.project)
+        error: Optional[str] = argument_error(args.cached, args.project, args.grep)
+        if error:
+            Utils.log(LogType.ERROR, error)
+            sys.exit(1)
+        if args.grep and args.assigned:
+            Utils.log(LogType.ERROR, "--grep searches all issues of the project, not --assigned")
+            sys.exit(1)
+
+        lister: IssuesList = IssuesList(
+            args.opened,
+            args.closed,
+            args.assigned,
+            args.project or bool(args.grep),
+            args.limit,
+            args.cached,
+            args.grep,
+        )
         if args.web:
             lister.open_web()
         else:
@@ -86,9 +122,24 @@ class IssuesList(RepositoryConnection):
     closed: bool = True
     assigned: bool = False
     project: bool = False
+    limit: Optional[int] = pagination.DEFAULT_LIMIT
+    cached: bool = False
+    grep: Optional[str] = None
 
-    def __init__(self, opened: bool, closed: bool, assigned: bool, for_project: bool) -> None:
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        opened: bool,
+        closed: bool,
+        assigned: bool,
+        for_project: bool,
+        limit: Optional[int] = pagination.DEFAULT_LIMIT,
+        cached: bool = False,
+        grep: Optional[str] = None,
+    ) -> None:
         RepositoryConnection.__init__(self)
+        self.limit = limit
+        self.cached = cached
+        self.grep = grep
         self.opened = opened
         self.closed = closed
         self.assigned = assigned
@@ -96,7 +147,8 @@ class IssuesList(RepositoryConnection):
 
     def print_formatted_list(self) -> None:
         """
-        prints the list of issues to the terminal formatted as a table
+        prints the list of issues to the terminal formatted as a table,
+        or as records in the format selected by --format
         """
         table = Table()
         args: Dict[str, str] = {}
@@ -109,33 +161,70 @@ class IssuesList(RepositoryConnection):
             state = "closed"
         args["state"] = state
 
-        issues: List[ProjectIssue] = []
-        if not self.for_project and self.assigned:
+        issues: Iterator[ProjectIssue] = iter(())
+        if self.cached or self.grep:
+            issues = self.__fetch_cached(state)
+        elif not self.for_project and self.assigned:
             # List issues all over the instance assigned to me
-            args["scope"] = "assigned_to_me"
-            issues = self._connection.issues.list(**args)
+            issues = pagination.lazy_list(
+                self._connection.issues, self.limit, scope="assigned_to_me", **args
+            )
         elif not self.for_project and not self.assigned:
             # Request both created and assigned issues on the whole instance
-            args["scope"] = "created_by_me"
-            issues = self._connection.issues.list(**args)
-            args["scope"] = "assigned_to_me"
-            issues += self._connection.issues.list(**args)
+            created: Iterator[ProjectIssue] = pagination.lazy_list(
+                self._connection.issues, self.limit, scope="created_by_me", **args
+            )
+            assigned: Iterator[ProjectIssue] = pagination.lazy_list(
+                self._connection.issues, self.limit, scope="assigned_to_me", **args
+            )
+            issues = pagination.limited(itertools.chain(created, assigned), self.limit)
         elif self.for_project and not self.assigned:
             # Request all issues on the current project
-            args["scope"] = "all"
-            issues = self._remote_project.issues.list(**args)
-
-        for issue in issues:
-            formatting = TextFormatting.GREEN if issue.state == "opened" else TextFormatting.RED
-            row: List[str] = [
-                TextFormatting.BOLD + issue.references["full"] + TextFormatting.END,
-                issue.title,
-                formatting + issue.state + TextFormatting.END,
+            issues = pagination.lazy_list(
+                self._remote_project.issues, self.limit, scope="all", **args
+            )
+
+        issues = pagination.prefetch(issues, self.__page_size)
+        if not output.is_table():
+            output.print_records((output.record(issue) for issue in issues), FIELDS)
+            return
+
+        table.print_stream(
+            (self.__row(issue) for issue in issues),
+            self.__page_size,
+        )
+
+    def __fetch_cached(self, state: str) -> Iterator[ProjectIssue]:
+        index: LocalIndex = self._local_index("issues")
+        try:
+            states: List[str] = ["opened", "closed"] if state == "all" else [state]
+            attributes: List[Dict[str, Any]] = (
+                index.search("issues", self.grep, states, self.limit)
+                if self.grep
+                else index.query("issues", states, self.limit)
+            )
+        finally:
+            index.close()
+
+        return iter(
+            [
+                ProjectIssue(self._remote_project.issues, data, created_from_list=True)
+                for data in attributes
             ]
+        )
 
-            table.add_row(row)
+    @property
+    def __page_size(self) -> int:
+        return pagination.per_page(self.limit)
 
-        table.print()
+    @staticmethod
+    def __row(issue: ProjectIssue) -> List[str]:
+        formatting = TextFormatting.GREEN if issue.state == "opened" else TextFormatting.RED
+        return [
+            TextFormatting.BOLD + issue.references["full"] + TextFormatting.END,
+            issue.title,
+            formatting + issue.state + TextFormatting.END,
+        ]
 
     def open_web(self) -> None:
         """
@@ -156,7 +245,9 @@ class IssuesShow(RepositoryConnection):
         RepositoryConnection.__init__(self)
         try:
             self.issue: ProjectIssue = self._remote_project.issues.get(issue_id, lazy=False)
-        except GitlabGetError:
+        except GitlabGetError as error:
+            if project_not_found(error):
+                raise
             Utils.log(LogType.WARNING, f"No issue with ID {issue_id}")
             sys.exit(1)
 
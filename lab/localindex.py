@@ -0,0 +1,386 @@
+"""
+Module containing the local index of merge requests and issues of a repository
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import fcntl
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Kinds of objects in the index, named like the API endpoints
+KINDS = ("merge_requests", "issues")
+
+# Seconds after which listing from the index starts a sync in the background
+REFRESH_AFTER: int = 300
+
+# GitLab only updates the last activity of a project if it is older than this
+ACTIVITY_GRANULARITY = timedelta(hours=1)
+
+# How far the clock of GitLab may be behind the local one
+CLOCK_SKEW = timedelta(minutes=5)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    kind TEXT NOT NULL,
+    iid INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, iid)
+);
+CREATE INDEX IF NOT EXISTS objects_updated_at ON objects (kind, updated_at);
+CREATE TABLE IF NOT EXISTS sync (
+    kind TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    last_activity_at TEXT
+);
+"""
+
+
+class SyncState(NamedTuple):
+    """
+    When a kind of objects was last synced
+    """
+
+    project: str
+    synced_at: float  # seconds since the epoch at which the last complete sync started
+    last_activity_at: Optional[str]  # of the project, as reported by GitLab
+
+
+class LocalIndex:
+    """
+    SQLite database in the git directory of a repository, containing the merge requests
+    and issues of its GitLab project as returned by the API.
+
+    It is updated incrementally: objects are stored in the order they were updated,
+    so the most recent updated_at is where the next sync continues.
+    """
+
+    path: str
+
+    # private
+    __database: sqlite3.Connection
+    __full_text: bool
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # A sync can run in the background while a command reads the index,
+        # which write-ahead logging allows without waiting for it
+        self.__database = sqlite3.connect(path, timeout=30)
+        self.__database.execute("PRAGMA journal_mode=WAL")
+        self.__database.executescript(SCHEMA)
+        self.__full_text = self.__create_full_text_tables()
+
+    def __create_full_text_tables(self) -> bool:
+        """
+        Create a full text index of title, description and labels for each kind,
+        with the iid as rowid. Returns False if SQLite was built without FTS5.
+        """
+        for kind in KINDS:
+            table: str = kind + "_text"
+            if self.__database.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = ?", (table,)
+            ).fetchone():
+                continue
+
+            try:
+                with self.__database:
+                    self.__database.execute(
+                        f"CREATE VIRTUAL TABLE {table} USING fts5(title, description, labels)"
+                    )
+                    # Objects stored before the full text index existed
+                    for (data,) in self.__database.execute(
+                        "SELECT data FROM objects WHERE kind = ?", (kind,)
+                    ).fetchall():
+                        self.__index_text(kind, json.loads(data))
+            except sqlite3.OperationalError:
+                return False
+
+        return True
+
+    def __index_text(self, kind: str, attributes: Dict[str, Any]) -> None:
+        self.__database.execute(f"DELETE FROM {kind}_text WHERE rowid = ?", (attributes["iid"],))
+        self.__database.execute(
+            f"INSERT INTO {kind}_text (rowid, title, description, labels) VALUES (?, ?, ?, ?)",
+            (attributes["iid"], *_text_fields(attributes)),
+        )
+
+    @staticmethod
+    def path_for(git_dir: Union[str, "os.PathLike[str]"]) -> str:
+        """
+        Returns the path of the index of a repository
+        """
+        return os.path.join(git_dir, "gitlab-cache.db")
+
+    def close(self) -> None:
+        """
+        Close the database
+        """
+        self.__database.close()
+
+    def sync_state(self, kind: str) -> Optional[SyncState]:
+        """
+        Returns when kind was last synced, None if it never was
+        """
+        row: Any = self.__database.execute(
+            "SELECT project, synced_at, last_activity_at FROM sync WHERE kind = ?", (kind,)
+        ).fetchone()
+        return SyncState(*row) if row else None
+
+    def cursor(self, kind: str) -> Optional[str]:
+        """
+        Returns the updated_at of the most recently updated object of kind.
+        Everything updated before it is in the index.
+        """
+        row: Any = self.__database.execute(
+            "SELECT max(updated_at) FROM objects WHERE kind = ?", (kind,)
+        ).fetchone()
+        return str(row[0]) if row[0] else None
+
+    def store(self, kind: str, objects: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or update objects as returned by the API
+        :return: number of stored objects
+        """
+        count: int = 0
+        with self.__database:
+            for attributes in objects:
+                self.__database.execute(
+                    "INSERT OR REPLACE INTO objects (kind, iid, state, updated_at, data) "
+                    + "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        kind,
+                        attributes["iid"],
+                        attributes["state"],
+                        attributes["updated_at"],
+                        json.dumps(attributes),
+                    ),
+                )
+                if self.__full_text:
+                    self.__index_text(kind, attributes)
+                count += 1
+
+        return count
+
+    def finish_sync(
+        self,
+        kind: str,
+        project: str,
+        last_activity_at: Optional[str],
+        started_at: Optional[float] = None,
+    ) -> None:
+        """
+        Remember that kind was synced completely for project
+        :param started_at: when the sync started, now if None
+        """
+        with self.__database:
+            self.__database.execute(
+                "INSERT OR REPLACE INTO sync (kind, project, synced_at, last_activity_at) "
+                + "VALUES (?, ?, ?, ?)",
+                (
+                    kind,
+                    project,
+                    time.time() if started_at is None else started_at,
+                    last_activity_at,
+                ),
+            )
+
+    def update(self, project: Any, project_path: str, kind: str) -> int:
+        """
+        Download the objects of kind that changed since the last sync
+        :param project: python-gitlab project the index belongs to
+        :param project_path: path of the project, the index is cleared if it changes
+        :return: number of objects that changed
+        """
+        started_at: float = time.time()
+        state: Optional[SyncState] = self.sync_state(kind)
+        if state is not None and state.project != project_path:
+            self.clear(kind)
+            state = None
+
+        last_activity_at: str = project.last_activity_at
+        if state is not None and self.__unchanged_since(state, last_activity_at):
+            self.finish_sync(kind, project_path, last_activity_at, started_at)
+            return 0
+
+        filters: Dict[str, Any] = {"state": "all", "order_by": "updated_at", "sort": "asc"}
+        if kind == "issues":
+            filters["scope"] = "all"
+        updated_after: Optional[str] = self.__updated_after(kind, state)
+        if updated_after:
+            filters["updated_after"] = updated_after
+
+        manager: Any = project.mergerequests if kind == "merge_requests" else project.issues
+        count: int = self.store(
+            kind,
+            (item.asdict() for item in manager.list(iterator=True, per_page=100, **filters)),
+        )
+        self.finish_sync(kind, project_path, last_activity_at, started_at)
+        return count
+
+    def __updated_after(self, kind: str, state: Optional[SyncState]) -> Optional[str]:
+        """
+        Returns where a sync continues, the cursor unless it is after the start of the last sync.
+        Objects updated while the last sync was running move to the end of the list,
+        which shifts the pages that come after, so one of them can have been skipped.
+        """
+        cursor: Optional[str] = self.cursor(kind)
+        if cursor is None or state is None:
+            return cursor
+
+        last_start: datetime = datetime.fromtimestamp(state.synced_at, timezone.utc) - CLOCK_SKEW
+        if last_start < datetime.fromisoformat(cursor.replace("Z", "+00:00")):
+            return last_start.isoformat()
+        return cursor
+
+    @staticmethod
+    def __unchanged_since(state: SyncState, last_activity_at: str) -> bool:
+        """
+        Whether nothing happened in the project since the last sync.
+        Activity after the last sync would have moved last_activity_at, unless it happened
+        within ACTIVITY_GRANULARITY of the previous activity.
+        """
+        if state.last_activity_at != last_activity_at:
+            return False
+
+        last_activity = datetime.fromisoformat(last_activity_at.replace("Z", "+00:00"))
+        return state.synced_at >= (last_activity + ACTIVITY_GRANULARITY).timestamp()
+
+    def clear(self, kind: str) -> None:
+        """
+        Remove all objects of kind, so that the next sync starts from scratch
+        """
+        with self.__database:
+            self.__database.execute("DELETE FROM objects WHERE kind = ?", (kind,))
+            self.__database.execute("DELETE FROM sync WHERE kind = ?", (kind,))
+            if self.__full_text:
+                self.__database.execute(f"DELETE FROM {kind}_text")
+
+    def query(self, kind: str, states: Sequence[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Returns the most recently updated objects of kind in one of states
+        """
+        rows: List[Any] = self.__database.execute(
+            "SELECT data FROM objects WHERE kind = ? AND state IN ({}) ".format(
+                ", ".join("?" * len(states))
+            )
+            + "ORDER BY updated_at DESC LIMIT ?",
+            (kind, *states, -1 if limit is None else limit),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def search(
+        self, kind: str, text: str, states: Sequence[str], limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the objects of kind in one of states whose title, description or labels
+        contain all words of text, the best matches first
+        :raises ValueError: if text contains no words
+        """
+        words: List[str] = text.split()
+        if not words:
+            # Would be an invalid FTS5 query
+            raise ValueError("No words to search for")
+        if not self.__full_text:
+            return self.__search_without_index(kind, words, states, limit)
+
+        # Quoted, so that words are never taken as FTS5 operators
+        match: str = " ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+        rows: List[Any] = self.__database.execute(
+            f"SELECT objects.data FROM {kind}_text "
+            + f"JOIN objects ON objects.kind = ? AND objects.iid = {kind}_text.rowid "
+            + f"WHERE {kind}_text MATCH ? AND objects.state IN ({', '.join('?' * len(states))}) "
+            # Matches in the title count the most, then labels, then the description
+            + f"ORDER BY bm25({kind}_text, 10.0, 1.0, 5.0) LIMIT ?",
+            (kind, match, *states, -1 if limit is None else limit),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def __search_without_index(
+        self, kind: str, words: List[str], states: Sequence[str], limit: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Slow path of search for SQLite without FTS5.
+        The most recently updated matches come first.
+        """
+        results: List[Dict[str, Any]] = []
+        for attributes in self.query(kind, states, None):
+            text: str = " ".join(_text_fields(attributes)).lower()
+            if all(word.lower() in text for word in words):
+                results.append(attributes)
+                if len(results) == limit:
+                    break
+
+        return results
+
+
+def _text_fields(attributes: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Returns title, description and labels of an object, as searched by LocalIndex.search
+    """
+    labels: List[str] = [
+        label["name"] if isinstance(label, dict) else str(label)
+        for label in attributes.get("labels") or []
+    ]
+    return (
+        attributes.get("title") or "",
+        attributes.get("description") or "",
+        " ".join(labels),
+    )
+
+
+def argument_error(cached: bool, project: bool, grep: Optional[str]) -> Optional[str]:
+    """
+    Checks the --cached and --grep options shared by the list commands
+    :param cached: whether --cached was passed
+    :param project: whether --project was passed
+    :param grep: words passed to --grep, if any
+    :return: message describing the invalid combination, or None if the options are valid
+    """
+    if cached and not project:
+        return "--cached only works together with --project"
+    if grep is not None and not grep.split():
+        return "--grep needs at least one word"
+    return None
+
+
+def refresh_in_background(git_dir: Union[str, "os.PathLike[str]"]) -> None:
+    """
+    Run git lab sync for the repository in the working directory in a process of its own,
+    which keeps running after the current command finished.
+    Nothing is started while a sync started like this is still running.
+    """
+    with open(os.path.join(git_dir, "gitlab-sync.lock"), "ab") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+
+        # The package isn't necessarily installed, so tell the process where to find it
+        root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.path.insert(0, sys.argv.pop(1)); import lab; lab.main()",
+                root,
+                "sync",
+                "--quiet",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # The process inherits the locked file, which stays locked until it exits
+            pass_fds=(lock.fileno(),),
+            start_new_session=True,
+        )
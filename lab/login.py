@@ -6,8 +6,10 @@ Module containing login command
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 import argparse
+import sys
 
 from lab.config import Config
+from lab.utils import Utils, LogType
 
 
 def parser(
@@ -27,6 +29,12 @@ def parser(
     group = login_parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--token", help="GitLab api private token")
     group.add_argument("--command", help="Command to run when a token is needed")
+    login_parser.add_argument(
+        "--cache-ttl",
+        help="Reuse the token returned by --command for this many seconds (default 0)",
+        metavar="seconds",
+        type=int,
+    )
 
     return login_parser
 
@@ -36,10 +44,16 @@ def run(args: argparse.Namespace) -> None:
     run login command
     :param args: parsed arguments
     """
+    if args.token and args.cache_ttl is not None:
+        Utils.log(LogType.ERROR, "--cache-ttl only works together with --command")
+        sys.exit(1)
+
     config: Config = Config()
 
     if args.command:
         config.set_auth_command(args.host, args.command)
+        if args.cache_ttl is not None:
+            config.set_cache_ttl(args.host, args.cache_ttl)
     else:
         config.set_token(args.host, args.token)
 
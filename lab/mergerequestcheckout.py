@@ -16,6 +16,7 @@ from gitlab.exceptions import GitlabHttpError, GitlabGetError
 from git.remote import Remote
 from git.refs.reference import Reference
 
+from lab.connection import project_not_found
 from lab.repositoryconnection import RepositoryConnection
 from lab.utils import Utils
 from lab.utils import LogType
@@ -98,7 +99,13 @@ class MergeRequestCheckout(RepositoryConnection):
         """
         Checks out the merge request with the specified id in the local worktree
         """
-        self.__mr = self._remote_project.mergerequests.get(merge_request_id, lazy=False)
+        try:
+            self.__mr = self._remote_project.mergerequests.get(merge_request_id, lazy=False)
+        except GitlabGetError as error:
+            if project_not_found(error):
+                raise
+            Utils.log(LogType.ERROR, f"Merge request !{merge_request_id} not found")
+            sys.exit(1)
         print('Checking out merge request "{}"...'.format(self.__mr.title))
         print("  branch:", self.__mr.source_branch)
 
@@ -20,9 +20,10 @@ from git import Remote, IndexFile, PushInfo
 from gitlab.v4.objects import Project, ProjectMergeRequest
 from gitlab.exceptions import GitlabCreateError, GitlabGetError
 
+from lab import trace
 from lab.repositoryconnection import RepositoryConnection
 from lab.config import RepositoryConfig, Workflow
-from lab.utils import Utils, LogType
+from lab.utils import Utils, LogType, DeferredDefault
 from lab.editorinput import EditorInput
 
 
@@ -40,7 +41,7 @@ def parser(
     create_parser.add_argument(
         "--target-branch",
         help="Use different target branch than master",
-        default=Utils.get_default_branch(Utils.get_cwd_repo()),
+        default=DeferredDefault(Utils.default_branch),
     )
     create_parser.add_argument(
         "--noninteractive", help="Don't ask any interactive questions", action="store_true"
@@ -166,7 +167,13 @@ class MergeRequestCreator(RepositoryConnection):
             )
             # Detect ssh url
             url = Utils.ssh_url_from_http(
-                self._connection.user.web_url + "/" + self._remote_project.path
+                "/".join(
+                    (
+                        self._connection.url,
+                        self._current_user()["username"],
+                        self._remote_project.path,
+                    )
+                )
             )
 
             self._local_repo.create_remote("fork", url=url)
@@ -180,12 +187,13 @@ class MergeRequestCreator(RepositoryConnection):
         """
         remote: Remote
         info: PushInfo
-        if self.__fork:
-            remote = self._local_repo.remotes.fork
-            info = remote.push(force=True)[0]
-        else:
-            remote = self._local_repo.remotes.origin
-            info = remote.push(refspec=self._local_repo.head, force=True)[0]
+        with trace.phase("push"):
+            if self.__fork:
+                remote = self._local_repo.remotes.fork
+                info = remote.push(force=True)[0]
+            else:
+                remote = self._local_repo.remotes.origin
+                info = remote.push(refspec=self._local_repo.head, force=True)[0]
 
         self._local_repo.active_branch.set_tracking_branch(info.remote_ref)
 
@@ -228,7 +236,7 @@ class MergeRequestCreator(RepositoryConnection):
         mrs: List[ProjectMergeRequest] = self._remote_project.mergerequests.list(
             source_branch=self._local_repo.active_branch.name,
             target_branch=self.__target_branch,
-            target_project_id=self._remote_project.id,
+            target_project_id=self._remote_project_id(),
         )
 
         if len(mrs) > 0:
@@ -254,7 +262,7 @@ class MergeRequestCreator(RepositoryConnection):
             title = e_input.title
             body = self.__upload_assets(e_input.body)
 
-        project: Project = self.__remote_fork if self.__fork else self._remote_project
+        project: Any = self.__remote_fork if self.__fork else self._remote_project
 
         merge_request = project.mergerequests.create(
             {
@@ -262,7 +270,7 @@ class MergeRequestCreator(RepositoryConnection):
                 "target_branch": self.__target_branch,
                 "title": title,
                 "description": body,
-                "target_project_id": self._remote_project.id,
+                "target_project_id": self._remote_project_id(),
                 "allow_maintainer_to_push": True,
                 "remove_source_branch": True,
             }
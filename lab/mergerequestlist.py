@@ -6,12 +6,18 @@ Module containing classes for listing merge requests
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 import argparse
-from typing import List
+import heapq
+import math
+import sys
+from enum import Enum, auto
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from gitlab.v4.objects import ProjectMergeRequest
 
+from lab import output, pagination
+from lab.localindex import LocalIndex, argument_error
 from lab.repositoryconnection import RepositoryConnection
-from lab.utils import TextFormatting
+from lab.utils import TextFormatting, Utils, LogType
 from lab.table import Table
 
 
@@ -51,19 +57,90 @@ def parser(
         help="Show web url of merge requests (default false)",
         action="store_true",
     )
+    lister_parser.add_argument(
+        "--cached",
+        help="Answer from the local index of the project (see git lab sync), "
+        + "which is refreshed in the background",
+        action="store_true",
+    )
+    lister_parser.add_argument(
+        "--grep",
+        help="Search title, description and labels of the merge requests of the project "
+        + "in the local index, best matches first",
+        metavar="TEXT",
+    )
+    pagination.add_arguments(lister_parser)
     return lister_parser
 
 
+# Columns of --format csv and tsv
+FIELDS = output.ISSUABLE_FIELDS + (
+    "source_branch",
+    "target_branch",
+    "created_at",
+    "updated_at",
+    "web_url",
+)
+
+# Share of the merge requests that are in each state, as found in long-lived projects,
+# where most merge requests end up being merged
+STATE_PRIORS: Dict[str, float] = {"opened": 0.1, "merged": 0.75, "closed": 0.15}
+
+
+class FetchStrategy(Enum):
+    """
+    Ways to request merge requests in some of the states
+    """
+
+    ALL_STATES = auto()  # one state=all request, filtered locally
+    PER_STATE = auto()  # one request per state at the same time, merged locally
+
+
+def plan_fetch(states: Sequence[str], limit: Optional[int]) -> FetchStrategy:
+    """
+    Returns the cheapest way to get the limit most recently updated merge requests in states.
+
+    A state=all request needs limit / selectivity merge requests to find limit matching ones,
+    which is less than two pages of limit as long as at least half of the merge requests
+    are expected to match. Otherwise requesting each state on its own at the same time
+    transfers less and doesn't risk a second round trip for another page.
+    Without a limit, the merge requests that are thrown away would be transferred on every page
+    of a state=all request, so it is only used if nothing needs to be thrown away.
+    """
+    if len(states) == len(STATE_PRIORS):
+        return FetchStrategy.ALL_STATES
+
+    selectivity: float = sum(STATE_PRIORS[state] for state in states)
+    if limit is not None and len(states) > 1 and selectivity >= 0.5:
+        return FetchStrategy.ALL_STATES
+
+    return FetchStrategy.PER_STATE
+
+
 def run(args: argparse.Namespace) -> None:
     """
     run merge request list command
     :param args: parsed arguments
     """
-    lister = MergeRequestList(args.project, args.merged, args.opened, args.closed, args.url)
+    error: Optional[str] = argument_error(args.cached, args.project, args.grep)
+    if error:
+        Utils.log(LogType.ERROR, error)
+        sys.exit(1)
+
+    lister = MergeRequestList(
+        args.project or bool(args.grep),
+        args.merged,
+        args.opened,
+        args.closed,
+        args.url,
+        args.limit,
+        args.cached,
+        args.grep,
+    )
     lister.print_formatted_list()
 
 
-class MergeRequestList(RepositoryConnection):
+class MergeRequestList(RepositoryConnection):  # pylint: disable=too-many-instance-attributes
     """
     Lists all merge requests of the current repository
     """
@@ -73,13 +150,27 @@ class MergeRequestList(RepositoryConnection):
     opened: bool = True
     closed: bool = True
     show_url: bool = True
+    limit: Optional[int] = pagination.DEFAULT_LIMIT
+    cached: bool = False
+    grep: Optional[str] = None
 
-    def __init__(  # pylint: disable=too-many-arguments
-        self, for_project: bool, merged: bool, opened: bool, closed: bool, show_url: bool
+    def __init__(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        for_project: bool,
+        merged: bool,
+        opened: bool,
+        closed: bool,
+        show_url: bool,
+        limit: Optional[int] = pagination.DEFAULT_LIMIT,
+        cached: bool = False,
+        grep: Optional[str] = None,
     ) -> None:
         RepositoryConnection.__init__(self)
         self.for_project = for_project
         self.show_url = show_url
+        self.limit = limit
+        self.cached = cached
+        self.grep = grep
 
         if not merged and not opened and not closed:
             return
@@ -88,49 +179,126 @@ class MergeRequestList(RepositoryConnection):
         self.opened = opened
         self.closed = closed
 
-    def print_formatted_list(self) -> None:  # pylint: disable=too-many-branches
+    def __states(self) -> List[str]:
+        return [
+            state
+            for state, selected in (
+                ("opened", self.opened),
+                ("merged", self.merged),
+                ("closed", self.closed),
+            )
+            if selected
+        ]
+
+    def fetch(self, strategy: Optional[FetchStrategy] = None) -> Iterator[ProjectMergeRequest]:
         """
-        prints the list of merge requests to the terminal formatted as a table
+        Returns the most recently updated merge requests in the selected states.
+        They are requested page by page in the background while the caller goes through them.
+        :param strategy: how to request them, by default the one chosen by plan_fetch
         """
-        merge_requests: List[ProjectMergeRequest] = []
+        states: List[str] = self.__states()
+        if self.cached or self.grep:
+            return self.__fetch_cached(states)
 
-        if self.for_project:
-            base = self._remote_project
-        else:
-            base = self._connection
+        base: Any = self._remote_project if self.for_project else self._connection
+        if strategy is None:
+            strategy = plan_fetch(states, self.limit)
 
-        if self.merged and self.opened and self.closed:
-            merge_requests = base.mergerequests.list()
-        else:
-            if self.merged:
-                merge_requests += base.mergerequests.list(state="merged")
-            if self.opened:
-                merge_requests += base.mergerequests.list(state="opened")
-            if self.closed:
-                merge_requests += base.mergerequests.list(state="closed")
+        if strategy == FetchStrategy.ALL_STATES:
+            # Ask for enough that the page most likely contains limit matching ones,
+            # the following pages are only requested if it didn't.
+            selectivity: float = sum(STATE_PRIORS[state] for state in states)
+            page_size: int = pagination.per_page(
+                None if self.limit is None else math.ceil(self.limit * 1.2 / selectivity)
+            )
+            merge_requests: Iterator[ProjectMergeRequest] = (
+                merge_request
+                for merge_request in pagination.lazy_list(
+                    base.mergerequests,
+                    None,
+                    state="all",
+                    order_by="updated_at",
+                    sort="desc",
+                    per_page=page_size,
+                )
+                if merge_request.state in states
+            )
+            return pagination.prefetch(pagination.limited(merge_requests, self.limit), page_size)
 
-        table = Table()
+        # Each state is requested in its own thread, so they are requested at the same time
+        per_state: List[Iterator[ProjectMergeRequest]] = [
+            pagination.prefetch(
+                pagination.lazy_list(
+                    base.mergerequests,
+                    self.limit,
+                    state=state,
+                    order_by="updated_at",
+                    sort="desc",
+                ),
+                pagination.per_page(self.limit),
+            )
+            for state in states
+        ]
+        return pagination.limited(
+            heapq.merge(
+                *per_state, key=lambda merge_request: merge_request.updated_at, reverse=True
+            ),
+            self.limit,
+        )
 
-        for merge_request in merge_requests:
-            row: List[str] = []
+    def __fetch_cached(self, states: List[str]) -> Iterator[ProjectMergeRequest]:
+        index: LocalIndex = self._local_index("merge_requests")
+        try:
+            attributes: List[Dict[str, Any]] = (
+                index.search("merge_requests", self.grep, states, self.limit)
+                if self.grep
+                else index.query("merge_requests", states, self.limit)
+            )
+        finally:
+            index.close()
 
-            # Show merge request reference or url according to command line options
-            if self.show_url:
-                row.append(merge_request.web_url)
-            else:
-                row.append(
-                    TextFormatting.BOLD + merge_request.references["full"] + TextFormatting.END
+        return iter(
+            [
+                ProjectMergeRequest(
+                    self._remote_project.mergerequests, data, created_from_list=True
                 )
+                for data in attributes
+            ]
+        )
 
-            row.append(merge_request.title)
+    def print_formatted_list(self) -> None:
+        """
+        prints the list of merge requests to the terminal formatted as a table,
+        or as records in the format selected by --format
+        """
+        if not output.is_table():
+            output.print_records(
+                (output.record(merge_request) for merge_request in self.fetch()), FIELDS
+            )
+            return
+
+        table = Table()
+        table.print_stream(
+            (self.__row(merge_request) for merge_request in self.fetch()),
+            pagination.per_page(self.limit),
+        )
+
+    def __row(self, merge_request: ProjectMergeRequest) -> List[str]:
+        row: List[str] = []
+
+        # Show merge request reference or url according to command line options
+        if self.show_url:
+            row.append(merge_request.web_url)
+        else:
+            row.append(TextFormatting.BOLD + merge_request.references["full"] + TextFormatting.END)
 
-            if merge_request.state == "merged":
-                row.append(TextFormatting.GREEN + merge_request.state + TextFormatting.END)
-            elif merge_request.state == "opened":
-                row.append(merge_request.state)
-            elif merge_request.state == "closed":
-                row.append(TextFormatting.RED + merge_request.state + TextFormatting.END)
+        row.append(merge_request.title)
 
-            table.add_row(row)
+        if merge_request.state == "merged":
+            row.append(TextFormatting.GREEN + merge_request.state + TextFormatting.END)
+        elif merge_request.state == "opened":
+            row.append(merge_request.state)
+        elif merge_request.state == "closed":
+            row.append(TextFormatting.RED + merge_request.state + TextFormatting.END)
 
-        table.print()
+        return row
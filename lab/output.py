@@ -0,0 +1,86 @@
+"""
+Module containing the output formats of listing commands
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import csv
+import json
+import sys
+from typing import Any, Dict, Iterable, Sequence
+
+FORMATS = ("table", "json", "jsonl", "csv", "tsv")
+
+# Columns of csv and tsv that merge requests and issues have in common
+ISSUABLE_FIELDS = ("id", "iid", "references.full", "title", "state", "author.username")
+
+# Format selected for the running command (git lab --format)
+_format: str = "table"  # pylint: disable=invalid-name
+
+
+def set_format(name: str) -> None:
+    """
+    Select the output format for the running command
+    """
+    global _format  # pylint: disable=global-statement
+    _format = name
+
+
+def is_table() -> bool:
+    """
+    Whether lists are shown as a table for people, rather than records for scripts
+    """
+    return _format == "table"
+
+
+def record(item: Any) -> Dict[str, Any]:
+    """
+    Returns the attributes of a python-gitlab object or a named tuple
+    """
+    if hasattr(item, "asdict"):
+        return dict(item.asdict())
+
+    return dict(item._asdict())
+
+
+def print_records(records: Iterable[Dict[str, Any]], fields: Sequence[str]) -> None:
+    """
+    Print records in the selected format, each one as soon as it arrives.
+    json and jsonl contain all attributes. csv and tsv contain fields after a header line,
+    where "author.username" selects username of the author attribute.
+    """
+    if _format in ("json", "jsonl"):
+        # json is an array with one record per line, so it can be streamed like jsonl
+        first: bool = True
+        for attributes in records:
+            prefix: str = ""
+            if _format == "json":
+                prefix = "[" if first else ","
+            print(prefix + json.dumps(attributes), flush=True)
+            first = False
+
+        if _format == "json":
+            print("[]" if first else "]")
+        return
+
+    writer = csv.writer(
+        sys.stdout, delimiter="\t" if _format == "tsv" else ",", lineterminator="\n"
+    )
+    writer.writerow(fields)
+    for attributes in records:
+        writer.writerow([_field(attributes, field) for field in fields])
+        sys.stdout.flush()
+
+
+def _field(attributes: Dict[str, Any], field: str) -> str:
+    value: Any = attributes
+    for name in field.split("."):
+        value = value.get(name) if isinstance(value, dict) else None
+
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
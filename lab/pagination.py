@@ -0,0 +1,183 @@
+"""
+Module containing helpers for listing commands, which show long lists page by page
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import argparse
+import itertools
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT: int = 20
+
+# Largest page GitLab returns
+MAX_PER_PAGE: int = 100
+
+# Pages that list_concurrently requests at the same time, below the default pool size
+MAX_CONCURRENT_PAGES: int = 8
+
+
+def positive_int(value: str) -> int:
+    """
+    Converts the argument of --limit, which must be a number above zero
+    """
+    try:
+        number: int = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid limit '{value}', must be at least 1")
+    return number
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add --limit and --all to the parser of a listing command
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--limit",
+        help=f"Show at most this many entries (default {DEFAULT_LIMIT})",
+        metavar="N",
+        type=positive_int,
+        default=DEFAULT_LIMIT,
+    )
+    group.add_argument(
+        "--all",
+        help="Show all entries",
+        dest="limit",
+        action="store_const",
+        const=None,
+    )
+
+
+def per_page(limit: Optional[int]) -> int:
+    """
+    Returns the page size to request, so that a limited list needs a single page if possible
+    """
+    if limit is None:
+        return MAX_PER_PAGE
+
+    return max(1, min(limit, MAX_PER_PAGE))
+
+
+def limited(items: Iterable[T], limit: Optional[int]) -> Iterator[T]:
+    """
+    Returns the first limit items, or all of them if limit is None.
+    Lazy lists of python-gitlab only request the pages that are needed for that.
+    """
+    return itertools.islice(items, limit)
+
+
+def lazy_list(manager: Any, limit: Optional[int], **filters: Any) -> Iterator[Any]:
+    """
+    Returns the first limit objects of a python-gitlab manager, requested page by page.
+    Unlike manager.list(iterator=True), nothing is requested until the iteration starts,
+    so that it can start in another thread.
+    """
+    filters.setdefault("per_page", per_page(limit))
+    yield from limited(manager.list(iterator=True, **filters), limit)
+
+
+def list_concurrently(manager: Any, **filters: Any) -> List[Any]:
+    """
+    Returns all objects of a python-gitlab manager.
+    The first page tells how many pages there are, the others are then requested
+    at the same time. If GitLab doesn't say, they are requested one after another.
+    Pools of threads that list multiple managers use first_page and remaining_pages
+    instead, so that the number of requests at the same time stays bounded by their pool.
+    """
+    objects, total_pages = first_page(manager, **filters)
+    if total_pages < 2:
+        return objects
+
+    workers: int = min(total_pages - 1, MAX_CONCURRENT_PAGES)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for page in remaining_pages(executor, manager, total_pages, **filters):
+            objects += page.result()
+
+    return objects
+
+
+def first_page(manager: Any, **filters: Any) -> Tuple[List[Any], int]:
+    """
+    Returns the objects of the first page of a python-gitlab manager and the number of pages.
+    If GitLab doesn't say how many pages there are, all objects are requested
+    one page after another, as a single page.
+    """
+    first: Any = manager.list(iterator=True, per_page=MAX_PER_PAGE, **filters)
+    if first.total_pages is None:
+        return list(first), 1
+
+    # Only the objects of the first page, taking more would request the second one
+    return list(itertools.islice(first, MAX_PER_PAGE)), first.total_pages
+
+
+def remaining_pages(
+    executor: Executor, manager: Any, total_pages: int, **filters: Any
+) -> List["Future[List[Any]]"]:
+    """
+    Request the pages after the first one of a python-gitlab manager with executor.
+    Must not be called from a thread of executor, which could wait for itself.
+    :return: the objects of each page, in order
+    """
+
+    def page(number: int) -> List[Any]:
+        return list(manager.list(page=number, per_page=MAX_PER_PAGE, get_all=False, **filters))
+
+    return [executor.submit(page, number) for number in range(2, total_pages + 1)]
+
+
+def prefetch(items: Iterable[T], ahead: int) -> Iterator[T]:
+    """
+    Iterates items in a background thread, which stays up to ahead items in front.
+    With ahead being the page size, the next page is requested while the current one
+    is shown. The items are yielded as they arrive, errors are raised from the consumer.
+    """
+    entries: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=max(1, ahead))
+    stopped = threading.Event()
+
+    def put(entry: Tuple[bool, Any]) -> bool:
+        while not stopped.is_set():
+            try:
+                entries.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((True, item)):
+                    return
+        except BaseException as error:  # pylint: disable=broad-except
+            put((False, error))
+            return
+
+        put((False, None))
+
+    # Started right away, so that multiple lists can be requested at the same time
+    threading.Thread(target=produce, daemon=True).start()
+    return _consume(entries, stopped)
+
+
+def _consume(entries: "queue.Queue[Tuple[bool, Any]]", stopped: threading.Event) -> Iterator[Any]:
+    try:
+        while True:
+            more, value = entries.get()
+            if not more:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        # Lets the thread finish if the consumer stopped early
+        stopped.set()
@@ -8,16 +8,47 @@ This module contains code for the pipeline command
 
 import argparse
 import os
+import shutil
 import sys
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from enum import Enum
-from typing import List, Optional, Dict
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
-from gitlab.exceptions import GitlabGetError
-from gitlab.v4.objects import ProjectPipeline
+from requests import Response
+from requests.exceptions import RequestException
+from gitlab.exceptions import GitlabError, GitlabGetError
+from gitlab.v4.objects import ProjectJob, ProjectMergeRequest, ProjectPipeline
 
+from lab import artifacts, output, pagination
+from lab.connection import project_not_found
+from lab.pipelinestatistics import PipelineStatistics, timestamp
 from lab.repositoryconnection import RepositoryConnection
 from lab.table import Table
-from lab.utils import TextFormatting, Utils, LogType
+from lab.utils import TextFormatting, Utils, LogType, removesuffix
+from lab.watch import Backoff, LiveLines
+
+# Columns of --format csv and tsv
+FIELDS = ("id", "iid", "status", "ref", "sha", "source", "created_at", "updated_at", "web_url")
+JOB_FIELDS = ("id", "pipeline.id", "stage", "name", "status", "duration", "runner.description")
+ARTIFACT_FIELDS = ("job.id", "job.name", "filename", "file_size", "date_time")
+BRANCH_FIELDS = (
+    "branch",
+    "merge_request",
+    "sha",
+    "pipeline.id",
+    "pipeline.status",
+    "pipeline.sha",
+    "pipeline.web_url",
+)
+
+# Days of history that --stats covers by default
+STATISTICS_DAYS = 30
+
+# Bytes of a job log that are held in memory while writing it
+LOG_CHUNK_SIZE = 64 * 1024
 
 
 class PipelineStatus(Enum):
@@ -27,7 +58,9 @@ class PipelineStatus(Enum):
     Allowed : https://docs.gitlab.com/ce/api/pipelines.html#list-project-pipelines
     """
 
+    CREATED = "created"
     WAITING = "waiting_for_resource"
+    PREPARING = "preparing"
     PENDING = "pending"
     RUNNING = "running"
     SUCCESS = "success"
@@ -35,15 +68,17 @@ class PipelineStatus(Enum):
     CANCELED = "canceled"
     SKIPPED = "skipped"
     SCHEDULED = "scheduled"
+    MANUAL = "manual"
+    # Any other status, like ones added by newer versions of GitLab (e.g. canceling)
+    UNKNOWN = "unknown"
 
     @classmethod
-    def _missing_(cls, value: object) -> None:
+    def _missing_(cls, value: object) -> "PipelineStatus":
         """
         Called if a given value does not exist.
         Supported in all version of Python since 3.6.
         """
-        Utils.log(LogType.WARNING, f"Invalid status '{str(value)}'")
-        sys.exit(1)
+        return cls.UNKNOWN
 
     @staticmethod
     def format(status: str) -> str:
@@ -58,6 +93,7 @@ class PipelineStatus(Enum):
             "canceled": TextFormatting.PURPLE,
             "pending": TextFormatting.BLUE,
             "waiting_for_resource": TextFormatting.YELLOW,
+            "preparing": TextFormatting.YELLOW,
         }
 
         if status in formatting:
@@ -87,6 +123,13 @@ class PipelineStatus(Enum):
         )
         return self in finished_states
 
+    @property
+    def succeeded(self) -> bool:
+        """
+        Did the pipeline finish without failing, that is succeeded or was skipped.
+        """
+        return self in (PipelineStatus.SUCCESS, PipelineStatus.SKIPPED)
+
     def __str__(self) -> str:
         return str(self.value)
 
@@ -94,6 +137,20 @@ class PipelineStatus(Enum):
         return str(self)
 
 
+def _status_filter(value: str) -> PipelineStatus:
+    """
+    Converts the argument of --status, which must be a known status
+    """
+    status: PipelineStatus = PipelineStatus(value)
+    if status is PipelineStatus.UNKNOWN:
+        raise argparse.ArgumentTypeError(f"invalid status '{value}'")
+    return status
+
+
+# Statuses that --status accepts
+STATUS_FILTERS = [status for status in PipelineStatus if status is not PipelineStatus.UNKNOWN]
+
+
 def parser(
     subparsers: argparse._SubParsersAction,  # pylint: disable=protected-access
 ) -> argparse.ArgumentParser:
@@ -109,11 +166,11 @@ def parser(
     # Optionally filter by status. This is None by default.
     pipeline_parser.add_argument(
         "--status",
-        help=f"Filter pipelines by status, one of: [{', '.join(str(s) for s in PipelineStatus)}]",
+        help=f"Filter pipelines by status, one of: [{', '.join(str(s) for s in STATUS_FILTERS)}]",
         metavar="",
-        type=PipelineStatus,
+        type=_status_filter,
         default=None,
-        choices=list(PipelineStatus),
+        choices=STATUS_FILTERS,
     )
 
     pipeline_parser.add_argument(
@@ -132,6 +189,78 @@ def parser(
         nargs="?",
     )
 
+    pipeline_parser.add_argument(
+        "--jobs",
+        help="Show the jobs of the pipeline and its downstream pipelines, grouped by stage",
+        action="store_true",
+    )
+
+    pipeline_parser.add_argument(
+        "--watch",
+        help="Keep showing the pipeline or the list as it changes. "
+        + "With a pipeline_id, exit once it finished, with status 0 if it succeeded",
+        action="store_true",
+    )
+
+    pipeline_parser.add_argument(
+        "--artifacts",
+        help="Download the artifacts of the job of the pipeline with this name or ID, "
+        + "or of all its jobs",
+        metavar="job",
+        nargs="?",
+        const="",
+    )
+
+    artifacts_group = pipeline_parser.add_mutually_exclusive_group()
+    artifacts_group.add_argument(
+        "--extract",
+        help="Extract these paths, or everything, from the downloaded artifacts",
+        metavar="path",
+        nargs="*",
+    )
+    artifacts_group.add_argument(
+        "--list",
+        help="List the files in the artifacts without downloading them",
+        action="store_true",
+    )
+    artifacts_group.add_argument(
+        "--cat",
+        help="Write a file of the artifacts to stdout without downloading the others",
+        metavar="path",
+    )
+
+    pipeline_parser.add_argument(
+        "--log",
+        help="Follow the log of a job until it finished, "
+        + "then exit with status 0 if it succeeded",
+        metavar="job_id",
+        type=int,
+    )
+
+    pipeline_parser.add_argument(
+        "--stats",
+        help="Show the durations and success rates of pipelines by ref and day, "
+        + "and the slowest jobs",
+        action="store_true",
+    )
+
+    pipeline_parser.add_argument(
+        "--since",
+        help="Show statistics of pipelines updated since this date, "
+        + f"like 2026-01-31 (default {STATISTICS_DAYS} days ago)",
+        metavar="date",
+        type=date.fromisoformat,
+    )
+
+    pipeline_parser.add_argument(
+        "--branches",
+        help="Show the latest pipeline of each local branch, or of each open merge request",
+        choices=("local", "mrs"),
+        nargs="?",
+        const="local",
+    )
+
+    pagination.add_arguments(pipeline_parser)
     return pipeline_parser
 
 
@@ -139,13 +268,100 @@ def run(args: argparse.Namespace) -> None:
     """
     :param args: parsed arguments
     """
+    error: Optional[str] = _invalid_arguments(args)
+    if error is not None:
+        Utils.log(LogType.ERROR, error)
+        sys.exit(1)
+
+    if args.log is not None:
+        sys.exit(JobLog(args.log).follow())
+
     if args.pipeline_id is not None:
         pipeline: PipelineShow = PipelineShow(args.pipeline_id)
-        print(pipeline)
+        if args.artifacts is not None:
+            _run_artifacts(pipeline, args)
+        elif args.watch:
+            sys.exit(pipeline.watch())
+        elif args.jobs:
+            pipeline.print_jobs()
+        else:
+            print(pipeline)
 
     else:
-        lister: PipelineList = PipelineList(args.status, ref=args.ref)
-        lister.print_formatted_list()
+        lister: PipelineList = PipelineList(args.status, ref=args.ref, limit=args.limit)
+        if args.branches is not None:
+            lister.print_branches(args.branches == "mrs")
+        elif args.stats:
+            lister.print_statistics(args.since or date.today() - timedelta(days=STATISTICS_DAYS))
+        elif args.watch:
+            lister.watch()
+        else:
+            lister.print_formatted_list()
+
+
+def _run_artifacts(pipeline: "PipelineShow", args: argparse.Namespace) -> None:
+    try:
+        if args.list:
+            pipeline.list_artifacts(args.artifacts)
+        elif args.cat is not None:
+            pipeline.print_artifact(args.artifacts, args.cat)
+        else:
+            pipeline.download_artifacts(args.artifacts, args.extract)
+    except (
+        GitlabError,
+        RequestException,
+        OSError,
+        zipfile.BadZipFile,
+        artifacts.RangeError,
+    ) as error:
+        Utils.log(LogType.ERROR, "Could not get the artifacts:", str(error))
+        sys.exit(1)
+
+
+def _invalid_arguments(args: argparse.Namespace) -> Optional[str]:
+    """
+    Returns why the combination of arguments is not supported, or None if it is
+    """
+    problems: Tuple[Tuple[bool, str], ...] = (
+        (
+            (args.watch or args.stats) and not output.is_table(),
+            "--watch and --stats can only show a table",
+        ),
+        (
+            args.jobs and (args.pipeline_id is None or args.watch),
+            "--jobs needs a pipeline_id and can't be watched",
+        ),
+        (
+            args.log is not None and (args.pipeline_id is not None or args.jobs or args.watch),
+            "--log can't be combined with a pipeline_id, --jobs or --watch",
+        ),
+        (
+            args.artifacts is None
+            and (args.extract is not None or args.list or args.cat is not None),
+            "--extract, --list and --cat need --artifacts",
+        ),
+        (
+            args.artifacts is not None and (args.pipeline_id is None or args.jobs or args.watch),
+            "--artifacts needs a pipeline_id and can't be combined with --jobs or --watch",
+        ),
+        (
+            args.stats and (args.pipeline_id is not None or args.watch or args.log is not None),
+            "--stats can't be combined with a pipeline_id, --watch or --log",
+        ),
+        (args.since is not None and not args.stats, "--since needs --stats"),
+        (
+            args.branches is not None
+            and (
+                args.pipeline_id is not None
+                or args.ref
+                or args.status is not None
+                or args.watch
+                or args.stats
+            ),
+            "--branches can't be combined with a pipeline_id, --ref, --status, --watch or --stats",
+        ),
+    )
+    return next((message for invalid, message in problems if invalid), None)
 
 
 class PipelineShow(RepositoryConnection):
@@ -159,7 +375,9 @@ class PipelineShow(RepositoryConnection):
             self.pipeline: ProjectPipeline = self._remote_project.pipelines.get(
                 pipeline_id, lazy=False
             )
-        except GitlabGetError:
+        except GitlabGetError as error:
+            if project_not_found(error):
+                raise
             Utils.log(LogType.WARNING, f"No pipeline with ID {pipeline_id}")
             sys.exit(1)
 
@@ -186,22 +404,352 @@ class PipelineShow(RepositoryConnection):
                 + f"with status: {status.formatted}"
             )
         else:
-            text_buffer += f"is currently {status.formatted}"
+            text_buffer += f"is currently {PipelineStatus.format(self.pipeline.status)}"
 
         text_buffer += os.linesep
         return text_buffer
 
+    def print_jobs(self) -> None:
+        """
+        Print the jobs of the pipeline and of its downstream pipelines, grouped by stage,
+        or as records in the format selected by --format
+        """
+        sections: List[Tuple[str, List[Any]]] = self.__job_sections()
+        if not output.is_table():
+            output.print_records(
+                (output.record(job) for _, jobs in sections for job in jobs), JOB_FIELDS
+            )
+            return
+
+        print(self)
+        for title, jobs in sections:
+            if title:
+                print()
+                print(title)
+            table = Table()
+            for row in self.__job_rows(jobs):
+                table.add_row(row)
+            table.print()
+
+    def __job_sections(self) -> List[Tuple[str, List[Any]]]:
+        """
+        Returns a title and the jobs and bridges of the pipeline and each downstream pipeline.
+        The pages of jobs and bridges of all pipelines of one level of the tree of downstream
+        pipelines are requested at the same time, by a single pool of threads.
+        """
+        sections: List[Tuple[str, List[Any]]] = []
+        level: List[Tuple[str, ProjectPipeline]] = [("", self.pipeline)]
+        with ThreadPoolExecutor(max_workers=pagination.MAX_CONCURRENT_PAGES) as executor:
+            while level:
+                first_pages: List[Tuple[str, List[Tuple[Any, "Future[Tuple[List[Any], int]]"]]]] = [
+                    (
+                        title,
+                        [
+                            (manager, executor.submit(pagination.first_page, manager))
+                            for manager in (pipeline.jobs, pipeline.bridges)
+                        ],
+                    )
+                    for title, pipeline in level
+                ]
+                # All remaining pages are queued before waiting for any of them
+                pages: List[Tuple[str, List[Tuple[List[Any], List["Future[List[Any]]"]]]]] = [
+                    (
+                        title,
+                        [
+                            (
+                                first.result()[0],
+                                pagination.remaining_pages(executor, manager, first.result()[1]),
+                            )
+                            for manager, first in lists
+                        ],
+                    )
+                    for title, lists in first_pages
+                ]
+
+                level = []
+                for title, lists in pages:
+                    jobs, bridges = [
+                        objects + [entry for page in rest for entry in page.result()]
+                        for objects, rest in lists
+                    ]
+                    sections.append((title, jobs + bridges))
+                    for bridge in bridges:
+                        downstream: Optional[Dict[str, Any]] = bridge.attributes.get(
+                            "downstream_pipeline"
+                        )
+                        if downstream:
+                            level.append(
+                                (
+                                    f"Downstream pipeline #{downstream['id']} of {bridge.name}",
+                                    self._connection.projects.get(
+                                        downstream["project_id"], lazy=True
+                                    ).pipelines.get(downstream["id"], lazy=True),
+                                )
+                            )
+
+        return sections
+
+    @staticmethod
+    def __job_rows(jobs: List[Any]) -> Iterator[List[str]]:
+        # Stages in the order they were created in, which is the order of their first job
+        stages: Dict[str, List[Any]] = {}
+        for job in sorted(jobs, key=lambda job: int(job.id)):
+            stages.setdefault(job.stage, []).append(job)
+
+        for stage, stage_jobs in stages.items():
+            for index, job in enumerate(sorted(stage_jobs, key=lambda job: str(job.name))):
+                duration: Optional[float] = job.attributes.get("duration")
+                runner: Optional[Dict[str, Any]] = job.attributes.get("runner")
+                downstream: Optional[Dict[str, Any]] = job.attributes.get("downstream_pipeline")
+
+                where: str = ""
+                if runner:
+                    where = runner.get("description") or ""
+                elif downstream:
+                    where = f"pipeline #{downstream['id']}"
+
+                yield [
+                    TextFormatting.BOLD + stage + TextFormatting.END if index == 0 else "",
+                    job.name,
+                    PipelineStatus.format(job.status),
+                    Utils.pretty_time_delta(int(duration)) if duration is not None else "",
+                    where,
+                ]
+
+    def download_artifacts(self, job: str, paths: Optional[List[str]]) -> None:
+        """
+        Download the artifacts archives of the jobs of the pipeline into the current directory,
+        and extract paths from them if not None
+        :param job: name or ID of the job, or empty for all jobs with artifacts
+        """
+        for pipeline_job in self.__artifact_jobs(job):
+            archive: Dict[str, Any] = pipeline_job.artifacts_file
+            destination: str = f"{pipeline_job.id}-{archive['filename']}"
+            if not (
+                os.path.exists(destination) and os.path.getsize(destination) == archive.get("size")
+            ):
+                artifacts.download(
+                    self._connection,
+                    self.__artifacts_path(pipeline_job),
+                    destination,
+                    archive.get("size"),
+                )
+            print(destination)
+
+            if paths is not None:
+                directory: str = removesuffix(destination, ".zip")
+                names: List[str] = artifacts.extract(destination, paths, directory)
+                if not names:
+                    Utils.log(LogType.WARNING, f"Nothing to extract in {destination}")
+                for name in names:
+                    print(os.path.join(directory, name))
+
+    def list_artifacts(self, job: str) -> None:
+        """
+        Print the files in the artifacts archives of the jobs of the pipeline.
+        Only the directory at the end of each archive is requested.
+        :param job: name or ID of the job, or empty for all jobs with artifacts
+        """
+        jobs: List[Any] = self.__artifact_jobs(job)
+        if not output.is_table():
+            output.print_records(
+                (
+                    {
+                        "job": {"id": pipeline_job.id, "name": pipeline_job.name},
+                        "filename": info.filename,
+                        "file_size": info.file_size,
+                        "date_time": datetime(*info.date_time).isoformat(),
+                    }
+                    for pipeline_job in jobs
+                    for info in self.__artifact_files(pipeline_job)
+                ),
+                ARTIFACT_FIELDS,
+            )
+            return
+
+        for index, pipeline_job in enumerate(jobs):
+            if len(jobs) > 1:
+                if index > 0:
+                    print()
+                print(f"{TextFormatting.BOLD}{pipeline_job.name}{TextFormatting.END}")
+            table = Table()
+            for info in self.__artifact_files(pipeline_job):
+                table.add_row(
+                    [
+                        info.filename,
+                        str(info.file_size),
+                        datetime(*info.date_time).strftime("%Y-%m-%d %H:%M"),
+                    ]
+                )
+            table.print()
+
+    def print_artifact(self, job: str, path: str, stream: Optional[BinaryIO] = None) -> None:
+        """
+        Write a file in the artifacts archive of a job to stream, stdout by default.
+        Only the directory at the end of the archive and the file are requested.
+        :param job: name or ID of the job, or empty if only one job has artifacts
+        """
+        jobs: List[Any] = self.__artifact_jobs(job)
+        if len(jobs) > 1:
+            Utils.log(
+                LogType.ERROR,
+                "Multiple jobs have artifacts, choose one of:",
+                ", ".join(pipeline_job.name for pipeline_job in jobs),
+            )
+            sys.exit(1)
+
+        out: BinaryIO = stream or sys.stdout.buffer
+        try:
+            with self.__remote_archive(jobs[0]) as archive:
+                with archive.open(path.strip("/")) as member:
+                    shutil.copyfileobj(member, out, artifacts.CHUNK_SIZE)
+        except KeyError:
+            Utils.log(LogType.ERROR, f"No {path} in the artifacts of {jobs[0].name}")
+            sys.exit(1)
+        out.flush()
+
+    def __artifact_jobs(self, job: str) -> List[Any]:
+        """
+        Returns the jobs of the pipeline with artifacts and the name or ID job, if it isn't empty
+        """
+        jobs: List[Any] = [
+            pipeline_job
+            for pipeline_job in pagination.list_concurrently(self.pipeline.jobs)
+            if pipeline_job.attributes.get("artifacts_file")
+            and job in ("", pipeline_job.name, str(pipeline_job.id))
+        ]
+        if not jobs:
+            Utils.log(LogType.WARNING, "No artifacts found")
+            sys.exit(1)
+
+        return jobs
+
+    def __artifacts_path(self, pipeline_job: Any) -> str:
+        return f"{self._remote_project.jobs.path}/{pipeline_job.id}/artifacts"
+
+    def __artifact_files(self, pipeline_job: Any) -> List[zipfile.ZipInfo]:
+        with self.__remote_archive(pipeline_job) as archive:
+            return archive.infolist()
+
+    def __remote_archive(self, pipeline_job: Any) -> zipfile.ZipFile:
+        """
+        Returns the artifacts archive of a job, whose parts are requested as they are read
+        """
+        return zipfile.ZipFile(
+            artifacts.RemoteFile(
+                self._connection,
+                self.__artifacts_path(pipeline_job),
+                pipeline_job.artifacts_file["size"],
+            )
+        )
+
+    def watch(self) -> int:
+        """
+        Show the pipeline until it finished, updating the output whenever it changed.
+        It is requested less often while nothing changes.
+        :return: exit status, 0 if the pipeline succeeded or was skipped
+        """
+        display = LiveLines()
+        backoff = Backoff()
+        while True:
+            display.update(str(self).splitlines())
+            status: PipelineStatus = PipelineStatus(self.pipeline.status)
+            if status.finished:
+                return 0 if status.succeeded else 1
+
+            time.sleep(backoff.next(self.__refresh()))
+
+    def __refresh(self) -> bool:
+        """
+        Request the pipeline again and return whether it changed.
+        The response cache revalidates it with If-None-Match,
+        so an unchanged pipeline is not transferred again.
+        """
+        before: Dict[str, object] = self.pipeline.asdict()
+        self.pipeline.refresh()
+        return bool(self.pipeline.asdict() != before)
+
+
+class JobLog(RepositoryConnection):
+    """
+    Follow the log of a job
+    """
+
+    def __init__(self, job_id: int) -> None:
+        RepositoryConnection.__init__(self)
+        try:
+            self.job: ProjectJob = self._remote_project.jobs.get(job_id, lazy=False)
+        except GitlabGetError as error:
+            if project_not_found(error):
+                raise
+            Utils.log(LogType.WARNING, f"No job with ID {job_id}")
+            sys.exit(1)
+
+    def follow(self, stream: Optional[BinaryIO] = None) -> int:
+        """
+        Write the log of the job to stream, stdout by default, as it grows until the job finished.
+        Each poll only requests the part of the log after what was already written,
+        and the log is written chunk by chunk as it arrives.
+        :return: exit status, 0 if the job succeeded or was skipped
+        """
+        out: BinaryIO = stream or sys.stdout.buffer
+        backoff = Backoff()
+        offset: int = 0
+        while True:
+            # The status is read before the log, so that the log of a finished job is complete
+            status: PipelineStatus = PipelineStatus(self.job.status)
+            written: int = self.__write_log(offset, out)
+            offset += written
+            if status.finished:
+                return 0 if status.succeeded else 1
+
+            time.sleep(backoff.next(written > 0))
+            self.job.refresh()
+
+    def __write_log(self, offset: int, out: BinaryIO) -> int:
+        """
+        Write the log after its first offset bytes
+        :return: number of bytes written
+        """
+        response: Optional[Response] = artifacts.request_range(
+            self._connection, f"{self.job.manager.path}/{self.job.encoded_id}/trace", offset
+        )
+        if response is None:
+            # The log didn't grow
+            return 0
+
+        # A server that ignores Range sends the whole log, skip what was already written
+        skip: int = offset if response.status_code != 206 else 0
+        written: int = 0
+        for chunk in response.iter_content(chunk_size=LOG_CHUNK_SIZE):
+            if skip:
+                skipped: int = min(skip, len(chunk))
+                chunk = chunk[skipped:]
+                skip -= skipped
+            if chunk:
+                out.write(chunk)
+                written += len(chunk)
+
+        out.flush()
+        return written
+
 
 class PipelineList(RepositoryConnection):
     """
     Search class
     """
 
-    def __init__(self, status: Optional[PipelineStatus] = None, ref: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        status: Optional[PipelineStatus] = None,
+        ref: Optional[str] = None,
+        limit: Optional[int] = pagination.DEFAULT_LIMIT,
+    ) -> None:
         RepositoryConnection.__init__(self)
 
         self.status: Optional[PipelineStatus] = status
         self.ref: Optional[str] = ref
+        self.limit: Optional[int] = limit
 
         if ref is not None and ref not in self._local_repo.refs:
             # Print a warning, if the ref is not found LOCALLY
@@ -209,14 +757,9 @@ class PipelineList(RepositoryConnection):
             # therefore only a warning is printed.
             Utils.log(LogType.WARNING, f"Ref '{ref}' is not found locally.")
 
-    def print_formatted_list(self) -> None:
-        """
-        Print the list of pipelines to terminal formatted as a table
-        """
-        table = Table()
-
+    def __fetch(self, limit: Optional[int], **filters: str) -> Iterator[ProjectPipeline]:
         # Compute args that are sent to GitLab
-        args: Dict[str, str] = {}
+        args: Dict[str, str] = dict(filters)
         if self.status is not None:
             # Only yield pipelines that have the specific status
             # If empty all pipelines will be returned by GitLab
@@ -226,15 +769,207 @@ class PipelineList(RepositoryConnection):
             # Only yield pipeline that match a given reference
             args["ref"] = self.ref
 
-        # Build the printable table
-        pipelines: List[ProjectPipeline] = self._remote_project.pipelines.list(**args)
-        for pipeline in pipelines:
-            row: List[str] = [
-                TextFormatting.BOLD + "#" + str(pipeline.id) + TextFormatting.END,
-                pipeline.ref,
-                Utils.pretty_date(pipeline.created_at),
-                PipelineStatus.format(pipeline.status),
+        return pagination.prefetch(
+            pagination.lazy_list(self._remote_project.pipelines, limit, **args),
+            pagination.per_page(limit),
+        )
+
+    @staticmethod
+    def __row(pipeline: ProjectPipeline) -> List[str]:
+        return [
+            TextFormatting.BOLD + "#" + str(pipeline.id) + TextFormatting.END,
+            pipeline.ref,
+            Utils.pretty_date(pipeline.created_at),
+            PipelineStatus.format(pipeline.status),
+        ]
+
+    def print_formatted_list(self) -> None:
+        """
+        Print the list of pipelines to terminal formatted as a table,
+        or as records in the format selected by --format
+        """
+        pipelines: Iterator[ProjectPipeline] = self.__fetch(self.limit)
+        if not output.is_table():
+            output.print_records((output.record(pipeline) for pipeline in pipelines), FIELDS)
+            return
+
+        table = Table()
+        table.print_stream(
+            (self.__row(pipeline) for pipeline in pipelines), pagination.per_page(self.limit)
+        )
+
+    def watch(self) -> None:
+        """
+        Keep showing the list of pipelines, updating the lines that changed.
+        It is requested less often while nothing changes.
+        """
+        display = LiveLines()
+        backoff = Backoff()
+        previous: Optional[List[Tuple[int, str, str]]] = None
+        while True:
+            pipelines: List[ProjectPipeline] = list(self.__fetch(self.limit))
+            table = Table()
+            for pipeline in pipelines:
+                table.add_row(self.__row(pipeline))
+            display.update(list(table.lines()))
+
+            current: List[Tuple[int, str, str]] = [
+                (pipeline.id, pipeline.status, pipeline.updated_at) for pipeline in pipelines
             ]
-            table.add_row(row)
+            time.sleep(backoff.next(current != previous))
+            previous = current
 
+    def print_statistics(self, since: date) -> None:
+        """
+        Print percentiles of the durations of pipelines, their success rates by ref and by day,
+        and the slowest jobs, from the history since a date.
+        Pipelines and jobs are requested at the same time, page by page,
+        and only their durations and outcomes are kept.
+        """
+        start: datetime = datetime(since.year, since.month, since.day, tzinfo=timezone.utc)
+        statistics = PipelineStatistics()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pipelines: "Future[None]" = executor.submit(self.__add_pipelines, statistics, start)
+            jobs: "Future[None]" = executor.submit(self.__add_jobs, statistics, start)
+            pipelines.result()
+            jobs.result()
+
+        statistics.print(since)
+
+    def __add_pipelines(self, statistics: PipelineStatistics, start: datetime) -> None:
+        for pipeline in self.__fetch(None, updated_after=start.isoformat()):
+            if PipelineStatus(pipeline.status).finished:
+                statistics.add_pipeline(
+                    pipeline.id, pipeline.ref, pipeline.status, pipeline.created_at
+                )
+
+    def __add_jobs(self, statistics: PipelineStatistics, start: datetime) -> None:
+        # Jobs can't be filtered by date, they are listed from the newest one on
+        jobs: Iterator[Any] = pagination.prefetch(
+            pagination.lazy_list(self._remote_project.jobs, None, scope=["success", "failed"]),
+            pagination.MAX_PER_PAGE,
+        )
+        for job in jobs:
+            if timestamp(job.created_at) < start.timestamp():
+                break
+            if job.duration is not None and self.ref in (None, job.ref):
+                statistics.add_job(
+                    job.name, job.duration, job.pipeline["id"], job.started_at, job.finished_at
+                )
+
+    def print_branches(self, merge_requests: bool) -> None:
+        """
+        Print the latest pipeline of each of the limit most recently changed local branches,
+        or open merge requests, as a table or as records in the format selected by --format.
+        """
+        rows: List[Tuple[Optional[int], str, str, Any]] = (
+            self.__merge_request_rows() if merge_requests else self.__branch_rows()
+        )
+
+        if not output.is_table():
+            output.print_records(
+                (
+                    {
+                        "branch": branch,
+                        "merge_request": iid,
+                        "sha": sha,
+                        "pipeline": pipeline.asdict() if pipeline is not None else None,
+                    }
+                    for iid, branch, sha, pipeline in rows
+                ),
+                BRANCH_FIELDS,
+            )
+            return
+
+        table = Table()
+        for iid, branch, sha, pipeline in rows:
+            name: str = branch if iid is None else f"!{iid} {branch}"
+            if pipeline is None:
+                table.add_row([name, "", "no pipeline"])
+                continue
+
+            table.add_row(
+                [
+                    name,
+                    TextFormatting.BOLD + "#" + str(pipeline.id) + TextFormatting.END,
+                    PipelineStatus.format(pipeline.status),
+                    Utils.pretty_date(pipeline.created_at),
+                    "" if pipeline.sha == sha else "for an older commit",
+                ]
+            )
         table.print()
+
+    def __branch_rows(self) -> List[Tuple[Optional[int], str, str, Any]]:
+        """
+        Returns the name, commit and latest pipeline of the local branches,
+        recently changed ones first.
+        The most recent pipelines of the project are requested at once, only the pipelines
+        of branches that aren't among them are requested for each branch.
+        """
+        refs: str = self._local_repo.git.for_each_ref(
+            "--sort=-committerdate", "--format=%(refname:lstrip=2) %(objectname)", "refs/heads"
+        )
+        branches: List[Tuple[str, str]] = [
+            (branch, sha) for branch, _, sha in (line.rpartition(" ") for line in refs.splitlines())
+        ][: self.limit]
+        latest: Dict[str, ProjectPipeline] = self.__latest_pipelines(
+            [branch for branch, _ in branches]
+        )
+        return [(None, branch, sha, latest.get(branch)) for branch, sha in branches]
+
+    def __merge_request_rows(self) -> List[Tuple[Optional[int], str, str, Any]]:
+        """
+        Returns the iid, source branch, commit and latest pipeline of the open merge requests,
+        recently updated first.
+        The pipelines of a merge request can run in the fork it comes from, so they are
+        requested from the merge request rather than by the name of its source branch.
+        """
+        merge_requests: List[ProjectMergeRequest] = list(
+            pagination.lazy_list(
+                self._remote_project.mergerequests,
+                self.limit,
+                state="opened",
+                order_by="updated_at",
+            )
+        )
+        with ThreadPoolExecutor(max_workers=pagination.MAX_CONCURRENT_PAGES) as executor:
+            pipelines: List[List[Any]] = list(
+                executor.map(
+                    lambda merge_request: merge_request.pipelines.list(per_page=1, get_all=False),
+                    merge_requests,
+                )
+            )
+
+        return [
+            (
+                merge_request.iid,
+                merge_request.source_branch,
+                merge_request.sha,
+                latest[0] if latest else None,
+            )
+            for merge_request, latest in zip(merge_requests, pipelines)
+        ]
+
+    def __latest_pipelines(self, branches: List[str]) -> Dict[str, ProjectPipeline]:
+        latest: Dict[str, ProjectPipeline] = {}
+        for pipeline in self._remote_project.pipelines.list(
+            per_page=pagination.MAX_PER_PAGE, get_all=False, order_by="id", sort="desc"
+        ):
+            latest.setdefault(pipeline.ref, pipeline)
+
+        # Branches without a pipeline among the most recent ones
+        missing: List[str] = [branch for branch in branches if branch not in latest]
+        with ThreadPoolExecutor(max_workers=pagination.MAX_CONCURRENT_PAGES) as executor:
+            for branch, pipelines in zip(
+                missing,
+                executor.map(
+                    lambda branch: self._remote_project.pipelines.list(
+                        ref=branch, per_page=1, get_all=False
+                    ),
+                    missing,
+                ),
+            ):
+                if pipelines:
+                    latest[branch] = pipelines[0]
+
+        return latest
@@ -0,0 +1,184 @@
+"""
+Module containing statistics about the durations and outcomes of pipelines and jobs
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import math
+from array import array
+from datetime import date, datetime
+from typing import Counter, Dict, List, Optional, Sequence, Set, Tuple
+
+from lab.table import Table
+from lab.utils import TextFormatting, Utils
+
+# Percentiles of durations that are shown
+PERCENTILES = (50, 90, 99)
+
+# Jobs that are shown as the slowest ones
+SLOWEST_JOBS = 10
+
+
+def timestamp(date_string: str) -> float:
+    """
+    Returns the seconds since the epoch of an ISO 8601 date from GitLab
+    """
+    return datetime.fromisoformat(date_string.replace("Z", "+00:00")).timestamp()
+
+
+def percentiles(values: Sequence[float], percents: Sequence[int] = PERCENTILES) -> List[float]:
+    """
+    Returns the nearest-rank percentiles of values, or zeros if there are none
+    """
+    ordered: List[float] = sorted(values)
+    if not ordered:
+        return [0.0 for _ in percents]
+
+    return [ordered[max(0, math.ceil(percent * len(ordered) / 100) - 1)] for percent in percents]
+
+
+class PipelineStatistics:
+    """
+    Durations and outcomes of finished pipelines and jobs, by ref and by day.
+    Durations are kept in arrays of floats instead of the objects they were taken from,
+    so that the history of tens of thousands of pipelines fits into little memory.
+    """
+
+    refs: Dict[str, Counter[str]]
+    days: Dict[str, Counter[str]]
+    jobs: Dict[str, "array[float]"]
+
+    # private
+    __pipelines: Set[int]  # ids of the finished pipelines
+    __runs: Dict[int, Tuple[float, float]]  # first start and last finish of jobs, by pipeline
+
+    def __init__(self) -> None:
+        self.refs = {}
+        self.days = {}
+        self.jobs = {}
+        self.__pipelines = set()
+        self.__runs = {}
+
+    def __len__(self) -> int:
+        return len(self.__pipelines)
+
+    def add_pipeline(self, pipeline_id: int, ref: str, status: str, created_at: str) -> None:
+        """
+        Count a finished pipeline
+        """
+        self.__pipelines.add(pipeline_id)
+        self.refs.setdefault(ref, Counter())[status] += 1
+        # Days in UTC
+        self.days.setdefault(created_at[:10], Counter())[status] += 1
+
+    def add_job(
+        self,
+        name: str,
+        duration: float,
+        pipeline_id: int,
+        started_at: Optional[str],
+        finished_at: Optional[str],
+    ) -> None:
+        """
+        Count a finished job of a pipeline
+        """
+        self.jobs.setdefault(name, array("d")).append(duration)
+        if started_at is None or finished_at is None:
+            return
+
+        start: float = timestamp(started_at)
+        finish: float = timestamp(finished_at)
+        first, last = self.__runs.get(pipeline_id, (start, finish))
+        self.__runs[pipeline_id] = (min(first, start), max(last, finish))
+
+    @property
+    def durations(self) -> "array[float]":
+        """
+        Durations of the finished pipelines, from the start of their first job
+        until the end of their last one. Lists of pipelines only tell when they were updated
+        the last time, which can be long after they finished, e.g. if a job was retried.
+        """
+        return array(
+            "d",
+            (
+                self.__runs[pipeline_id][1] - self.__runs[pipeline_id][0]
+                for pipeline_id in self.__pipelines
+                if pipeline_id in self.__runs
+            ),
+        )
+
+    def slowest_jobs(self, count: int) -> List[Tuple[str, int, List[float]]]:
+        """
+        Returns the name, number of runs and percentiles of the count jobs
+        that take longest in the highest percentile
+        """
+        jobs: List[Tuple[str, int, List[float]]] = [
+            (name, len(durations), percentiles(durations)) for name, durations in self.jobs.items()
+        ]
+        jobs.sort(key=lambda job: job[2][::-1], reverse=True)
+        return jobs[:count]
+
+    @staticmethod
+    def rates(statuses: Counter[str]) -> Tuple[int, float, float]:
+        """
+        Returns the number of pipelines and the shares of them that succeeded and that failed
+        """
+        total: int = sum(statuses.values())
+        if not total:
+            return 0, 0.0, 0.0
+
+        return total, statuses["success"] / total, statuses["failed"] / total
+
+    def print(self, since: date) -> None:
+        """
+        Print percentiles of the durations of the pipelines, their success rates by ref
+        and by day, and the slowest jobs
+        """
+        print(
+            f"{TextFormatting.BOLD}{len(self)} pipelines{TextFormatting.END} "
+            + f"finished since {since.isoformat()}"
+        )
+        table = Table()
+        table.add_row(
+            ["Duration"]
+            + [
+                f"p{percent} {Utils.pretty_time_delta(int(duration))}"
+                for percent, duration in zip(PERCENTILES, percentiles(self.durations))
+            ]
+        )
+        table.print()
+
+        self.__print_rates("Ref", sorted(self.refs.items(), key=lambda ref: -sum(ref[1].values())))
+        self.__print_rates("Day", sorted(self.days.items()))
+
+        print()
+        table = Table()
+        table.add_row(
+            [
+                TextFormatting.BOLD + heading + TextFormatting.END
+                for heading in ["Slowest jobs", "Runs"] + [f"p{percent}" for percent in PERCENTILES]
+            ]
+        )
+        for name, runs, durations in self.slowest_jobs(SLOWEST_JOBS):
+            table.add_row(
+                [name, str(runs)]
+                + [Utils.pretty_time_delta(int(duration)) for duration in durations]
+            )
+        table.print()
+
+    @staticmethod
+    def __print_rates(heading: str, rows: List[Tuple[str, Counter[str]]]) -> None:
+        print()
+        table = Table()
+        table.add_row(
+            [
+                TextFormatting.BOLD + column + TextFormatting.END
+                for column in (heading, "Pipelines", "Succeeded", "Failed")
+            ]
+        )
+        for name, statuses in rows:
+            total, succeeded, failed = PipelineStatistics.rates(statuses)
+            table.add_row([name, str(total), f"{succeeded:.0%}", f"{failed:.0%}"])
+        table.print()
@@ -0,0 +1,171 @@
+"""
+Module containing the on-disk catalog of the projects of a GitLab instance
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Seconds after which the catalog is updated before searching it
+MAX_AGE: int = 3600
+
+
+class CatalogEntry(NamedTuple):
+    """
+    Project as shown by git lab search
+    """
+
+    path_with_namespace: str
+    description: Optional[str]
+    ssh_url_to_repo: str
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Returns the three character substrings of text, ignoring case
+    """
+    text = text.lower()
+    return {"".join(characters) for characters in zip(text, text[1:], text[2:])}
+
+
+class ProjectCatalog:
+    """
+    Path, description and ssh url of every project of an instance that a token can see.
+
+    It is updated with the projects whose last activity is newer than the newest one
+    in the catalog, and searched with a trigram index built in memory, which finds
+    projects even if the query is misspelled.
+    """
+
+    path: str
+    synced_at: float  # seconds since the epoch, 0 if never synced
+    last_activity_at: Optional[str]  # newest last activity of a project in the catalog
+
+    # private
+    __projects: Dict[str, CatalogEntry]  # by id, as a string like the json keys
+    __index: Optional[Dict[str, Set[str]]] = None  # ids by trigram of their path
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.synced_at = 0
+        self.last_activity_at = None
+        self.__projects = {}
+
+        try:
+            with open(path, encoding="utf-8") as file:
+                data: Dict[str, Any] = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not data.get("complete", True):
+            # Left empty by earlier versions for instances with many projects, fill it now
+            return
+
+        self.synced_at = data["synced_at"]
+        self.last_activity_at = data["last_activity_at"]
+        self.__projects = {
+            project_id: CatalogEntry(*entry) for project_id, entry in data["projects"].items()
+        }
+
+    @staticmethod
+    def path_for(url: str, token: str, directory: Optional[str] = None) -> str:
+        """
+        Returns where the catalog of an instance is stored.
+        Different tokens can see different projects, so they don't share catalogs.
+        """
+        if directory is None:
+            # appdirs is only needed once a command makes requests
+            from appdirs import user_cache_dir  # pylint: disable=import-outside-toplevel
+
+            directory = os.path.join(user_cache_dir("git-lab"), "projects")
+
+        return os.path.join(directory, hashlib.sha256(f"{token}\n{url}".encode()).hexdigest())
+
+    def is_stale(self) -> bool:
+        """
+        Whether the catalog should be updated before searching it
+        """
+        return time.time() - self.synced_at > MAX_AGE
+
+    def __len__(self) -> int:
+        return len(self.__projects)
+
+    def update(self, projects: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or replace projects, as returned by the API with simple=true, and save the catalog
+        :return: number of added or replaced projects
+        """
+        count: int = 0
+        for project in projects:
+            self.__projects[str(project["id"])] = CatalogEntry(
+                project["path_with_namespace"],
+                project.get("description"),
+                project["ssh_url_to_repo"],
+            )
+            if self.last_activity_at is None or project["last_activity_at"] > self.last_activity_at:
+                self.last_activity_at = project["last_activity_at"]
+            count += 1
+
+        self.synced_at = time.time()
+        self.__index = None
+        self.save()
+        return count
+
+    def save(self) -> None:
+        """
+        Write the catalog to disk, replacing the previous one at once
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(self.path))
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "synced_at": self.synced_at,
+                    "last_activity_at": self.last_activity_at,
+                    "projects": self.__projects,
+                },
+                file,
+            )
+        os.replace(temporary, self.path)
+
+    def search(self, query: str, limit: Optional[int]) -> List[CatalogEntry]:
+        """
+        Returns the projects whose path best matches query.
+        Paths containing the query come first, then the ones sharing most of its trigrams,
+        which is at least half of them. Short queries only match as substrings.
+        """
+        query = query.lower()
+        query_trigrams: Set[str] = trigrams(query)
+
+        scores: Dict[str, int] = {}
+        for trigram in query_trigrams:
+            for project_id in self.__trigram_index().get(trigram, ()):
+                scores[project_id] = scores.get(project_id, 0) + 1
+
+        ranked: List[Tuple[Tuple[bool, int, int], str]] = []
+        candidates: Iterable[str] = scores if query_trigrams else self.__projects
+        for project_id in candidates:
+            path: str = self.__projects[project_id].path_with_namespace
+            contained: bool = query in path.lower()
+            score: int = scores.get(project_id, 0)
+            if contained or score * 2 >= len(query_trigrams) > 0:
+                ranked.append(((not contained, -score, len(path)), project_id))
+
+        ranked.sort()
+        return [self.__projects[project_id] for _, project_id in ranked[:limit]]
+
+    def __trigram_index(self) -> Dict[str, Set[str]]:
+        if self.__index is None:
+            self.__index = {}
+            for project_id, entry in self.__projects.items():
+                for trigram in trigrams(entry.path_with_namespace):
+                    self.__index.setdefault(trigram, set()).add(project_id)
+
+        return self.__index
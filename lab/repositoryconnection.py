@@ -7,18 +7,20 @@ Base class for creating a connection to the GitLab instance used by the reposito
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import sys
+import time
 
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from urllib.parse import urlparse
 
-from gitlab import Gitlab
-from gitlab.v4.objects import Project
-from gitlab.exceptions import GitlabAuthenticationError, GitlabGetError, GitlabHttpError
 from git import Repo
 
+from lab import localindex, output, trace
+from lab.localindex import LocalIndex, SyncState
+from lab.session import session
+from lab.connection import Connection, LazyProject
 from lab.utils import Utils, LogType
-from lab.config import Config
+from lab.config import Config, SessionSettings, RepositoryConfig
 
 
 class RepositoryConnection:
@@ -27,25 +29,38 @@ class RepositoryConnection:
     """
 
     # protected
-    _connection: Gitlab
+    _connection: Connection
     _local_repo: Repo
-    _remote_project: Project
+    _remote_project: LazyProject
 
     # private
     __config: Config
+    __repository_config: Optional[RepositoryConfig] = None
+    __hostname: str
+    __project_path: str
+
+    # Shared between all instances, so that a long-running process like git lab daemon
+    # only logs in once per instance and only looks up each project once.
+    __connections: Dict[Tuple[str, str], Connection] = {}
+    __projects: Dict[Tuple[str, str, str], LazyProject] = {}
 
     def __init__(self) -> None:
-        self._local_repo = Utils.get_cwd_repo()
-        self.__config = Config()
+        with trace.phase("repository"):
+            self._local_repo = Utils.get_cwd_repo()
 
-        try:
-            origin = self._local_repo.remote(name="origin")
-        except ValueError:
-            Utils.log(LogType.ERROR, "No origin remote exists")
-            sys.exit(1)
+            try:
+                origin = self._local_repo.remote(name="origin")
+            except ValueError:
+                Utils.log(LogType.ERROR, "No origin remote exists")
+                sys.exit(1)
+
+            repository: str = next(origin.urls)
+
+        with trace.phase("config"):
+            self.__config = Config()
 
-        repository: str = next(origin.urls)
-        if repository.startswith("http"):
+        # Only a hint for people, it would get in the way of scripts
+        if repository.startswith("http") and output.is_table():
             Utils.log(
                 LogType.INFO,
                 "Found http remote, if you want to switch this "
@@ -60,8 +75,10 @@ class RepositoryConnection:
         if not gitlab_hostname:
             Utils.log(LogType.ERROR, "Failed to detect GitLab hostname")
             sys.exit(1)
+        self.__hostname = gitlab_hostname
 
-        auth_token: Optional[str] = self.__config.token(gitlab_hostname)
+        with trace.phase("token"):
+            auth_token: Optional[str] = self.__config.token(gitlab_hostname)
         if not auth_token:
             Utils.log(LogType.ERROR, "No authentication token found. ")
             print(
@@ -72,27 +89,97 @@ class RepositoryConnection:
             print('Afterwards use "git lab login --host {} --token t0k3n"'.format(gitlab_hostname))
             sys.exit(1)
 
-        self.__login(gitlab_url, auth_token)
+        with trace.phase("auth"):
+            self.__login(gitlab_url, auth_token)
         if not self._connection:
             Utils.log(LogType.ERROR, "Failed to connect to GitLab")
             sys.exit(1)
 
-        try:
-            self._remote_project = self._connection.projects.get(Utils.str_id_for_url(repository))
-        except (GitlabHttpError, GitlabGetError):
-            Utils.log(
-                LogType.ERROR,
-                "The repository could not be found on the GitLab instance.",
-            )
-            print(
-                "If the repository was recently moved, please update the origin remote using git."
+        project_path: str = Utils.str_id_for_url(repository)
+        project_key: Tuple[str, str, str] = (gitlab_url, auth_token, project_path)
+        if project_key not in RepositoryConnection.__projects:
+            # Most requests only need the path of the project,
+            # its attributes are requested once something reads them.
+            with trace.phase("project"):
+                self.__repository_config = RepositoryConfig()
+                project_id: Optional[int] = self.__repository_config.project_id(project_path)
+            RepositoryConnection.__projects[project_key] = LazyProject(
+                self._connection.projects, project_path if project_id is None else project_id
             )
-            sys.exit(1)
+
+        self._remote_project = RepositoryConnection.__projects[project_key]
+        self.__project_path = project_path
 
     def __login(self, hostname: str, token: str) -> None:
-        try:
-            self._connection: Gitlab = Gitlab(hostname, private_token=token)
+        # The token is only checked by the first request,
+        # a rejected token raises LoginError from there.
+        if (hostname, token) not in RepositoryConnection.__connections:
+            settings: SessionSettings = self.__config.session_settings(self.__hostname)
+            connection = Connection(
+                hostname,
+                private_token=token,
+                session=session(hostname, settings),
+                timeout=settings.timeout,
+            )
+            RepositoryConnection.__connections[(hostname, token)] = connection
+
+        self._connection = RepositoryConnection.__connections[(hostname, token)]
+
+    def _current_user(self) -> Dict[str, Any]:
+        """
+        Returns id and username of the user the token belongs to.
+        They are stored in the config, so only the first call after logging in needs a request.
+        """
+        user: Optional[Dict[str, Any]] = self.__config.user(self.__hostname)
+        if user is None:
             self._connection.auth()
-        except (GitlabAuthenticationError, GitlabGetError):
-            Utils.log(LogType.ERROR, "Could not log into GitLab: {}".format(hostname))
-            sys.exit(1)
+            current_user: Any = self._connection.user
+            user = {"id": current_user.id, "username": current_user.username}
+            self.__config.set_user(self.__hostname, user)
+            self.__config.save()
+
+        return user
+
+    def _remote_project_id(self) -> int:
+        """
+        Returns the numeric id of the remote project.
+        It is stored in the repository config, so only the first call needs a request.
+        """
+        cached_id: Any = self._remote_project.get_id()
+        if isinstance(cached_id, int):
+            return cached_id
+
+        # Requests the project, afterwards the id is the numeric one
+        self._remote_project.load()
+        project_id: int = int(self._remote_project.get_id() or 0)
+
+        if self.__repository_config is None:
+            self.__repository_config = RepositoryConfig()
+        if self.__repository_config.project_id(self.__project_path) != project_id:
+            self.__repository_config.set_project_id(self.__project_path, project_id)
+            self.__repository_config.save()
+
+        return project_id
+
+    def _update_index(self, index: LocalIndex, kind: str) -> int:
+        """
+        Download the objects of kind that changed since the last sync into index
+        :return: number of objects that changed
+        """
+        with trace.phase("sync"):
+            return index.update(self._remote_project, self.__project_path, kind)
+
+    def _local_index(self, kind: str) -> LocalIndex:
+        """
+        Returns the local index of the repository, to answer without waiting for GitLab.
+        If kind was never synced, that happens first. If the last sync is older
+        than localindex.REFRESH_AFTER, a sync is started in the background for the next call.
+        """
+        index = LocalIndex(LocalIndex.path_for(self._local_repo.common_dir))
+        state: Optional[SyncState] = index.sync_state(kind)
+        if state is None or state.project != self.__project_path:
+            self._update_index(index, kind)
+        elif time.time() - state.synced_at > localindex.REFRESH_AFTER:
+            localindex.refresh_in_background(self._local_repo.common_dir)
+
+        return index
@@ -7,11 +7,17 @@ Module providing search capabilities
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import argparse
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
+from gitlab.exceptions import GitlabError
+from requests.exceptions import RequestException
+
+from lab import httpcache, output, pagination
 from lab.allinstancesconnection import AllInstancesConnection
+from lab.connection import Connection, LoginError
+from lab.projectcatalog import ProjectCatalog
 from lab.table import Table
-from lab.utils import TextFormatting
+from lab.utils import TextFormatting, Utils, LogType
 
 # See: https://docs.gitlab.com/ce/api/projects.html#list-all-projects
 SUPPORTED_ORDER_BY_KWS = (
@@ -28,6 +34,9 @@ SUPPORTED_ORDER_BY_KWS = (
     "wiki_size",
 )
 
+# Columns of --format csv and tsv
+FIELDS = ("path_with_namespace", "description", "ssh_url_to_repo")
+
 
 def parser(
     subparsers: argparse._SubParsersAction,  # pylint: disable=protected-access
@@ -65,6 +74,13 @@ def parser(
         help="Return projects sorted in asc or desc order. Default is desc.",
     )
 
+    search_parser.add_argument(
+        "--refresh",
+        help="Search on the instances instead of in the catalog of their projects on disk",
+        action="store_true",
+    )
+
+    pagination.add_arguments(search_parser)
     return search_parser
 
 
@@ -73,8 +89,7 @@ def run(args: argparse.Namespace) -> None:
     :param args: parsed arguments
     """
     search = Search()
-    search_query = args.search_query[0] if args.search_query else None
-    search.search_projects(search_query, args.order_by, args.sort_by)
+    search.search_projects(args.search_query, args.order_by, args.sort_by, args.limit, args.refresh)
 
 
 class Search(AllInstancesConnection):
@@ -90,26 +105,56 @@ class Search(AllInstancesConnection):
         query: Optional[str] = None,
         order_by: Optional[str] = None,
         sort_by: Optional[str] = None,
+        limit: Optional[int] = pagination.DEFAULT_LIMIT,
+        refresh: bool = False,
     ) -> None:
         """
-        Search for a project
+        Search for a project.
+        Queries without a particular order are answered from the project catalog
+        of each instance, which is updated first if it is older than an hour.
+        Records for --format contain all attributes of the projects, so they are always
+        requested from the instances.
         :param query: Search query
         :param order_by: Order objects by
         :param sort_by: sort in asc or desc order
+        :param limit: maximum number of projects per instance, None for all of them
+        :param refresh: always search on the instances
         """
-        table = Table()
-
-        kwargs = {
+        kwargs: Dict[str, Any] = {
             "search": query,
             "order_by": order_by,
             "sort_by": sort_by,
         }
 
-        for connection in self._connections:
-            # There are two possible search endpoints: `/search` and `/projects`
-            # The general search endpoint `/search` only supports `order_by=created_at`
-            # See: https://docs.gitlab.com/ee/api/search.html#advanced-search-api
-            for result in connection.projects.list(**kwargs):
+        # There are two possible search endpoints: `/search` and `/projects`
+        # The general search endpoint `/search` only supports `order_by=created_at`
+        # See: https://docs.gitlab.com/ee/api/search.html#advanced-search-api
+        use_catalog: bool = (
+            bool(query)
+            and order_by is None
+            and not refresh
+            and httpcache.is_enabled()
+            # The catalog only keeps the columns of the table
+            and output.is_table()
+        )
+
+        def search(connection: Connection) -> List[Any]:
+            if use_catalog and query:
+                return self.__catalog(connection).search(query, limit)
+
+            return list(pagination.lazy_list(connection.projects, limit, **kwargs))
+
+        # Show the results of each instance as soon as it answers
+        if not output.is_table():
+            output.print_records(
+                (output.record(result) for _, results in self._map(search) for result in results),
+                FIELDS,
+            )
+            return
+
+        for _, results in self._map(search):
+            table = Table()
+            for result in results:
                 description: Optional[str] = result.description
                 if description:
                     description = description.replace("\n", "")
@@ -126,4 +171,51 @@ class Search(AllInstancesConnection):
                     ]
                 )
 
-        table.print()
+            table.print()
+
+    @staticmethod
+    def __catalog(connection: Connection) -> ProjectCatalog:
+        """
+        Returns the project catalog of an instance, updated if it is stale.
+        If that fails, a previously stored catalog is still used.
+        """
+        catalog = ProjectCatalog(
+            ProjectCatalog.path_for(connection.url, connection.private_token or "")
+        )
+        if not catalog.is_stale():
+            return catalog
+
+        try:
+            Search.__update_catalog(connection, catalog)
+        except LoginError:
+            raise
+        except (GitlabError, RequestException) as error:
+            if not catalog.synced_at:
+                raise
+            Utils.log(
+                LogType.WARNING,
+                f"{connection.url}: Could not update the list of projects:",
+                str(error),
+            )
+
+        return catalog
+
+    @staticmethod
+    def __update_catalog(connection: Connection, catalog: ProjectCatalog) -> None:
+        # Keyset pagination follows the link to the next page, which GitLab sends
+        # for any number of projects, unlike the total it stops counting at some point
+        filters: Dict[str, Any] = {
+            "simple": True,
+            "pagination": "keyset",
+            "order_by": "id",
+            "sort": "asc",
+        }
+        if catalog.last_activity_at:
+            filters["last_activity_after"] = catalog.last_activity_at
+
+        catalog.update(
+            project.asdict()
+            for project in connection.projects.list(
+                iterator=True, per_page=pagination.MAX_PER_PAGE, **filters
+            )
+        )
@@ -0,0 +1,142 @@
+"""
+Module handing out the HTTP sessions used to talk to GitLab instances
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from lab import httpcache, trace
+from lab.config import SessionSettings
+from lab.httpcache import CachedResponse, ResponseCache
+
+# Headers that describe the encoded body on the wire, which is not what is cached
+_TRANSFER_HEADERS = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+# One session per instance and settings, shared by all connections of the process
+_sessions: Dict[Tuple[str, SessionSettings], requests.Session] = {}
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    Transport adapter that revalidates cached GET responses with If-None-Match,
+    and answers from the cache if the server replies 304 Not Modified
+    """
+
+    # private
+    __cache: ResponseCache
+
+    def __init__(self, cache: ResponseCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.__cache = cache
+
+    def send(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        # Streamed and partial downloads are written somewhere else by the caller
+        if (
+            not httpcache.is_enabled()
+            or request.method != "GET"
+            or stream
+            or "Range" in request.headers
+        ):
+            return super().send(request, stream, timeout, verify, cert, proxies)
+
+        credentials: str = str(
+            request.headers.get("PRIVATE-TOKEN") or request.headers.get("Authorization", "")
+        )
+        key: str = self.__cache.key(str(request.url), credentials)
+        cached: Optional[CachedResponse] = self.__cache.load(key)
+        if cached is not None and "ETag" in cached.headers:
+            request.headers["If-None-Match"] = cached.headers["ETag"]
+
+        response: requests.Response = super().send(request, stream, timeout, verify, cert, proxies)
+
+        if cached is not None and response.status_code == 304:
+            # Reading the empty body returns the connection to the pool,
+            # the response that is returned instead doesn't belong to it
+            _ = response.content
+            return self.__cached_response(request, response, cached)
+
+        if response.status_code == 200 and "ETag" in response.headers:
+            self.__cache.store(
+                key,
+                str(request.url),
+                {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name not in _TRANSFER_HEADERS
+                },
+                response.content,
+            )
+
+        return response
+
+    @staticmethod
+    def __cached_response(
+        request: requests.PreparedRequest,
+        not_modified: requests.Response,
+        cached: CachedResponse,
+    ) -> requests.Response:
+        headers: CaseInsensitiveDict[str] = CaseInsensitiveDict(cached.headers)
+        # A 304 response carries the current version of some headers, like the date
+        for name, value in not_modified.headers.items():
+            if name not in _TRANSFER_HEADERS:
+                headers[name] = value
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response.url = not_modified.url
+        response.request = request
+        response.connection = not_modified.connection
+        response.elapsed = not_modified.elapsed
+        response._content = cached.body  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        # Lets --trace count the bytes that were actually transferred
+        setattr(response, "from_cache", True)
+        return response
+
+
+def session(url: str, settings: SessionSettings) -> requests.Session:
+    """
+    Returns the session for the instance at url.
+    Its connections are kept open, so only the first request to an instance
+    pays for connecting and the TLS handshake.
+    """
+    parsed = urlparse(url)
+    origin: str = f"{parsed.scheme}://{parsed.netloc}/"
+
+    if (origin, settings) not in _sessions:
+        new_session = requests.Session()
+
+        # Only one host is reached through this session,
+        # but multiple requests to it can be running at the same time
+        adapter = CachingAdapter(
+            ResponseCache(), pool_connections=1, pool_maxsize=settings.pool_size
+        )
+        new_session.mount(origin, adapter)
+
+        if not settings.compression:
+            new_session.headers["Accept-Encoding"] = "identity"
+
+        trace.instrument(new_session)
+        _sessions[(origin, settings)] = new_session
+
+    return _sessions[(origin, settings)]
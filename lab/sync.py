@@ -0,0 +1,78 @@
+"""
+Module containing the sync command, which updates the local index of a repository
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import argparse
+from typing import Dict
+
+from lab import localindex
+from lab.localindex import LocalIndex
+from lab.repositoryconnection import RepositoryConnection
+from lab.utils import Utils, LogType
+
+
+def parser(
+    subparsers: argparse._SubParsersAction,  # pylint: disable=protected-access
+) -> argparse.ArgumentParser:
+    """
+    Subparser for sync command
+    :param subparsers: subparsers object from global parser
+    :return: sync subparser
+    """
+    sync_parser: argparse.ArgumentParser = subparsers.add_parser(
+        "sync", help="Update the local index of merge requests and issues"
+    )
+    sync_parser.add_argument(
+        "--full",
+        help="Download everything again instead of only what changed since the last sync",
+        action="store_true",
+    )
+    sync_parser.add_argument(
+        "--quiet",
+        help="Don't print how much changed",
+        action="store_true",
+    )
+    return sync_parser
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    run sync command
+    :param args: parsed arguments
+    """
+    sync = Sync()
+    counts: Dict[str, int] = sync.sync(args.full)
+    if not args.quiet:
+        Utils.log(
+            LogType.INFO,
+            "{} merge requests and {} issues updated".format(
+                counts["merge_requests"], counts["issues"]
+            ),
+        )
+
+
+class Sync(RepositoryConnection):
+    """
+    Updates the local index of the current repository
+    """
+
+    def sync(self, full: bool = False) -> Dict[str, int]:
+        """
+        Download the merge requests and issues that changed since the last sync
+        :param full: download all of them again
+        :return: number of updated objects of each kind
+        """
+        index = LocalIndex(LocalIndex.path_for(self._local_repo.common_dir))
+        try:
+            counts: Dict[str, int] = {}
+            for kind in localindex.KINDS:
+                if full:
+                    index.clear(kind)
+                counts[kind] = self._update_index(index, kind)
+            return counts
+        finally:
+            index.close()
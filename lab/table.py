@@ -6,79 +6,139 @@ Class containing classes for printing tables
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
 
-from typing import List
+import functools
+import itertools
+import re
+import unicodedata
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+# Spaces between two columns
+SPACING: int = 2
+
+# Select Graphic Rendition escape sequences, as used by TextFormatting
+SGR_SEQUENCE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def display_width(text: str) -> int:
+    """
+    Returns the number of terminal cells text takes up.
+    Escape sequences for colors take none, wide east asian characters and emoji two,
+    combining marks and zero width characters none.
+    """
+    if text.isascii() and "\x1b" not in text:
+        return len(text)
+
+    return _display_width(text)
+
+
+# The same colored states and labels appear in most rows
+@functools.lru_cache(maxsize=4096)
+def _display_width(text: str) -> int:
+    text = SGR_SEQUENCE.sub("", text)
+    if text.isascii():
+        return len(text)
+
+    width: int = 0
+    joined: bool = False
+    for character in text:
+        # Emoji joined by a zero width joiner or followed by a skin tone are drawn as one
+        if joined or "\U0001f3fb" <= character <= "\U0001f3ff":
+            joined = False
+            continue
+        joined = character == "\u200d"
+        if unicodedata.category(character) in ("Mn", "Me", "Cf"):
+            continue
+        width += 2 if unicodedata.east_asian_width(character) in ("W", "F") else 1
+
+    return width
 
 
 class Table:
     """
-    Manages and draws a table to the standard output
+    Manages and draws a table to the standard output.
+
+    The rows are stored as they are passed, without copying them, and the width
+    of each column is updated as rows are added, so that building and printing
+    the table takes linear time.
     """
 
-    __columns: List[List[str]] = []
+    __slots__ = ("__rows", "__widths")
+
+    __rows: List[Sequence[str]]
+    __widths: List[int]
+
+    def __init__(self) -> None:
+        self.__rows = []
+        self.__widths = []
 
     def add_column(self, column: List[str]) -> None:
         """
         Add a column to the table.
         The column needs to be a list of strings
         """
-        self.__columns.append(column)
+        index: int = len(self.__widths)
+        while len(self.__rows) < len(column):
+            self.__rows.append(())
+
+        for grid_y, item in enumerate(column):
+            row: Tuple[str, ...] = tuple(self.__rows[grid_y])
+            self.__rows[grid_y] = row + ("",) * (index - len(row)) + (item,)
 
-    def add_row(self, row: List[str]) -> None:
+        self.__widths.append(max((display_width(item) for item in column), default=0))
+
+    def add_row(self, row: Sequence[str]) -> None:
         """
         Add a row to the table.
         The row needs to be a list of strings.
         """
-        columns_len: int = Table.__columns_max_len(self.__columns)
-
-        while len(row) > len(self.__columns):
-            self.__columns.append([])
-
-        for i, item in enumerate(row, 0):
-            for column in self.__columns:
-                while len(column) < columns_len:
-                    column.append("")
-
-            self.__columns[i].append(item)
+        self.__rows.append(row)
 
-    @staticmethod
-    def __column_max_width(column: List[str]) -> int:
-        lens: List[int] = []
-        for string in column:
-            lens.append(len(string))
-
-        return max(lens)
-
-    @staticmethod
-    def __columns_max_len(columns: List[List[str]]) -> int:
-        lens: List[int] = []
-        for column in columns:
-            lens.append(len(column))
-
-        try:
-            return max(lens)
-        except ValueError:  # Happens if table is completely empty
-            return 0
+        widths: List[int] = self.__widths
+        if len(row) > len(widths):
+            widths.extend([0] * (len(row) - len(widths)))
+        for grid_x, item in enumerate(row):
+            width: int = display_width(item)
+            if width > widths[grid_x]:
+                widths[grid_x] = width
 
     def print(self) -> None:
         """
         print the table to the terminal
         """
-        # Calculate width for each column
-        column_widths: List[int] = []
-        for col in self.__columns:
-            column_widths.append(self.__column_max_width(col))
+        for line in self.lines():
+            print(line)
 
-        # Build table
-        for grid_y in range(0, Table.__columns_max_len(self.__columns)):
-            textbuffer: str = ""
+    def print_stream(self, rows: Iterable[Sequence[str]], buffered: int) -> None:
+        """
+        print rows to the terminal as they arrive.
+        The column widths are taken from the rows already in the table and the first buffered rows,
+        later rows that are wider than that push the following columns to the right.
+        """
+        rows = iter(rows)
+        for row in itertools.islice(rows, buffered):
+            self.add_row(row)
 
-            for grid_x in range(0, len(self.__columns)):
-                column: List[str] = self.__columns[grid_x]
+        for line in self.lines():
+            print(line, flush=True)
 
-                try:
-                    textbuffer += column[grid_y]
-                    textbuffer += (column_widths[grid_x] - len(column[grid_y]) + 2) * " "
-                except IndexError:
-                    textbuffer += (column_widths[grid_x] + 2) * " "
+        widths: List[int] = list(self.__widths)
+        for row in rows:
+            widths += [0] * (len(row) - len(widths))
+            print(Table.__line(row, widths), flush=True)
 
-            print(textbuffer)
+    def lines(self) -> Iterator[str]:
+        """
+        Returns the lines of the table, without line breaks
+        """
+        widths: List[int] = self.__widths
+        for row in self.__rows:
+            yield Table.__line(row, widths)
+
+    @staticmethod
+    def __line(row: Sequence[str], widths: Sequence[int]) -> str:
+        # Cells missing at the end of the row are padded like empty ones
+        cells: Iterator[str] = itertools.chain(row, itertools.repeat("", len(widths) - len(row)))
+        return "".join(
+            item + " " * (max(width - display_width(item), 0) + SPACING)
+            for item, width in zip(cells, widths)
+        )
@@ -0,0 +1,227 @@
+"""
+Module for measuring where the time of a command is spent (git lab --trace)
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+TRACE_FORMATS: Tuple[str, ...] = ("text", "json")
+
+
+class Phase:  # pylint: disable=too-few-public-methods
+    """
+    Resources used by one phase of a command.
+    Nested phases are not counted in their parent phase.
+    """
+
+    name: str
+    seconds: float = 0.0
+    requests: int = 0
+    bytes: int = 0
+    git: int = 0
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the phase in a form that can be serialized to json
+        """
+        return {
+            "name": self.name,
+            "seconds": round(self.seconds, 6),
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "git": self.git,
+        }
+
+
+class Tracer:
+    """
+    Collects the resources used by each phase of a command.
+    Only the thread that started tracing enters phases. Requests and git processes
+    of other threads count toward the phase that thread is in meanwhile.
+    """
+
+    output_format: str
+    phases: Dict[str, Phase]
+
+    # private
+    __stack: List[Phase]
+    __last: float
+    __thread: int
+
+    def __init__(self, output_format: str) -> None:
+        self.output_format = output_format
+        self.phases = {}
+        self.__stack = [self.__phase("other")]
+        self.__last = time.perf_counter()
+        self.__thread = threading.get_ident()
+
+    def __phase(self, name: str) -> Phase:
+        if name not in self.phases:
+            self.phases[name] = Phase(name)
+        return self.phases[name]
+
+    def __account_time(self) -> None:
+        now: float = time.perf_counter()
+        self.__stack[-1].seconds += now - self.__last
+        self.__last = now
+
+    def enter(self, name: str) -> None:
+        """
+        Start a phase. Everything until the matching exit() is attributed to it.
+        """
+        if threading.get_ident() != self.__thread:
+            return
+
+        self.__account_time()
+        self.__stack.append(self.__phase(name))
+
+    def exit(self) -> None:
+        """
+        End the current phase
+        """
+        if threading.get_ident() != self.__thread:
+            return
+
+        self.__account_time()
+        self.__stack.pop()
+
+    @property
+    def current(self) -> Phase:
+        """
+        The phase that is currently running
+        """
+        return self.__stack[-1]
+
+    def report(self) -> str:
+        """
+        Returns the collected numbers formatted according to output_format
+        """
+        self.__account_time()
+        phases: List[Phase] = [entry for entry in self.phases.values() if entry.seconds > 0]
+
+        total = Phase("total")
+        for entry in phases:
+            total.seconds += entry.seconds
+            total.requests += entry.requests
+            total.bytes += entry.bytes
+            total.git += entry.git
+
+        if self.output_format == "json":
+            return json.dumps(
+                {"phases": [entry.as_dict() for entry in phases], "total": total.as_dict()}
+            )
+
+        lines: List[str] = [f"{'phase':<12} {'time':>11} {'requests':>9} {'bytes':>11} {'git':>5}"]
+        for entry in phases + [total]:
+            lines.append(
+                f"{entry.name:<12} {entry.seconds * 1000:>8.1f} ms {entry.requests:>9} "
+                + f"{entry.bytes:>11} {entry.git:>5}"
+            )
+        return os.linesep.join(lines)
+
+
+# Tracer of the running command, None if tracing is disabled
+_tracer: Optional[Tracer] = None  # pylint: disable=invalid-name
+_audit_hook_installed: bool = False  # pylint: disable=invalid-name
+
+
+def _audit_hook(event: str, args: Tuple[Any, ...]) -> None:
+    if _tracer is None or event != "subprocess.Popen":
+        return
+
+    arguments: Any = args[1]
+    program: Any = arguments if isinstance(arguments, (str, bytes)) else arguments[0]
+    if os.path.basename(os.fsdecode(program)) == "git":
+        _tracer.current.git += 1
+
+
+def format_from_environment() -> Optional[str]:
+    """
+    Returns the trace format requested using GIT_LAB_TRACE, if any
+    """
+    value: str = os.environ.get("GIT_LAB_TRACE", "")
+    if not value or value == "0":
+        return None
+
+    return value if value in TRACE_FORMATS else "text"
+
+
+def enable(output_format: str) -> None:
+    """
+    Start tracing the current command
+    """
+    global _tracer, _audit_hook_installed  # pylint: disable=global-statement
+    _tracer = Tracer(output_format)
+
+    # Audit hooks can't be removed, so only install it once
+    if not _audit_hook_installed:
+        sys.addaudithook(_audit_hook)
+        _audit_hook_installed = True
+
+
+def report() -> None:
+    """
+    Stop tracing and print the collected numbers to stderr
+    """
+    global _tracer  # pylint: disable=global-statement
+    if _tracer is None:
+        return
+
+    print(_tracer.report(), file=sys.stderr)
+    _tracer = None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Attribute everything that happens inside the with block to the phase name
+    """
+    tracer: Optional[Tracer] = _tracer
+    if tracer is None:
+        yield
+        return
+
+    tracer.enter(name)
+    try:
+        yield
+    finally:
+        tracer.exit()
+
+
+def instrument(session: Any) -> None:
+    """
+    Count the requests and bytes of a requests session in the current phase
+    """
+    send = session.send
+
+    def traced_send(request: Any, **kwargs: Any) -> Any:
+        response: Any = send(request, **kwargs)
+        tracer: Optional[Tracer] = _tracer
+        if tracer is not None:
+            tracer.current.requests += 1
+            if isinstance(request.body, (bytes, str)):
+                tracer.current.bytes += len(request.body)
+            if kwargs.get("stream"):
+                # Reading the body here would defeat streaming
+                tracer.current.bytes += int(response.headers.get("Content-Length", 0))
+            elif getattr(response, "from_cache", False):
+                # The body was read from disk, the server only confirmed it
+                pass
+            else:
+                tracer.current.bytes += len(response.content)
+
+        return response
+
+    session.send = traced_send
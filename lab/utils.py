@@ -2,6 +2,7 @@
 Module containing classes for common tasks
 """
 
+import functools
 import os
 import re
 import shlex
@@ -14,11 +15,14 @@ import subprocess
 import sys
 from datetime import datetime, timezone
 from enum import Enum, auto
-from typing import List, Optional, Final
+from typing import Callable, List, Optional, Final, TYPE_CHECKING
 from urllib.parse import ParseResult, urlparse
 
-from git import Repo
-from git.exc import InvalidGitRepositoryError
+from lab import output
+
+if TYPE_CHECKING:
+    # GitPython is slow to import, only load it once a command needs a repository
+    from git import Repo
 
 TIME_STR_REGEX = r"^([0-9]+mo)?([0-9]+w)?([0-9]+d)?([0-9]+h)?([0-9]+m)?$"
 
@@ -44,6 +48,25 @@ def removesuffix(string: str, suffix: str) -> str:
     return string
 
 
+class DeferredDefault:  # pylint: disable=too-few-public-methods
+    """
+    Default value of a command line argument that is expensive to compute,
+    for example because it needs to open the git repository.
+    It is only resolved once the command that declares it actually runs.
+    """
+
+    __factory: Callable[[], str]
+
+    def __init__(self, factory: Callable[[], str]) -> None:
+        self.__factory = factory
+
+    def resolve(self) -> str:
+        """
+        Compute the actual default value
+        """
+        return self.__factory()
+
+
 class LogType(Enum):
     """
     Enum representing the type of log message
@@ -115,7 +138,8 @@ class Utils:
         if len(prefix) > 0:
             prefix += ":"
 
-        print(prefix, *message)
+        # Keep the records of machine readable output parseable
+        print(prefix, *message, file=sys.stdout if output.is_table() else sys.stderr)
 
     @staticmethod
     def normalize_url(url: str) -> str:
@@ -182,11 +206,15 @@ class Utils:
         sys.exit(1)
 
     @staticmethod
-    def get_cwd_repo() -> Repo:
+    def get_cwd_repo() -> "Repo":
         """
         Creates a Repo object from one of the parent directories of the current directories.
         If it can not find a git repository, an error is shown.
         """
+        # pylint: disable=import-outside-toplevel
+        from git import Repo
+        from git.exc import InvalidGitRepositoryError
+
         try:
             return Repo(Utils.find_dotgit(os.getcwd()))
         except InvalidGitRepositoryError:
@@ -255,11 +283,14 @@ class Utils:
         return Utils.find_dotgit(parent_dir)
 
     @staticmethod
-    def pretty_date(date_string: str, now: datetime = datetime.now(timezone.utc)) -> str:
+    def pretty_date(date_string: str, now: Optional[datetime] = None) -> str:
         """Transform an ISO-8601 date-string and transform it into a human readable format.
         Taken almost verbatim from:
             https://stackoverflow.com/questions/1551382/user-friendly-time-format-in-python
         """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
         time = datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S.%fZ")
         try:
             diff = now - time
@@ -316,8 +347,22 @@ class Utils:
         return "%ds" % (seconds,)
 
     @staticmethod
-    def get_default_branch(repo: Repo) -> str:
+    def default_branch() -> str:
+        """
+        Returns the default branch of the repository in the current directory.
+        The value is only computed once per repository.
+        """
+        return _default_branch(Utils.find_dotgit(os.getcwd()))
+
+    @staticmethod
+    def get_default_branch(repo: "Repo") -> str:
         try:
             return repo.remotes.origin.refs["HEAD"].ref.remote_head
         except:
             return "master"
+
+
+@functools.lru_cache(maxsize=None)
+def _default_branch(repository_path: Optional[str]) -> str:  # pylint: disable=unused-argument
+    # repository_path is only used as the cache key
+    return Utils.get_default_branch(Utils.get_cwd_repo())
@@ -0,0 +1,90 @@
+"""
+Module containing helpers for commands that keep showing the current state of something
+"""
+
+# SPDX-FileCopyrightText: 2026 KDE Community
+#
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import sys
+from typing import List, Optional, Sequence, TextIO
+
+
+class Backoff:
+    """
+    Interval between two polls, which grows while nothing changes
+    and starts over from the minimum once something did
+    """
+
+    minimum: float
+    maximum: float
+    factor: float
+
+    # private
+    __interval: float
+
+    def __init__(self, minimum: float = 2.0, maximum: float = 30.0, factor: float = 1.5) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.__interval = minimum
+
+    def next(self, changed: bool) -> float:
+        """
+        Returns the seconds to wait before the next poll
+        :param changed: whether the last poll found a change
+        """
+        if changed:
+            self.__interval = self.minimum
+        else:
+            self.__interval = min(self.__interval * self.factor, self.maximum)
+
+        return self.__interval
+
+
+class LiveLines:
+    """
+    Lines at the end of the output that are updated in place.
+    On a terminal, only the lines that changed are written again.
+    Otherwise, all lines are printed again whenever one of them changed.
+    """
+
+    # private
+    __stream: Optional[TextIO]
+    __lines: List[str]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.__stream = stream
+        self.__lines = []
+
+    def update(self, lines: Sequence[str]) -> None:
+        """
+        Show lines instead of the previous ones
+        """
+        # Looked up here, so that redirecting sys.stdout works
+        stream: TextIO = self.__stream or sys.stdout
+        if not stream.isatty():
+            if list(lines) != self.__lines:
+                stream.write("".join(line + "\n" for line in lines))
+                stream.flush()
+                self.__lines = list(lines)
+            return
+
+        previous: List[str] = self.__lines
+        parts: List[str] = []
+        if previous:
+            # Back to the start of the first line
+            parts.append(f"\x1b[{len(previous)}F")
+
+        for index in range(max(len(previous), len(lines))):
+            line: str = lines[index] if index < len(lines) else ""
+            if index < len(previous) and previous[index] == line:
+                # Unchanged, move on to the next line
+                parts.append("\x1b[1E")
+            else:
+                parts.append("\x1b[2K" + line + "\n")
+
+        stream.write("".join(parts))
+        stream.flush()
+        # Lines that were removed stay as empty lines
+        self.__lines = list(lines) + [""] * (len(previous) - len(lines))
@@ -0,0 +1,132 @@
+"""
+Minimal fake GitLab API server for tests and benchmarks
+"""
+
+import json
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class MockGitLab:
+    """
+    Serves the registered routes on a random local port.
+    Requests, connections and the bytes of the response bodies are counted.
+
+    A route is a regular expression matched against the path of the request,
+    and a function that gets the match and the query parameters and returns
+    (status, headers, body). Lists returned as body are paginated like GitLab does.
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0) -> None:
+        self.latency = latency
+        self.routes: List[Tuple[str, Callable[..., Any]]] = []
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self.connections = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # Headers and body are written separately, don't wait for delayed acks
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with mock.lock:
+                    mock.connections += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self.handle_request("GET")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                self.handle_request("POST")
+
+            def handle_request(self, verb: str) -> None:
+                url = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                with mock.lock:
+                    mock.requests.append((verb, url.path, dict(self.headers)))
+
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+                status, headers, body = mock.respond(url.path, query, dict(self.headers))
+                with mock.lock:
+                    mock.bytes_sent += len(body)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def route(self, pattern: str, handler: Callable[..., Any]) -> None:
+        self.routes.append((pattern, handler))
+
+    def respond(
+        self, path: str, query: Dict[str, str], headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        for pattern, handler in self.routes:
+            match = re.fullmatch(pattern, path)
+            if not match:
+                continue
+
+            status, response_headers, body = handler(match, query, headers)
+            if isinstance(body, list):
+                body, response_headers = self.paginate(path, query, body, response_headers)
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode()
+                response_headers.setdefault("Content-Type", "application/json")
+            return status, response_headers, body
+
+        return 404, {"Content-Type": "application/json"}, b'{"message": "404 Not found"}'
+
+    def paginate(
+        self, path: str, query: Dict[str, str], items: List[Any], headers: Dict[str, str]
+    ) -> Tuple[List[Any], Dict[str, str]]:
+        page = int(query.get("page", 1))
+        per_page = int(query.get("per_page", 20))
+        total_pages = max(1, -(-len(items) // per_page))
+
+        headers = dict(headers)
+        headers["X-Page"] = str(page)
+        headers["X-Per-Page"] = str(per_page)
+        headers["X-Total"] = str(len(items))
+        headers["X-Total-Pages"] = str(total_pages)
+        if page < total_pages:
+            next_query = dict(query, page=str(page + 1))
+            link = "{}{}?{}".format(
+                self.url, path, "&".join("{}={}".format(k, v) for k, v in next_query.items())
+            )
+            headers["X-Next-Page"] = str(page + 1)
+            headers["Link"] = '<{}>; rel="next"'.format(link)
+
+        return items[(page - 1) * per_page : page * per_page], headers
+
+    def __enter__(self) -> "MockGitLab":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import login
+from lab.config import Config
+from lab.credentials import CredentialCache
+
+
+class CredentialCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        for patcher in (
+            patch.object(Config, "config_path", os.path.join(directory.name, "gitlabconfig")),
+            # Only test the in-memory cache, the keyring of the user must not be touched
+            patch("lab.credentials.shutil.which", return_value=None),
+            patch.dict(CredentialCache._CredentialCache__memory, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def count_commands(self, ttl, calls):
+        config = Config()
+        config.set_auth_command("invent.kde.org", "echo t0k3n")
+        if ttl is not None:
+            config.set_cache_ttl("invent.kde.org", ttl)
+
+        with patch("lab.config.subprocess.check_output", wraps=subprocess.check_output) as command:
+            for _ in range(calls):
+                self.assertEqual(config.token("invent.kde.org"), "t0k3n")
+            return command.call_count
+
+    def test_no_cache_by_default(self):
+        self.assertEqual(self.count_commands(None, 3), 3)
+
+    def test_command_runs_once_per_ttl(self):
+        self.assertEqual(self.count_commands(300, 3), 1)
+
+    def test_token_expires(self):
+        with patch("lab.credentials.time.monotonic", side_effect=[0, 10, 400, 400]):
+            self.assertEqual(self.count_commands(300, 3), 2)
+
+    def test_changed_command_is_not_cached(self):
+        self.count_commands(300, 1)
+
+        config = Config()
+        config.set_auth_command("invent.kde.org", "echo n3w")
+        config.set_cache_ttl("invent.kde.org", 300)
+        self.assertEqual(config.token("invent.kde.org"), "n3w")
+
+    def test_key_without_timeout_is_removed(self):
+        calls = []
+
+        def keyctl(*args, stdin=None):
+            calls.append(args[0])
+            # timeout fails, e.g. because the key was already revoked
+            return {"padd": "42", "unlink": ""}.get(args[0])
+
+        with patch.object(CredentialCache, "_CredentialCache__keyctl", staticmethod(keyctl)):
+            CredentialCache(300).store("invent.kde.org", "echo t0k3n", "t0k3n")
+
+        self.assertEqual(calls, ["padd", "timeout", "unlink"])
+
+    def test_keyring_token_is_not_kept_for_another_ttl(self):
+        def keyctl(*args, stdin=None):
+            return {"search": "42", "pipe": "t0k3n"}.get(args[0])
+
+        cache = CredentialCache(300)
+        with patch.object(CredentialCache, "_CredentialCache__keyctl", staticmethod(keyctl)):
+            with patch("lab.credentials.time.monotonic", return_value=1000):
+                self.assertEqual(cache.get("invent.kde.org", "echo t0k3n"), "t0k3n")
+
+        # Expired in the keyring, the memory doesn't have it much longer
+        with patch("lab.credentials.time.monotonic", return_value=1000 + 60):
+            self.assertIsNone(cache.get("invent.kde.org", "echo t0k3n"))
+
+    def test_cache_ttl_needs_command(self):
+        args = argparse.Namespace(host="invent.kde.org", token="t0k3n", command=None, cache_ttl=300)
+        with self.assertRaises(SystemExit):
+            login.run(args)
+        self.assertFalse(os.path.exists(Config.config_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from gitlab.exceptions import GitlabGetError
+
+from lab import _error_message
+from lab.config import Config, RepositoryConfig
+from lab.connection import Connection, LazyProject, LoginError, project_not_found
+from lab.repositoryconnection import RepositoryConnection
+from mockgitlab import MockGitLab
+
+
+def user(match, query, headers):
+    if headers.get("PRIVATE-TOKEN") != "t0k3n":
+        return 401, {}, {"message": "401 Unauthorized"}
+    return 200, {}, {"id": 7, "username": "jdoe"}
+
+
+class ConnectionTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = patch.object(Config, "config_path", os.path.join(directory.name, "gitlabconfig"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_login_is_lazy(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/user", user)
+            server.route(
+                r"/api/v4/projects",
+                lambda match, query, headers: user(match, query, headers)[:2] + ([],),
+            )
+
+            connection = Connection(server.url, private_token="wrong")
+            self.assertEqual(server.requests, [])
+
+            with self.assertRaises(LoginError) as context:
+                connection.projects.list()
+            self.assertEqual(
+                context.exception.error_message, f"Could not log into GitLab: {server.url}"
+            )
+
+    def test_current_user_is_cached(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/user", user)
+
+            # Skip RepositoryConnection.__init__, it needs a repository
+            repository_connection = RepositoryConnection.__new__(RepositoryConnection)
+            repository_connection._connection = Connection(server.url, private_token="t0k3n")
+            repository_connection._RepositoryConnection__config = Config()
+            repository_connection._RepositoryConnection__hostname = "127.0.0.1"
+
+            for _ in range(2):
+                self.assertEqual(
+                    repository_connection._current_user(), {"id": 7, "username": "jdoe"}
+                )
+            self.assertEqual(len(server.requests), 1)
+
+            # Stored on disk for the next invocation
+            self.assertEqual(Config().user("127.0.0.1"), {"id": 7, "username": "jdoe"})
+
+            # Logging in again forgets the user
+            config = Config()
+            config.set_token("127.0.0.1", "n3w")
+            self.assertIsNone(config.user("127.0.0.1"))
+
+    def test_project_is_lazy(self):
+        repository = tempfile.TemporaryDirectory()
+        self.addCleanup(repository.cleanup)
+        os.mkdir(os.path.join(repository.name, ".git"))
+        cwd = os.getcwd()
+        os.chdir(repository.name)
+        self.addCleanup(os.chdir, cwd)
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/g%2Fp/merge_requests", lambda *args: (200, {}, []))
+            server.route(
+                r"/api/v4/projects/g%2Fp",
+                lambda *args: (200, {}, {"id": 42, "path": "p", "web_url": server.url + "/g/p"}),
+            )
+
+            connection = Connection(server.url, private_token="t0k3n")
+            project = LazyProject(connection.projects, "g/p")
+            project.mergerequests.list()
+            self.assertEqual(
+                [path for _, path, _ in server.requests], ["/api/v4/projects/g%2Fp/merge_requests"]
+            )
+
+            repository_connection = RepositoryConnection.__new__(RepositoryConnection)
+            repository_connection._remote_project = project
+            repository_connection._RepositoryConnection__project_path = "g/p"
+            self.assertEqual(repository_connection._remote_project_id(), 42)
+            self.assertEqual(project.web_url, server.url + "/g/p")
+            self.assertEqual(len(server.requests), 2)
+
+            # The id is stored for the next invocation
+            self.assertEqual(RepositoryConfig().project_id("g/p"), 42)
+            self.assertIsNone(RepositoryConfig().project_id("g/other"))
+
+    def test_missing_project_is_told_apart_from_missing_objects(self):
+        with MockGitLab() as server:
+            server.route(
+                r"/api/v4/projects/g%2Fmoved/merge_requests/\d+",
+                lambda *args: (404, {}, {"message": "404 Project Not Found"}),
+            )
+            server.route(
+                r"/api/v4/projects/g%2Fp/merge_requests/\d+",
+                lambda *args: (404, {}, {"message": "404 Not found"}),
+            )
+            connection = Connection(server.url, private_token="t0k3n")
+
+            errors = []
+            for path in ("g/moved", "g/p"):
+                project = LazyProject(connection.projects, path)
+                with self.assertRaises(GitlabGetError) as context:
+                    project.mergerequests.get(99999)
+                errors.append(context.exception)
+
+        self.assertTrue(project_not_found(errors[0]))
+        self.assertIn("update the origin remote", _error_message(errors[0]))
+        self.assertFalse(project_not_found(errors[1]))
+        self.assertEqual(
+            _error_message(errors[1]), "Not found on the GitLab instance: 404 Not found"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
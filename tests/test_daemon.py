@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+import multiprocessing
+import unittest
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import daemon
+from lab.daemon import Daemon
+
+
+def fake_execute(argv):
+    if argv[0] == "pipelines":
+        print("log of", argv[-1])
+        sys.stdout.buffer.write(b"\x1b[32mpassed\xff\n")
+        return 0
+    print("running", *argv, "in", os.path.basename(os.getcwd()))
+    print("warning", file=sys.stderr)
+    return 3
+
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "git-lab.sock")
+        patcher = patch("lab.daemon.socket_path", return_value=path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_no_daemon_running(self):
+        self.assertIsNone(daemon.forward(["mrs"]))
+
+    def start(self):
+        server = Daemon(daemon.socket_path(), fake_execute)
+        # The daemon redirects the output of its process, so it can't share it with the client
+        process = multiprocessing.get_context("fork").Process(target=server.serve)
+        process.start()
+        while not os.path.exists(server.path):
+            pass
+        return server, process
+
+    def test_binary_output(self):
+        _, process = self.start()
+        try:
+            stdout = TextIOWrapper(BytesIO(), encoding="utf-8")
+            with patch("sys.stdout", new=stdout):
+                status = daemon.forward(["pipelines", "--log=5"])
+        finally:
+            daemon.forward(None)
+            process.join()
+
+        self.assertEqual(status, 0)
+        stdout.flush()
+        self.assertEqual(stdout.buffer.getvalue(), b"log of --log=5\n\x1b[32mpassed\xff\n")
+
+    def test_forward(self):
+        server, process = self.start()
+
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            with patch("sys.stdout", new=StringIO()) as stdout, patch(
+                "sys.stderr", new=StringIO()
+            ) as stderr:
+                status = daemon.forward(["mrs", "--project"])
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(status, 3)
+        self.assertEqual(
+            stdout.getvalue(),
+            "running mrs --project in {}\n".format(os.path.basename(self.directory.name)),
+        )
+        self.assertEqual(stderr.getvalue(), "warning\n")
+
+        self.assertEqual(daemon.forward(None), 0)
+        process.join()
+        self.assertFalse(os.path.exists(server.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
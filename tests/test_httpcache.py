@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import httpcache
+from lab import session as session_module
+from lab.config import SessionSettings
+from lab.connection import Connection
+from lab.httpcache import ResponseCache
+from lab.session import session
+from mockgitlab import MockGitLab
+
+
+def pipelines(match, query, headers):
+    items = [{"id": i, "status": "success"} for i in range(50)]
+    page = int(query.get("page", 1))
+    etag = 'W/"{}"'.format(hashlib.sha1(str(page).encode()).hexdigest())
+    if headers.get("If-None-Match") == etag:
+        return 304, {"ETag": etag}, b""
+    return 200, {"ETag": etag}, items
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+        patcher = patch.object(session_module, "_sessions", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(session_module, "ResponseCache", lambda: ResponseCache(self.path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(httpcache.set_enabled, True)
+
+    def connection(self, server, token="t0k3n"):
+        return Connection(
+            server.url, private_token=token, session=session(server.url, SessionSettings())
+        )
+
+    def test_revalidation(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/pipelines", pipelines)
+
+            first = self.connection(server).projects.get(1, lazy=True).pipelines.list(get_all=True)
+            second = self.connection(server).projects.get(1, lazy=True).pipelines.list(get_all=True)
+
+            self.assertEqual([p.id for p in first], list(range(50)))
+            self.assertEqual([p.id for p in second], list(range(50)))
+
+            # All three pages were revalidated, not downloaded again
+            self.assertEqual(len(server.requests), 6)
+            revalidated = [headers.get("If-None-Match") for _, _, headers in server.requests[3:]]
+            self.assertTrue(all(revalidated))
+
+            # Other tokens don't share the responses
+            self.connection(server, "other").projects.get(1, lazy=True).pipelines.list(
+                get_all=False
+            )
+            self.assertNotIn("If-None-Match", server.requests[-1][2])
+
+    def test_revalidation_reuses_the_connection(self):
+        def project(match, query, headers):
+            if headers.get("If-None-Match") == 'W/"1"':
+                return 304, {"ETag": 'W/"1"'}, b""
+            return 200, {"ETag": 'W/"1"'}, {"id": 1, "name": "project"}
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1", project)
+            connection = self.connection(server)
+            for _ in range(10):
+                self.assertEqual(connection.projects.get(1).name, "project")
+
+            self.assertEqual(len(server.requests), 10)
+            self.assertEqual(server.connections, 1)
+
+    def test_disabled(self):
+        httpcache.set_enabled(False)
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/pipelines", pipelines)
+            for _ in range(2):
+                self.connection(server).projects.get(1, lazy=True).pipelines.list(get_all=False)
+
+            self.assertNotIn("If-None-Match", server.requests[-1][2])
+            self.assertEqual(os.listdir(self.path), [])
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ResponseCache(self.path, max_size=3500)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.store(key, "https://example.org/" + key, {"ETag": key}, b"x" * 1000)
+            os.utime(os.path.join(self.path, key), (i, i))
+
+        # Reading "a" makes "b" the least recently used one
+        self.assertEqual(cache.load("a").body, b"x" * 1000)
+        cache.store("d", "https://example.org/d", {"ETag": "d"}, b"x" * 500)
+
+        self.assertEqual(sorted(os.listdir(self.path)), ["a", "c", "d"])
+        with open(os.path.join(self.path, "d"), "rb") as file:
+            self.assertEqual(json.loads(file.readline())["url"], "https://example.org/d")
+
+
+if __name__ == "__main__":
+    unittest.main()
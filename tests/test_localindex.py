@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import fcntl
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import localindex
+from lab.connection import Connection
+from lab.localindex import LocalIndex
+from mockgitlab import MockGitLab
+
+
+def merge_request(iid, state, updated_at):
+    return {"iid": iid, "state": state, "title": f"Merge request {iid}", "updated_at": updated_at}
+
+
+class LocalIndexTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.index = LocalIndex(LocalIndex.path_for(directory.name))
+        self.addCleanup(self.index.close)
+
+    def test_query(self):
+        self.index.store(
+            "merge_requests",
+            [
+                merge_request(1, "merged", "2026-01-01T00:00:00.000Z"),
+                merge_request(2, "opened", "2026-01-03T00:00:00.000Z"),
+                merge_request(3, "opened", "2026-01-02T00:00:00.000Z"),
+            ],
+        )
+        self.index.store("issues", [merge_request(4, "opened", "2026-02-01T00:00:00.000Z")])
+        # Updated objects replace the stored ones
+        self.index.store("merge_requests", [merge_request(1, "merged", "2026-01-04T00:00:00.000Z")])
+
+        self.assertEqual(self.index.cursor("merge_requests"), "2026-01-04T00:00:00.000Z")
+        self.assertEqual(
+            [data["iid"] for data in self.index.query("merge_requests", ["opened"], None)], [2, 3]
+        )
+        self.assertEqual(
+            [data["iid"] for data in self.index.query("merge_requests", ["opened", "merged"], 2)],
+            [1, 2],
+        )
+
+        self.index.clear("merge_requests")
+        self.assertIsNone(self.index.cursor("merge_requests"))
+        self.assertEqual(len(self.index.query("issues", ["opened"], None)), 1)
+
+    def test_search(self):
+        issues = [
+            dict(
+                merge_request(1, "opened", "2026-01-03T00:00:00.000Z"),
+                title="Crash on startup",
+                labels=["bug"],
+            ),
+            dict(
+                merge_request(2, "closed", "2026-01-02T00:00:00.000Z"),
+                description="It used to crash shortly after startup",
+            ),
+            dict(
+                merge_request(3, "opened", "2026-01-01T00:00:00.000Z"),
+                title="Startup is slow",
+                labels=[{"name": "crash"}],
+            ),
+            merge_request(4, "opened", "2026-01-04T00:00:00.000Z"),
+        ]
+        self.index.store("issues", issues)
+
+        # Matches in the title rank highest
+        found = self.index.search("issues", "crash startup", ["opened", "closed"], None)
+        self.assertEqual([data["iid"] for data in found], [1, 3, 2])
+        found = self.index.search("issues", "crash startup", ["closed"], None)
+        self.assertEqual([data["iid"] for data in found], [2])
+        self.assertEqual(self.index.search("issues", 'bug" OR "', ["opened"], None), [])
+        with self.assertRaises(ValueError):
+            self.index.search("issues", " \t", ["opened"], None)
+
+        # Without FTS5, the same objects are found
+        self.index._LocalIndex__full_text = False
+        found = self.index.search("issues", "crash startup", ["opened", "closed"], 2)
+        self.assertEqual([data["iid"] for data in found], [1, 2])
+
+    def test_incremental_update(self):
+        merge_requests = [
+            merge_request(iid, "opened", f"2026-01-{iid:02}T00:00:00.000Z") for iid in range(1, 11)
+        ]
+        project = {"id": 1, "last_activity_at": "2026-01-10T00:00:00.000Z"}
+        queries = []
+
+        def handler(match, query, headers):
+            queries.append(query)
+            updated_after = query.get("updated_after", "")
+            return 200, {}, [item for item in merge_requests if item["updated_at"] > updated_after]
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/merge_requests", handler)
+            server.route(r"/api/v4/projects/1", lambda *args: (200, {}, project))
+            connection = Connection(server.url, private_token="t0k3n")
+
+            def update():
+                remote_project = connection.projects.get(1)
+                server.requests.clear()
+                return self.index.update(remote_project, "g/p", "merge_requests")
+
+            self.assertEqual(update(), 10)
+
+            # Nothing happened since, which the project's last activity shows
+            self.assertEqual(update(), 0)
+            self.assertEqual(server.requests, [])
+
+            merge_requests[0] = merge_request(1, "merged", "2026-01-11T00:00:00.000Z")
+            project["last_activity_at"] = "2026-01-11T00:00:00.000Z"
+            self.assertEqual(update(), 1)
+            self.assertEqual(queries[-1]["updated_after"], "2026-01-10T00:00:00.000Z")
+            self.assertEqual(
+                [data["iid"] for data in self.index.query("merge_requests", ["merged"], None)], [1]
+            )
+
+            # Activity within an hour of the last one might not have moved it
+            project["last_activity_at"] = time.strftime(
+                "%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(time.time() - 60)
+            )
+            self.index.finish_sync("merge_requests", "g/p", project["last_activity_at"])
+            self.assertEqual(update(), 0)
+            self.assertEqual(len(server.requests), 1)
+
+            # Another project clears the index
+            self.assertEqual(
+                self.index.update(connection.projects.get(1), "g/q", "merge_requests"), 10
+            )
+
+    def test_objects_updated_during_a_sync_are_synced_again(self):
+        # Updated while the first sync was running, after the pages before it were requested
+        during_sync = time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(time.time() + 1))
+        merge_requests = [
+            merge_request(1, "opened", "2026-01-01T00:00:00.000Z"),
+            merge_request(3, "opened", during_sync),
+        ]
+        project = {"id": 1, "last_activity_at": during_sync}
+        queries = []
+
+        def handler(match, query, headers):
+            queries.append(query)
+            return 200, {}, merge_requests
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/merge_requests", handler)
+            server.route(r"/api/v4/projects/1", lambda *args: (200, {}, project))
+            connection = Connection(server.url, private_token="t0k3n")
+
+            self.index.update(connection.projects.get(1), "g/p", "merge_requests")
+            project["last_activity_at"] = "2026-12-31T00:00:00.000Z"
+            self.index.update(connection.projects.get(1), "g/p", "merge_requests")
+
+        # Continues from before the first sync started, not from the newest object
+        self.assertLess(queries[-1]["updated_after"], during_sync[:16])
+
+    def test_one_background_sync_at_a_time(self):
+        with patch.object(localindex.subprocess, "Popen") as popen:
+            localindex.refresh_in_background(self.directory)
+            self.assertEqual(popen.call_count, 1)
+
+            with open(os.path.join(self.directory, "gitlab-sync.lock"), "ab") as lock:
+                # Held by the running sync
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                localindex.refresh_in_background(self.directory)
+            self.assertEqual(popen.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import itertools
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab.connection import Connection
+from lab.mergerequestlist import FetchStrategy, MergeRequestList, plan_fetch
+from mockgitlab import MockGitLab
+
+STATES = ("opened", "merged", "closed")
+
+
+def project_merge_requests(count):
+    generator = random.Random(1)
+    now = datetime(2026, 1, 1)
+    merge_requests = []
+    for iid in range(1, count + 1):
+        state = generator.choices(STATES, weights=(0.1, 0.75, 0.15))[0]
+        merge_requests.append(
+            {
+                "id": iid,
+                "iid": iid,
+                "title": f"Merge request {iid}",
+                "state": state,
+                "updated_at": (now - timedelta(seconds=generator.randrange(10**8))).strftime(
+                    "%Y-%m-%dT%H:%M:%S.000Z"
+                ),
+                "web_url": f"https://invent.kde.org/g/p/-/merge_requests/{iid}",
+                "references": {"full": f"g/p!{iid}"},
+                "description": "x" * 2000,
+            }
+        )
+    return merge_requests
+
+
+class MergeRequestListTest(unittest.TestCase):
+    def test_plan(self):
+        self.assertEqual(plan_fetch(["opened"], 20), FetchStrategy.PER_STATE)
+        self.assertEqual(plan_fetch(["opened", "closed"], 20), FetchStrategy.PER_STATE)
+        self.assertEqual(plan_fetch(["opened", "merged"], 20), FetchStrategy.ALL_STATES)
+        self.assertEqual(plan_fetch(list(STATES), 20), FetchStrategy.ALL_STATES)
+        self.assertEqual(plan_fetch(["opened", "merged"], None), FetchStrategy.PER_STATE)
+        self.assertEqual(plan_fetch(list(STATES), None), FetchStrategy.ALL_STATES)
+
+    def test_benchmark_strategies(self):
+        merge_requests = project_merge_requests(1000)
+
+        def handler(match, query, headers):
+            selected = [
+                merge_request
+                for merge_request in merge_requests
+                if query.get("state", "all") in ("all", merge_request["state"])
+            ]
+            selected.sort(key=lambda merge_request: merge_request["updated_at"], reverse=True)
+            return 200, {}, selected
+
+        with MockGitLab(latency=0.02) as server:
+            server.route(r"/api/v4/merge_requests", handler)
+            lister = MergeRequestList.__new__(MergeRequestList)
+            lister._connection = Connection(server.url, private_token="t0k3n")
+            lister.for_project = False
+
+            for count in (1, 2, 3):
+                for states in itertools.combinations(STATES, count):
+                    lister.opened, lister.merged, lister.closed = (
+                        state in states for state in STATES
+                    )
+
+                    results = {}
+                    for strategy in FetchStrategy:
+                        server.requests.clear()
+                        server.bytes_sent = 0
+                        fetched = list(lister.fetch(strategy))
+                        results[strategy] = (
+                            [merge_request.iid for merge_request in fetched],
+                            len(server.requests),
+                            server.bytes_sent,
+                        )
+
+                    planned = results[plan_fetch(states, lister.limit)]
+                    other = results[
+                        (
+                            FetchStrategy.PER_STATE
+                            if plan_fetch(states, lister.limit) == FetchStrategy.ALL_STATES
+                            else FetchStrategy.ALL_STATES
+                        )
+                    ]
+
+                    # Both strategies find the same merge requests in the same order
+                    self.assertEqual(len(planned[0]), lister.limit)
+                    self.assertEqual(planned[0], other[0])
+
+                    # The planned strategy is never worse in both requests and bytes
+                    self.assertTrue(planned[1] <= other[1] or planned[2] <= other[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
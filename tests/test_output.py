@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import csv
+import io
+import json
+import os
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import output, peek
+from lab.utils import LogType, Utils
+
+RECORDS = [
+    {"id": 1, "title": "First", "author": {"username": "alice"}, "labels": ["bug", "ui"]},
+    {"id": 2, "title": "Tab\tand, comma", "author": None, "labels": []},
+]
+FIELDS = ("id", "title", "author.username", "labels")
+
+
+def render(format_name, records=RECORDS):
+    output.set_format(format_name)
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        output.print_records(iter(records), FIELDS)
+    return stdout.getvalue()
+
+
+class OutputTest(unittest.TestCase):
+    def tearDown(self):
+        output.set_format("table")
+
+    def test_json(self):
+        self.assertEqual(json.loads(render("json")), RECORDS)
+        self.assertEqual(json.loads(render("json", [])), [])
+        self.assertEqual([json.loads(line) for line in render("jsonl").splitlines()], RECORDS)
+
+    def test_csv_and_tsv(self):
+        for format_name, delimiter in (("csv", ","), ("tsv", "\t")):
+            rows = list(csv.reader(io.StringIO(render(format_name)), delimiter=delimiter))
+            self.assertEqual(
+                rows,
+                [
+                    list(FIELDS),
+                    ["1", "First", "alice", '["bug", "ui"]'],
+                    ["2", "Tab\tand, comma", "", "[]"],
+                ],
+            )
+
+    def test_records_are_streamed(self):
+        printed = []
+
+        def records():
+            for record in RECORDS:
+                yield record
+                printed.append(stdout.getvalue())
+
+        output.set_format("jsonl")
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            output.print_records(records(), FIELDS)
+
+        # Each record was written before the next one was requested
+        self.assertEqual(len(printed[0].splitlines()), 1)
+
+    def test_messages_go_to_stderr(self):
+        output.set_format("csv")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            Utils.log(LogType.INFO, "Found http remote")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIn("Found http remote", stderr.getvalue())
+
+    def test_option_value_is_not_the_command(self):
+        args = peek(["--format", "json", "mrs", "--project"])
+        self.assertEqual((args.format, args.command), ("json", "mrs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import os
+import sys
+import time
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import pagination
+from lab.connection import Connection
+from lab.table import Table
+from mockgitlab import MockGitLab
+
+
+def pipelines(count):
+    return lambda match, query, headers: (
+        200,
+        {},
+        [{"id": i, "status": "success"} for i in range(count)],
+    )
+
+
+class PaginationTest(unittest.TestCase):
+    def test_time_to_first_row(self):
+        with MockGitLab(latency=0.05) as server:
+            server.route(r"/api/v4/projects/1/pipelines", pipelines(1000))
+            project = Connection(server.url).projects.get(1, lazy=True)
+
+            start = time.perf_counter()
+            items = pagination.prefetch(pagination.lazy_list(project.pipelines, None), 100)
+            first = next(items)
+            first_row = time.perf_counter() - start
+            ids = [first.id] + [pipeline.id for pipeline in items]
+
+            self.assertEqual(ids, list(range(1000)))
+            self.assertEqual(len(server.requests), 10)
+            # Only the first page is waited for before the first row
+            self.assertLess(first_row, 0.05 * 3)
+
+    def test_limit_requests_only_needed_pages(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/pipelines", pipelines(1000))
+            project = Connection(server.url).projects.get(1, lazy=True)
+
+            items = list(pagination.prefetch(pagination.lazy_list(project.pipelines, 20), 20))
+            self.assertEqual(len(items), 20)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_limit_must_be_positive(self):
+        parser = argparse.ArgumentParser()
+        pagination.add_arguments(parser)
+        self.assertEqual(parser.parse_args(["--limit", "5"]).limit, 5)
+        self.assertIsNone(parser.parse_args(["--all"]).limit)
+        for value in ("0", "-1", "many"):
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                parser.parse_args(["--limit", value])
+
+    def test_errors_are_raised_by_the_consumer(self):
+        def failing():
+            yield 1
+            raise ValueError("page 2 failed")
+
+        items = pagination.prefetch(failing(), 10)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(ValueError):
+            next(items)
+
+    def test_print_stream(self):
+        rows = [["#1", "master"], ["#2", "work/feature"], ["#3", "a-very-long-branch-name"]]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Table().print_stream(iter(rows), 2)
+
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                "#1  master        ",
+                "#2  work/feature  ",
+                "#3  a-very-long-branch-name  ",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
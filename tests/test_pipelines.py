@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+
+import datetime
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import git
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import pipelines as pipelines_module
+from lab import session as session_module
+from lab.config import SessionSettings
+from lab.connection import Connection
+from lab.httpcache import ResponseCache
+from lab.pipelines import JobLog, PipelineList, PipelineShow
+from lab.pipelinestatistics import percentiles
+from lab.session import session
+from lab.watch import Backoff, LiveLines
+from mockgitlab import MockGitLab
+
+
+class TerminalOutput(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class WatchTest(unittest.TestCase):
+    def test_backoff(self):
+        backoff = Backoff(minimum=2, maximum=5, factor=2)
+        self.assertEqual([backoff.next(False) for _ in range(3)], [4, 5, 5])
+        self.assertEqual(backoff.next(True), 2)
+
+    def test_only_changed_lines_are_written(self):
+        stream = TerminalOutput()
+        display = LiveLines(stream)
+        display.update(["#1 running", "#2 pending"])
+        stream.seek(0)
+        stream.truncate()
+
+        display.update(["#1 success", "#2 pending"])
+        self.assertEqual(stream.getvalue(), "\x1b[2F\x1b[2K#1 success\n\x1b[1E")
+
+    def test_unchanged_lines_are_not_repeated_without_terminal(self):
+        stream = io.StringIO()
+        display = LiveLines(stream)
+        for lines in (["a"], ["a"], ["b"]):
+            display.update(lines)
+        self.assertEqual(stream.getvalue(), "a\nb\n")
+
+
+class PipelineWatchTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for patcher in (
+            patch.object(session_module, "_sessions", {}),
+            patch.object(session_module, "ResponseCache", lambda: ResponseCache(directory.name)),
+            patch.object(pipelines_module.time, "sleep", lambda seconds: None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def watch(self, statuses):
+        polls = []
+
+        def pipeline(match, query, headers):
+            status = statuses[min(len(polls), len(statuses) - 1)]
+            polls.append(headers.get("If-None-Match"))
+            etag = f'W/"{status}"'
+            if headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            return (
+                200,
+                {"ETag": etag},
+                {
+                    "id": 5,
+                    "ref": "master",
+                    "status": status,
+                    "user": {"name": "Alice", "username": "alice"},
+                    "created_at": "2026-01-01T00:00:00.000Z",
+                    "duration": 60,
+                },
+            )
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/pipelines/5", pipeline)
+            connection = Connection(
+                server.url,
+                private_token="t0k3n",
+                session=session(server.url, SessionSettings()),
+            )
+            show = PipelineShow.__new__(PipelineShow)
+            show.pipeline = connection.projects.get(1, lazy=True).pipelines.get(5)
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                status = show.watch()
+
+        return status, polls, output.getvalue()
+
+    def test_watch_until_finished(self):
+        status, polls, output = self.watch(["running", "running", "running", "success"])
+
+        self.assertEqual(status, 0)
+        self.assertEqual(len(polls), 4)
+        # Unchanged responses were revalidated
+        self.assertEqual(polls[2], 'W/"running"')
+        self.assertEqual(output.count("is currently"), 1)
+        self.assertIn("with status: \x1b[0;32msuccess", output)
+
+    def test_failed_pipeline_exits_with_error(self):
+        status, _, _ = self.watch(["created", "preparing", "failed"])
+        self.assertEqual(status, 1)
+
+
+def jobs(pipeline_id, count):
+    stages = ("build", "test", "deploy")
+    return [
+        {
+            "id": pipeline_id * 1000 + i,
+            "name": f"job-{i:03}",
+            "stage": stages[i * len(stages) // count],
+            "status": "failed" if i == 7 else "success",
+            "duration": 65.2,
+            "runner": {"description": f"runner-{i % 2}"},
+            "pipeline": {"id": pipeline_id},
+        }
+        for i in range(count)
+    ]
+
+
+def bridges(pipeline_id, children):
+    return [
+        {
+            "id": pipeline_id * 1000 + 999,
+            "name": f"trigger-{child}",
+            "stage": "deploy",
+            "status": "success",
+            "duration": None,
+            "downstream_pipeline": {"id": child, "project_id": 1},
+        }
+        for child in children
+    ]
+
+
+class PipelineJobsTest(unittest.TestCase):
+    def test_jobs_of_downstream_pipelines_are_requested_concurrently(self):
+        tree = {5: (300, [6, 7]), 6: (120, [8]), 7: (50, []), 8: (10, [])}
+
+        with MockGitLab(latency=0.05) as server:
+            server.route(
+                r"/api/v4/projects/1/pipelines/(\d+)/jobs",
+                lambda match, query, headers: (
+                    200,
+                    {},
+                    jobs(int(match[1]), tree[int(match[1])][0]),
+                ),
+            )
+            server.route(
+                r"/api/v4/projects/1/pipelines/(\d+)/bridges",
+                lambda match, query, headers: (
+                    200,
+                    {},
+                    bridges(int(match[1]), tree[int(match[1])][1]),
+                ),
+            )
+            show = PipelineShow.__new__(PipelineShow)
+            show._connection = Connection(server.url, private_token="t0k3n")
+            show.pipeline = show._connection.projects.get(1, lazy=True).pipelines.get(5, lazy=True)
+
+            start = time.perf_counter()
+            sections = show._PipelineShow__job_sections()
+            duration = time.perf_counter() - start
+
+        self.assertEqual(
+            [(title, len(section_jobs)) for title, section_jobs in sections],
+            [
+                ("", 302),
+                ("Downstream pipeline #6 of trigger-6", 121),
+                ("Downstream pipeline #7 of trigger-7", 50),
+                ("Downstream pipeline #8 of trigger-8", 10),
+            ],
+        )
+        # 11 requests, one after another they would take 0.55 s,
+        # concurrently five round trips: two for each of the first two levels, one for the last
+        self.assertEqual(len(server.requests), 11)
+        self.assertLess(duration, 0.45)
+
+        rows = list(PipelineShow._PipelineShow__job_rows(sections[0][1]))
+        self.assertEqual(
+            [row[0] for row in rows if row[0]],
+            [
+                "\x1b[1mbuild\x1b[0m",
+                "\x1b[1mtest\x1b[0m",
+                "\x1b[1mdeploy\x1b[0m",
+            ],
+        )
+        self.assertEqual(rows[7][1:], ["job-007", "\x1b[0;31mfailed\x1b[0m", "1m 5s", "runner-1"])
+        self.assertEqual(rows[-1][1:4], ["trigger-7", "\x1b[0;32msuccess\x1b[0m", ""])
+        self.assertEqual(rows[-1][4], "pipeline #7")
+
+    def test_requests_are_bounded_by_one_pool(self):
+        children = list(range(10, 22))
+        tree = {5: (10, children), **{child: (250, []) for child in children}}
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def respond(items):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return 200, {}, items
+
+        with MockGitLab() as server:
+            server.route(
+                r"/api/v4/projects/1/pipelines/(\d+)/jobs",
+                lambda match, query, headers: respond(jobs(int(match[1]), tree[int(match[1])][0])),
+            )
+            server.route(
+                r"/api/v4/projects/1/pipelines/(\d+)/bridges",
+                lambda match, query, headers: respond(
+                    bridges(int(match[1]), tree[int(match[1])][1])
+                ),
+            )
+            show = PipelineShow.__new__(PipelineShow)
+            show._connection = Connection(server.url, private_token="t0k3n")
+            show.pipeline = show._connection.projects.get(1, lazy=True).pipelines.get(5, lazy=True)
+
+            sections = show._PipelineShow__job_sections()
+
+        self.assertEqual([len(section_jobs) for _, section_jobs in sections[1:]], [250] * 12)
+        self.assertEqual(len(server.requests), 2 + 12 * 4)
+        self.assertLessEqual(in_flight[1], pipelines_module.pagination.MAX_CONCURRENT_PAGES)
+
+
+class JobLogTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(pipelines_module.time, "sleep", lambda seconds: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def follow(self, parts, statuses, ranges=True):
+        polls = []
+        ranges_requested = []
+
+        def job(match, query, headers):
+            polls.append(None)
+            return 200, {}, {"id": 9, "status": statuses[min(len(polls), len(statuses)) - 1]}
+
+        def trace(match, query, headers):
+            log = b"".join(parts[: len(polls)])
+            start = int(headers["Range"][len("bytes=") : -1])
+            ranges_requested.append(start)
+            if not ranges:
+                return 200, {}, log
+            if start >= len(log):
+                return 416, {}, b""
+            return 206, {"Content-Range": f"bytes {start}-{len(log) - 1}/*"}, log[start:]
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/jobs/9", job)
+            server.route(r"/api/v4/projects/1/jobs/9/trace", trace)
+            log = JobLog.__new__(JobLog)
+            log._connection = Connection(server.url, private_token="t0k3n")
+            log.job = log._connection.projects.get(1, lazy=True).jobs.get(9)
+
+            stream = io.BytesIO()
+            status = log.follow(stream)
+            bytes_sent = server.bytes_sent
+
+        return status, stream.getvalue(), ranges_requested, bytes_sent
+
+    def test_only_new_bytes_are_requested(self):
+        parts = [
+            b"Running with gitlab-runner\n" * 1000,
+            b"",
+            b"$ make\n" * 1000,
+            b"Job succeeded\n",
+        ]
+        status, log, ranges, bytes_sent = self.follow(
+            parts, ["running", "running", "running", "success"]
+        )
+
+        self.assertEqual(status, 0)
+        self.assertEqual(log, b"".join(parts))
+        self.assertEqual(ranges, [0, 27000, 27000, 34000])
+        # The log was transferred once, besides the small job responses
+        self.assertLess(bytes_sent, len(log) + 1000)
+
+    def test_whole_log_is_skipped_without_range_support(self):
+        parts = [b"first\n", b"second\n", b"Job failed\n"]
+        status, log, _, _ = self.follow(parts, ["running", "running", "failed"], ranges=False)
+
+        self.assertEqual(status, 1)
+        self.assertEqual(log, b"".join(parts))
+
+
+def history(count):
+    statuses = ("success", "success", "success", "failed", "running")
+    return [
+        {
+            "id": count - i,
+            "ref": "master" if i % 4 else "work/feature",
+            "status": statuses[i % len(statuses)],
+            "created_at": f"2026-10-{10 - i * 5 // count:02}T12:00:00.000Z",
+            "updated_at": f"2026-10-{10 - i * 5 // count:02}T12:{i % 60:02}:00.000Z",
+        }
+        for i in range(count)
+    ]
+
+
+def job_history(count):
+    jobs = []
+    for i in range(count):
+        duration = (600.0, 300.0, 30.0)[i % 3] + i % 7
+        day = f"2026-10-{10 - (i - i % 3) * 10 // count:02}"
+        # The jobs of a pipeline run one after another
+        start = (i % 3) * 10
+        jobs.append(
+            {
+                "id": count - i,
+                "name": ("build", "test", "lint")[i % 3],
+                "ref": "master",
+                "duration": duration,
+                "pipeline": {"id": count - i // 3},
+                "created_at": f"{day}T12:00:00.000Z",
+                "started_at": f"{day}T12:{start:02}:00.000Z",
+                "finished_at": f"{day}T12:{start + int(duration) // 60:02}:00.000Z",
+            }
+        )
+    return jobs
+
+
+class PipelineStatisticsTest(unittest.TestCase):
+    def test_percentiles(self):
+        self.assertEqual(percentiles(range(1, 101)), [50, 90, 99])
+        self.assertEqual(percentiles([7.0]), [7.0, 7.0, 7.0])
+        self.assertEqual(percentiles([]), [0.0, 0.0, 0.0])
+
+    def test_history_is_aggregated(self):
+        queries = []
+
+        def jobs_page(match, query, headers):
+            queries.append(query)
+            return 200, {}, job_history(2000)
+
+        with MockGitLab() as server:
+            server.route(
+                r"/api/v4/projects/1/pipelines",
+                lambda match, query, headers: (queries.append(query) or 200, {}, history(2000)),
+            )
+            server.route(r"/api/v4/projects/1/jobs", jobs_page)
+            lister = PipelineList.__new__(PipelineList)
+            lister.status, lister.ref, lister.limit = None, None, 20
+            lister._remote_project = Connection(server.url, private_token="t0k3n").projects.get(
+                1, lazy=True
+            )
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                lister.print_statistics(datetime.date(2026, 10, 6))
+
+        lines = stdout.getvalue().splitlines()
+        self.assertIn("1600 pipelines", lines[0])
+        # From the start of the first job to the end of the last one, not until the last update
+        self.assertEqual(
+            lines[1].split(),
+            ["Duration", "p50", "20m", "0s", "p90", "20m", "0s", "p99", "20m", "0s"],
+        )
+        self.assertEqual(lines[4].split()[:4], ["master", "1200", "75%", "25%"])
+        self.assertTrue(lines[-3].startswith("build"))
+        pipeline_queries = [query for query in queries if "updated_after" in query]
+        self.assertEqual(len(pipeline_queries), 20)
+        self.assertEqual(pipeline_queries[0]["updated_after"], "2026-10-06T00:00:00+00:00")
+        # Of 20 pages of jobs, 10 are in the time span, one more ends it and one is prefetched
+        job_queries = [query for query in queries if "scope[]" in query]
+        self.assertLessEqual(len(job_queries), 12)
+
+
+class PipelineBranchesTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.repo = git.Repo.init(directory.name, initial_branch="master")
+        with self.repo.config_writer() as config:
+            config.set_value("user", "name", "Alice")
+            config.set_value("user", "email", "alice@example.org")
+        self.commits = {}
+        for branch in ("old", "feature", "master"):
+            self.repo.git.checkout("-B", branch)
+            self.repo.git.commit("--allow-empty", "-m", branch, "--date", "2026-01-01")
+            self.commits[branch] = self.repo.head.commit.hexsha
+
+    def test_latest_pipeline_of_each_branch(self):
+        queries = []
+
+        def pipeline(pipeline_id, ref, sha):
+            return {
+                "id": pipeline_id,
+                "ref": ref,
+                "sha": sha,
+                "status": "success" if ref != "feature" else "failed",
+                "created_at": "2026-01-01T00:00:00.000Z",
+            }
+
+        def pipelines(match, query, headers):
+            queries.append(query)
+            if query.get("ref") == "old":
+                return 200, {}, [pipeline(1, "old", self.commits["old"])]
+            if "ref" in query:
+                return 200, {}, []
+            return (
+                200,
+                {},
+                [
+                    pipeline(12, "master", self.commits["master"]),
+                    pipeline(11, "feature", "0" * 40),
+                    pipeline(10, "master", "1" * 40),
+                ],
+            )
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects/1/pipelines", pipelines)
+            lister = PipelineList.__new__(PipelineList)
+            lister._local_repo = self.repo
+            lister._remote_project = Connection(server.url, private_token="t0k3n").projects.get(
+                1, lazy=True
+            )
+            lister.limit = None
+            self.repo.git.branch("unbuilt", "master")
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                lister.print_branches(False)
+            requests = len(queries)
+
+            # The most recently changed branches
+            lister.limit = 2
+            limited = io.StringIO()
+            with redirect_stdout(limited):
+                lister.print_branches(False)
+
+        rows = {line.split()[0]: line.split()[1:] for line in stdout.getvalue().splitlines()}
+        self.assertEqual(rows["master"][:2], ["\x1b[1m#12\x1b[0m", "\x1b[0;32msuccess\x1b[0m"])
+        self.assertEqual(rows["feature"][-4:], ["for", "an", "older", "commit"])
+        self.assertEqual(rows["old"][0], "\x1b[1m#1\x1b[0m")
+        self.assertEqual(rows["unbuilt"], ["no", "pipeline"])
+        # One list of recent pipelines, then one request for each branch that wasn't in it
+        self.assertEqual(requests, 3)
+        self.assertEqual({query.get("ref") for query in queries[1:3]}, {"old", "unbuilt"})
+        self.assertEqual(len(limited.getvalue().splitlines()), 2)
+
+    def test_latest_pipeline_of_each_merge_request(self):
+        # Two forks with a branch called master, the target project has one as well
+        merge_requests = [
+            {"iid": 7, "source_branch": "master", "sha": "7" * 40, "source_project_id": 2},
+            {"iid": 5, "source_branch": "master", "sha": "5" * 40, "source_project_id": 3},
+            {"iid": 3, "source_branch": "feature", "sha": "3" * 40, "source_project_id": 1},
+        ]
+        pipelines = {
+            "7": [
+                {
+                    "id": 70,
+                    "sha": "7" * 40,
+                    "status": "success",
+                    "created_at": "2026-01-01T00:00:00.000Z",
+                }
+            ],
+            "5": [
+                {
+                    "id": 50,
+                    "sha": "0" * 40,
+                    "status": "failed",
+                    "created_at": "2026-01-01T00:00:00.000Z",
+                }
+            ],
+            "3": [],
+        }
+
+        with MockGitLab() as server:
+            server.route(
+                r"/api/v4/projects/1/merge_requests/(\d+)/pipelines",
+                lambda match, query, headers: (200, {}, pipelines[match[1]]),
+            )
+            server.route(r"/api/v4/projects/1/merge_requests", lambda *_: (200, {}, merge_requests))
+            lister = PipelineList.__new__(PipelineList)
+            lister._remote_project = Connection(server.url, private_token="t0k3n").projects.get(
+                1, lazy=True
+            )
+            lister.limit = 20
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                lister.print_branches(True)
+
+        rows = [line.split() for line in stdout.getvalue().splitlines()]
+        self.assertEqual(
+            [row[:2] for row in rows], [["!7", "master"], ["!5", "master"], ["!3", "feature"]]
+        )
+        self.assertEqual(rows[0][2], "\x1b[1m#70\x1b[0m")
+        self.assertEqual(rows[1][-4:], ["for", "an", "older", "commit"])
+        self.assertEqual(rows[2][2:], ["no", "pipeline"])
+        # Nothing is looked up by the name of the branch in the target project
+        self.assertFalse(
+            any(
+                "/pipelines" in path and "merge_requests" not in path
+                for _, path, _ in server.requests
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import projectcatalog
+from lab.connection import Connection
+from lab.output import set_format
+from lab.projectcatalog import ProjectCatalog
+from lab.search import Search
+from mockgitlab import MockGitLab
+
+
+def projects(name):
+    def handler(match, query, headers):
+        if headers.get("PRIVATE-TOKEN") != "t0k3n":
+            return 401, {}, {"message": "401 Unauthorized"}
+        return (
+            200,
+            {},
+            [
+                {
+                    "id": 1,
+                    "path_with_namespace": name,
+                    "description": None,
+                    "ssh_url_to_repo": f"git@example.org:{name}.git",
+                }
+            ],
+        )
+
+    return handler
+
+
+class SearchTest(unittest.TestCase):
+    def test_instances_are_searched_concurrently(self):
+        slow, fast, broken = MockGitLab(latency=0.3), MockGitLab(latency=0.3), MockGitLab()
+        with slow, fast, broken:
+            slow.route(r"/api/v4/projects", projects("slow/project"))
+            fast.route(r"/api/v4/projects", projects("fast/project"))
+            broken.route(r"/api/v4/projects", projects("broken/project"))
+
+            # Skip AllInstancesConnection.__init__, it reads the config
+            search = Search.__new__(Search)
+            search._connections = [
+                Connection(slow.url, private_token="t0k3n"),
+                Connection(fast.url, private_token="t0k3n"),
+                Connection(broken.url, private_token="wrong"),
+            ]
+
+            output = io.StringIO()
+            start = time.perf_counter()
+            with redirect_stdout(output):
+                search.search_projects("project", refresh=True)
+            duration = time.perf_counter() - start
+
+        # Both slow instances were waited for at the same time
+        self.assertLess(duration, 0.55)
+        self.assertIn("slow/project", output.getvalue())
+        self.assertIn("fast/project", output.getvalue())
+        self.assertIn(f"Could not log into GitLab: {broken.url}", output.getvalue())
+        self.assertNotIn("broken/project", output.getvalue())
+
+
+def catalog_project(project_id, path, last_activity_at):
+    return {
+        "id": project_id,
+        "path_with_namespace": path,
+        "description": f"Description of {path}",
+        "ssh_url_to_repo": f"git@example.org:{path}.git",
+        "last_activity_at": last_activity_at,
+    }
+
+
+class ProjectCatalogTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path_for = ProjectCatalog.path_for
+        patcher = patch.object(
+            ProjectCatalog,
+            "path_for",
+            lambda url, token: path_for(url, token, directory.name),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fuzzy_search(self):
+        catalog = ProjectCatalog(ProjectCatalog.path_for("https://example.org", "t0k3n"))
+        catalog.update(
+            catalog_project(project_id, path, "2026-01-01T00:00:00Z")
+            for project_id, path in enumerate(
+                ("network/kaidan", "sdk/git-lab", "plasma/kwin", "utilities/kate", "kaidan/www")
+            )
+        )
+
+        def search(query):
+            return [entry.path_with_namespace for entry in catalog.search(query, None)]
+
+        self.assertEqual(search("kaid"), ["kaidan/www", "network/kaidan"])
+        self.assertEqual(search("kaidna"), ["kaidan/www", "network/kaidan"])
+        self.assertEqual(search("GIT-LAB"), ["sdk/git-lab"])
+        self.assertEqual(search("kw"), ["plasma/kwin"])
+        self.assertEqual(search("xyz"), [])
+
+        # Stored on disk
+        self.assertEqual(len(ProjectCatalog(catalog.path)), 5)
+
+    def test_catalog_is_updated_incrementally(self):
+        projects = [
+            catalog_project(project_id, f"group/project-{project_id}", "2026-01-01T00:00:00Z")
+            for project_id in range(150)
+        ]
+        queries = []
+
+        def handler(match, query, headers):
+            queries.append(query)
+            after = query.get("last_activity_after", "")
+            return 200, {}, [project for project in projects if project["last_activity_at"] > after]
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects", handler)
+            search = Search.__new__(Search)
+            search._connections = [Connection(server.url, private_token="t0k3n")]
+
+            def run(query, refresh=False):
+                output = io.StringIO()
+                server.requests.clear()
+                with redirect_stdout(output):
+                    search.search_projects(query, refresh=refresh)
+                return output.getvalue()
+
+            self.assertIn("group/project-42", run("project-42"))
+            self.assertEqual(len(server.requests), 2)
+
+            # Answered from disk
+            self.assertIn("group/project-142", run("project-142"))
+            self.assertEqual(server.requests, [])
+
+            # Records contain the same attributes as without the catalog
+            set_format("jsonl")
+            self.addCleanup(set_format, "table")
+            records = [json.loads(line) for line in run("project-142").splitlines()]
+            self.assertIn("id", records[0])
+            self.assertIn("last_activity_at", records[0])
+            self.assertEqual(len(server.requests), 1)
+            set_format("table")
+
+            projects.append(catalog_project(150, "group/renamed", "2026-01-02T00:00:00Z"))
+            with patch.object(projectcatalog, "MAX_AGE", -1):
+                self.assertIn("group/renamed", run("renamed"))
+            self.assertEqual(queries[-1]["last_activity_after"], "2026-01-01T00:00:00Z")
+            self.assertEqual(len(server.requests), 1)
+
+            run("renamed", refresh=True)
+            self.assertEqual(queries[-1]["search"], "renamed")
+
+            # Offline, the catalog is still used
+            server.route(r"/api/v4/projects", lambda *args: (500, {}, {"message": "500"}))
+            server.routes.reverse()
+            with patch.object(projectcatalog, "MAX_AGE", -1):
+                output = run("project-7")
+            self.assertIn("Could not update the list of projects", output)
+            self.assertIn("group/project-7", output)
+
+    def test_catalog_of_large_instance(self):
+        projects = [
+            catalog_project(project_id, f"group/project-{project_id}", "2026-01-01T00:00:00Z")
+            for project_id in range(1, 251)
+        ]
+        queries = []
+
+        def keyset(match, query, headers):
+            # Like GitLab with keyset pagination: a link to the next page, but no total
+            queries.append(query)
+            after = int(query.get("id_after", 0))
+            page = [project for project in projects if project["id"] > after][:100]
+            response_headers = {"Content-Type": "application/json"}
+            if page[-1] is not projects[-1]:
+                next_query = dict(query, id_after=str(page[-1]["id"]))
+                response_headers["Link"] = '<{}/api/v4/projects?{}>; rel="next"'.format(
+                    server.url, "&".join(f"{key}={value}" for key, value in next_query.items())
+                )
+            return 200, response_headers, json.dumps(page).encode()
+
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects", keyset)
+            search = Search.__new__(Search)
+            search._connections = [Connection(server.url, private_token="t0k3n")]
+
+            for _ in range(2):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    search.search_projects("project-250")
+                self.assertIn("group/project-250", output.getvalue())
+
+        # Three pages for the catalog, the second search is answered from it
+        self.assertEqual(len(queries), 3)
+        self.assertTrue(all(query["pagination"] == "keyset" for query in queries))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import session as session_module
+from lab.config import SessionSettings
+from lab.connection import Connection
+from lab.session import session
+from mockgitlab import MockGitLab
+
+
+def run_commands(server, connections):
+    """
+    Makes the requests of a command that uses several connections to the same instance,
+    like creating a merge request does
+    """
+    start = time.perf_counter()
+    for connection in connections:
+        for _ in range(5):
+            connection.projects.list(get_all=False)
+    return time.perf_counter() - start, len(server.requests), server.connections
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(session_module, "_sessions", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_session_per_instance(self):
+        settings = SessionSettings()
+        self.assertIs(
+            session("https://invent.kde.org", settings),
+            session("https://invent.kde.org/api/v4", settings),
+        )
+        self.assertIsNot(
+            session("https://invent.kde.org", settings), session("https://gitlab.com", settings)
+        )
+        self.assertIsNot(
+            session("https://invent.kde.org", settings),
+            session("https://invent.kde.org", settings._replace(pool_size=2)),
+        )
+
+    def test_compression(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/projects", lambda *args: (200, {}, []))
+
+            for compression, encoding in ((True, "gzip"), (False, "identity")):
+                settings = SessionSettings(compression=compression)
+                Connection(server.url, session=session(server.url, settings)).projects.list()
+                self.assertIn(encoding, server.requests[-1][2]["Accept-Encoding"])
+
+    def test_benchmark_connection_reuse(self):
+        results = {}
+        for name in ("separate", "shared"):
+            with MockGitLab(latency=0.005) as server:
+                server.route(r"/api/v4/projects", lambda *args: (200, {}, [{"id": 1}]))
+                settings = SessionSettings()
+
+                if name == "shared":
+                    connections = [
+                        Connection(server.url, session=session(server.url, settings), timeout=5)
+                        for _ in range(2)
+                    ]
+                else:
+                    connections = [Connection(server.url, timeout=5) for _ in range(2)]
+
+                results[name] = run_commands(server, connections)
+
+        self.assertEqual(results["separate"][1], results["shared"][1])
+        self.assertEqual(results["separate"][2], 2)
+        self.assertEqual(results["shared"][2], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict
+from unittest.mock import patch
+
+ROOT: str = os.path.dirname(os.path.abspath(__file__)) + "/../"
+sys.path.append(ROOT)
+
+import git
+
+from lab import COMMANDS, Parser, find_command
+from lab.utils import _default_branch
+
+# Modules that are expensive to import and must only be loaded by the commands using them
+HEAVY_MODULES = ("gitlab", "git", "requests")
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """
+    Runs code in a new interpreter and returns the cumulative import time
+    in microseconds of every top-level package it imported, as reported by -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:") :].split("|")
+        package: str = name.strip().split(".")[0]
+        times[package] = max(times.get(package, 0), int(cumulative))
+
+    return times
+
+
+class StartupTest(unittest.TestCase):
+    def test_parser_construction_imports_nothing_heavy(self):
+        times = import_times("import lab; lab.Parser()")
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_only_selected_command_is_imported(self):
+        for argv in (["workflow", "--fork"], ["login", "--host", "h", "--token", "t"]):
+            times = import_times(f"import lab; lab.Parser().parser.parse_args({argv})")
+
+            for module in HEAVY_MODULES:
+                self.assertNotIn(module, times)
+
+        times = import_times("import lab; lab.Parser().parser.parse_args(['mrs'])")
+        self.assertIn("gitlab", times)
+
+    def test_registry_matches_command_parsers(self):
+        for command in COMMANDS:
+            subparsers = argparse.ArgumentParser().add_subparsers()
+            importlib.import_module("lab." + command.module).parser(subparsers)
+
+            self.assertEqual(subparsers._choices_actions[0].help, command.help)
+            self.assertEqual(set(subparsers._name_parser_map), {command.name, *command.aliases})
+
+    def test_long_running_options_exist(self):
+        for command in COMMANDS:
+            subparsers = argparse.ArgumentParser().add_subparsers()
+            parser = importlib.import_module("lab." + command.module).parser(subparsers)
+            for option in command.long_running:
+                self.assertIn(option, parser._option_string_actions)
+
+    def test_long_running_options_are_found(self):
+        pipelines = find_command(["pipelines"])
+        for argv in (
+            ["pipelines", "--watch"],
+            ["pipelines", "5", "--wat"],
+            ["--format", "json", "pipelines", "--log=12"],
+            ["pipelines", "5", "--artifacts=build", "--cat", "a"],
+        ):
+            self.assertTrue(pipelines.keeps_running(argv), argv)
+
+        for argv in (
+            ["pipelines"],
+            ["pipelines", "--ref", "work/watch"],
+            ["pipelines", "--", "--watch"],
+        ):
+            self.assertFalse(pipelines.keeps_running(argv), argv)
+
+
+class DeferredDefaultTest(unittest.TestCase):
+    def setUp(self):
+        _default_branch.cache_clear()
+
+    def test_no_repository_for_commands_without_repository(self):
+        commands = (
+            ["login", "--host", "invent.kde.org", "--token", "t0k3n"],
+            ["workflow", "--fork"],
+            ["search", "kaidan"],
+            ["pipelines"],
+        )
+        with patch("git.Repo", wraps=git.Repo) as repo:
+            for argv in commands:
+                args = Parser().parse_args(argv)
+                Parser.resolve_defaults(args)
+
+            self.assertEqual(repo.call_count, 0)
+
+    def test_defaults_only_resolved_when_running(self):
+        with patch("git.Repo", wraps=git.Repo) as repo:
+            mr_args = Parser().parse_args(["mr"])
+            feature_args = Parser().parse_args(["feature", "new-branch"])
+            self.assertEqual(repo.call_count, 0)
+
+            Parser.resolve_defaults(mr_args)
+            Parser.resolve_defaults(feature_args)
+
+            # The default branch is shared between both commands
+            self.assertEqual(repo.call_count, 1)
+            self.assertEqual(feature_args.start, "origin/" + mr_args.target_branch)
+
+
+if __name__ == "__main__":
+    unittest.main()
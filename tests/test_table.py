@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import time
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab.table import Table, display_width
+from lab.utils import TextFormatting
+
+
+class TableTest(unittest.TestCase):
+    def test_alignment(self):
+        table = Table()
+        table.add_row(["g/p!1", "Short", "opened"])
+        table.add_row(["g/p!100", "A longer title"])
+        table.add_row(["g/p!12", "Title", "merged", "extra"])
+
+        self.assertEqual(
+            list(table.lines()),
+            [
+                "g/p!1    Short           opened         ",
+                "g/p!100  A longer title                 ",
+                "g/p!12   Title           merged  extra  ",
+            ],
+        )
+
+    def test_add_column(self):
+        table = Table()
+        table.add_column(["a", "bb"])
+        table.add_column(["ccc"])
+        table.add_row(["d", "e"])
+
+        self.assertEqual(list(table.lines()), ["a   ccc  ", "bb       ", "d   e    "])
+
+    def test_instances_are_independent(self):
+        Table().add_row(["a"])
+        self.assertEqual(list(Table().lines()), [])
+
+    def test_display_width(self):
+        self.assertEqual(display_width("g/p!1"), 5)
+        self.assertEqual(display_width(TextFormatting.BOLD + "g/p!1" + TextFormatting.END), 5)
+        self.assertEqual(display_width("日本語"), 6)
+        self.assertEqual(display_width("e\u0301"), 1)
+        self.assertEqual(display_width("👍🏽 👨‍👩‍👧"), 5)
+
+    def test_colored_and_wide_cells_are_aligned(self):
+        table = Table()
+        table.add_row([TextFormatting.BOLD + "g/p!1" + TextFormatting.END, "修复崩溃", "merged"])
+        table.add_row(["g/p!10", "Fix crash", TextFormatting.RED + "closed" + TextFormatting.END])
+
+        lines = list(table.lines())
+        self.assertEqual(len({display_width(line) for line in lines}), 1)
+        self.assertEqual([display_width(line.split("  ")[0]) for line in lines], [5, 6])
+
+    def test_benchmark_50k_colored_rows(self):
+        states = [
+            TextFormatting.GREEN + "merged" + TextFormatting.END,
+            "opened",
+            TextFormatting.RED + "closed" + TextFormatting.END,
+        ]
+        rows = [
+            [
+                TextFormatting.BOLD + f"g/p!{i}" + TextFormatting.END,
+                f"修复 {i} 号崩溃" if i % 10 == 0 else f"Fix crash number {i}",
+                states[i % 3],
+            ]
+            for i in range(50000)
+        ]
+
+        start = time.perf_counter()
+        table = Table()
+        for row in rows:
+            table.add_row(row)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            table.print()
+        duration = time.perf_counter() - start
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len({display_width(line) for line in lines}), 1)
+        self.assertLess(duration, 5)
+
+    def test_benchmark_100k_rows(self):
+        rows = [
+            [f"g/p!{i}", f"Merge request number {i}" + "x" * (i % 50), "merged"]
+            for i in range(100000)
+        ]
+
+        start = time.perf_counter()
+        table = Table()
+        for row in rows:
+            table.add_row(row)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            table.print()
+        duration = time.perf_counter() - start
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 100000)
+        self.assertEqual(len({len(line) for line in lines}), 1)
+        # Quadratic insertion took minutes
+        self.assertLess(duration, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
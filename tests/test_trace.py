@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../")
+
+from lab import trace
+from mockgitlab import MockGitLab
+
+
+class TraceTest(unittest.TestCase):
+    def tearDown(self):
+        trace._tracer = None
+
+    def test_nested_phases(self):
+        trace.enable("json")
+        with trace.phase("run"):
+            with trace.phase("push"):
+                subprocess.run(["git", "--version"], capture_output=True, check=True)
+            subprocess.run([sys.executable, "--version"], capture_output=True, check=True)
+
+        with patch("sys.stderr", new=StringIO()) as stderr:
+            trace.report()
+
+        result = json.loads(stderr.getvalue())
+        phases = {phase["name"]: phase for phase in result["phases"]}
+        # The git process is only counted in the innermost phase
+        self.assertEqual(phases["push"]["git"], 1)
+        self.assertEqual(phases["run"]["git"], 0)
+        self.assertEqual(result["total"]["git"], 1)
+        self.assertAlmostEqual(
+            result["total"]["seconds"], sum(phase["seconds"] for phase in phases.values()), places=5
+        )
+        self.assertIsNone(trace._tracer)
+
+    def test_phases_of_other_threads_are_ignored(self):
+        trace.enable("json")
+        entered = threading.Event()
+        leave = threading.Event()
+
+        def worker():
+            with trace.phase("project"):
+                entered.set()
+                leave.wait()
+
+        thread = threading.Thread(target=worker)
+        with trace.phase("run"):
+            thread.start()
+            entered.wait()
+            with trace.phase("push"):
+                leave.set()
+                thread.join()
+            self.assertEqual(trace._tracer.current.name, "run")
+
+        self.assertEqual(trace._tracer.current.name, "other")
+        self.assertNotIn("project", trace._tracer.phases)
+
+    def test_requests(self):
+        with MockGitLab() as server:
+            server.route(r"/api/v4/user", lambda match, query, headers: (200, {}, {"id": 1}))
+            session = requests.Session()
+            trace.instrument(session)
+
+            # Nothing is counted while tracing is disabled
+            session.get(server.url + "/api/v4/user")
+
+            trace.enable("text")
+            with trace.phase("auth"):
+                session.get(server.url + "/api/v4/user")
+                session.get(server.url + "/api/v4/user")
+
+            tracer = trace._tracer
+            self.assertEqual(tracer.phases["auth"].requests, 2)
+            self.assertEqual(tracer.phases["auth"].bytes, 2 * len('{"id": 1}'))
+
+            with patch("sys.stderr", new=StringIO()) as stderr:
+                trace.report()
+            self.assertIn("auth", stderr.getvalue())
+
+    def test_format_from_environment(self):
+        for value, expected in (("", None), ("0", None), ("1", "text"), ("json", "json")):
+            with patch.dict(os.environ, {"GIT_LAB_TRACE": value}):
+                self.assertEqual(trace.format_from_environment(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
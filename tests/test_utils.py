@@ -131,6 +131,11 @@ class PipelineTest(unittest.TestCase):
         self.assertEqual(PipelineStatus("canceled"), PipelineStatus.CANCELED)
         self.assertEqual(PipelineStatus("scheduled"), PipelineStatus.SCHEDULED)
 
+    def test_enum_with_unknown_status(self):
+        self.assertEqual(PipelineStatus("canceling"), PipelineStatus.UNKNOWN)
+        self.assertFalse(PipelineStatus("canceling").finished)
+        self.assertEqual(PipelineStatus.format("canceling"), "canceling")
+
     def test_color_formatting(self):
         self.assertEqual(PipelineStatus.SUCCESS.formatted, '\x1b[0;32msuccess\x1b[0m')
         self.assertEqual(PipelineStatus.FAILED.formatted, '\x1b[0;31mfailed\x1b[0m')